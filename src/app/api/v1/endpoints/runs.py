@@ -8,16 +8,28 @@ from fastapi import APIRouter, Depends, HTTPException
 from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 
+from app.core.config import Settings
 from app.db.engine import get_db
 from app.db.models import Run
 from app.db.repo import list_sessions_for_athlete
-from coach_ai.e2e import EndToEndConfig, run_end_to_end
+from coach_ai.e2e import DiskArtifactCache, EndToEndConfig, run_end_to_end
 from coach_ai.e2e.versioning import ENGINE_VERSION, fingerprint_config
 
 DbSession = Annotated[Session, Depends(get_db)]
 
 router = APIRouter(prefix="/runs", tags=["runs"])
 
+settings = Settings()
+
+# One SQLite file for every worker: a trend/latent computed by one is reused by all.
+artifact_cache = (
+    DiskArtifactCache(
+        settings.artifact_cache_path, max_bytes=settings.artifact_cache_max_mb * 1024 * 1024
+    )
+    if settings.artifact_cache_path
+    else None
+)
+
 
 @router.post("/{athlete_id}")
 def run_pipeline_for_athlete(
@@ -25,6 +37,7 @@ def run_pipeline_for_athlete(
     db: DbSession,
     metric_key: str = "volume_load_kg",
     use_normalized: bool = True,
+    deadline_ms: float | None = None,
 ) -> dict:
     sessions = list_sessions_for_athlete(db, athlete_id)
     if not sessions:
@@ -37,9 +50,10 @@ def run_pipeline_for_athlete(
         normalizer_min_n=10,
         clip_z=5.0,
         log_enabled=False,  # DB es la fuente de verdad aquí
+        deadline_ms=settings.run_deadline_ms if deadline_ms is None else deadline_ms,
     )
 
-    res = run_end_to_end(sessions, config=cfg)
+    res = run_end_to_end(sessions, config=cfg, cache=artifact_cache)
 
     cfg_dict = asdict(cfg)
     fp = fingerprint_config(cfg_dict)
@@ -55,7 +69,8 @@ def run_pipeline_for_athlete(
         trend=jsonable_encoder(res.trend),
         latents=jsonable_encoder(res.latents),
         suggestions=jsonable_encoder(res.suggestions),
-        issues=jsonable_encoder([i.model_dump() for i in res.issues]),
+        issues=jsonable_encoder(res.issues),
+        timings=jsonable_encoder(res.timings),
     )
     db.add(row)
     db.commit()
@@ -87,6 +102,7 @@ def get_run(run_id: str, db: DbSession) -> dict:
         "latents": row.latents,
         "suggestions": row.suggestions,
         "issues": row.issues,
+        "timings": row.timings,
     }
 
 
@@ -83,6 +83,8 @@ class Run(Base):
     latents: Mapped[dict | None] = mapped_column(JSON, nullable=True)
     suggestions: Mapped[dict | None] = mapped_column(JSON, nullable=True)
     issues: Mapped[list | None] = mapped_column(JSON, nullable=True)
+    # per-stage StageTiming; older databases: app.db.schema.add_missing_columns
+    timings: Mapped[list | None] = mapped_column(JSON, nullable=True)
 
 
 import app.db.models_auth  # noqa: F401, E402
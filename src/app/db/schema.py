@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from sqlalchemy import Engine, Table, inspect, text
+
+
+def add_missing_columns(engine: Engine, tables: list[Table]) -> list[str]:
+    """Add nullable model columns missing from already-existing tables.
+
+    create_all() never alters a table that exists, so databases created before a
+    nullable column was added to a model (e.g. runs.timings) need this, or the manual
+    `ALTER TABLE runs ADD COLUMN timings JSON`. Returns the added "table.column" names.
+    """
+    insp = inspect(engine)
+    added: list[str] = []
+    with engine.begin() as conn:
+        for table in tables:
+            if not insp.has_table(table.name):
+                continue
+            present = {c["name"] for c in insp.get_columns(table.name)}
+            for col in table.columns:
+                if col.name in present or not col.nullable:
+                    continue
+                ddl = col.type.compile(dialect=engine.dialect)
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN "{col.name}" {ddl}'))
+                added.append(f"{table.name}.{col.name}")
+    return added
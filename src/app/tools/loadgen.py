@@ -0,0 +1,357 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from collections import Counter
+from collections.abc import Callable, Generator
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import httpx
+import numpy as np
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session as OrmSession
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import Settings
+from app.db.engine import get_db
+from app.db.models import Athlete, Base, Run, TrainingSession
+from app.db.schema import add_missing_columns
+from app.main import create_app
+from coach_ai.training_core import Session
+from coach_ai.training_core.metrics import compute_session_metrics
+from coach_ai.validation.simulator import simulate_population_batch
+from coach_ai.validation.types import AthleteSimConfig
+
+INGEST = "POST /sessions/batch"
+RUNS = "POST /runs/{athlete_id}"
+
+
+@dataclass(frozen=True, slots=True)
+class LoadConfig:
+    """Population shape and request mix of one load test.
+
+    Each athlete's last `api_days` of history are posted through the API in batches of
+    `batch_size`; everything older is bulk-loaded into the database beforehand.
+    """
+
+    athletes: int = 20
+    days: int = 180
+    sessions_per_week: int = 4
+    sets_per_session: int = 4
+    exercises_per_session: int = 4
+    api_days: int = 14
+    batch_size: int = 25
+    runs_per_athlete: int = 1
+    concurrency: int = 8
+    seed: int = 0
+    run_deadline_ms: float | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class Sample:
+    endpoint: str
+    status: int  # 0 = transport error / timeout
+    latency_ms: float
+
+
+def simulate_load_sessions(cfg: LoadConfig) -> tuple[list[Session], list[Session]]:
+    """(bulk-load history, API sessions) of a simulated multi-exercise population."""
+    athletes = [
+        AthleteSimConfig(
+            athlete_id=f"load-a{i + 1}",
+            days=cfg.days,
+            sessions_per_week=cfg.sessions_per_week,
+            sets_per_session=cfg.sets_per_session,
+            exercises_per_session=cfg.exercises_per_session,
+        )
+        for i in range(cfg.athletes)
+    ]
+    batch = simulate_population_batch(athletes, seed=cfg.seed)
+    cutoff = batch.start_utc + timedelta(days=max(0, cfg.days - cfg.api_days))
+    sessions = batch.to_sessions()
+    return (
+        [s for s in sessions if s.start_time < cutoff],
+        [s for s in sessions if s.start_time >= cutoff],
+    )
+
+
+def _naive_utc(t: datetime) -> datetime:
+    # DB round trips may drop the tz (SQLite); compare on naive UTC
+    return t if t.tzinfo is None else t.astimezone(UTC).replace(tzinfo=None)
+
+
+def bulk_load(db: OrmSession, sessions: list[Session], *, chunk: int = 1000) -> dict[str, int]:
+    """Insert sessions (and their athletes) with multi-row INSERTs in one transaction.
+
+    Same rows as repo.upsert_session, minus the per-row commit; sessions already in
+    the table (athlete_id, start_time) are skipped and counted as duplicates.
+    """
+    ids = sorted({s.athlete_id for s in sessions})
+    if not ids:
+        return {"athletes": 0, "inserted": 0, "duplicates": 0}
+    known = set(db.scalars(select(Athlete.athlete_id).where(Athlete.athlete_id.in_(ids))))
+    new_athletes = [{"athlete_id": a} for a in ids if a not in known]
+    if new_athletes:
+        db.execute(insert(Athlete), new_athletes)
+
+    existing = {
+        (a, _naive_utc(t))
+        for a, t in db.execute(
+            select(TrainingSession.athlete_id, TrainingSession.start_time).where(
+                TrainingSession.athlete_id.in_(ids)
+            )
+        )
+    }
+    rows = []
+    for s in sessions:
+        key = (s.athlete_id, _naive_utc(s.start_time))
+        if key in existing:
+            continue
+        existing.add(key)
+        m = compute_session_metrics(s)
+        rows.append(
+            {
+                "athlete_id": s.athlete_id,
+                "start_time": s.start_time,
+                "duration_min": float(s.duration_min),
+                "rpe": None if s.rpe is None else float(s.rpe),
+                "modality": s.modality,
+                "source": s.source,
+                "exercises": [ex.model_dump() for ex in s.exercises],
+                "meta": s.meta,
+                "volume_load_kg": m.volume_load_kg,
+                "srpe_load": m.srpe_load,
+                "sets_total": m.sets_total,
+                "reps_total": m.reps_total,
+            }
+        )
+    for lo in range(0, len(rows), chunk):
+        db.execute(insert(TrainingSession), rows[lo : lo + chunk])
+    db.commit()
+    return {
+        "athletes": len(new_athletes),
+        "inserted": len(rows),
+        "duplicates": len(sessions) - len(rows),
+    }
+
+
+def ingest_requests(sessions: list[Session], *, batch_size: int) -> list[tuple[str, str, Any]]:
+    """POST /sessions/batch requests, athletes interleaved round-robin."""
+    per_athlete: dict[str, list[Session]] = {}
+    for s in sessions:
+        per_athlete.setdefault(s.athlete_id, []).append(s)
+    queues = [
+        [ss[i : i + batch_size] for i in range(0, len(ss), max(1, batch_size))]
+        for ss in per_athlete.values()
+    ]
+    out = []
+    for j in range(max((len(q) for q in queues), default=0)):
+        for q in queues:
+            if j < len(q):
+                body = [s.model_dump(mode="json") for s in q[j]]
+                out.append((INGEST, "/api/v1/sessions/batch", body))
+    return out
+
+
+def run_requests(athlete_ids: list[str], *, repeats: int) -> list[tuple[str, str, Any]]:
+    return [(RUNS, f"/api/v1/runs/{a}", None) for _ in range(repeats) for a in athlete_ids]
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    requests: list[tuple[str, str, Any]],
+    *,
+    concurrency: int,
+    params: dict[str, Any] | None = None,
+) -> list[Sample]:
+    """POST every request with `concurrency` requests in flight; one Sample each."""
+    pending = iter(requests)
+    samples: list[Sample] = []
+
+    async def worker() -> None:
+        for endpoint, url, body in pending:
+            t0 = time.perf_counter()
+            try:
+                r = await client.post(url, json=body, params=params)
+                status = r.status_code
+            except httpx.HTTPError:
+                status = 0
+            samples.append(Sample(endpoint, status, (time.perf_counter() - t0) * 1000.0))
+
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    return samples
+
+
+def summarize(samples: list[Sample], wall_s: float) -> dict[str, Any]:
+    """Latency percentiles, error count and throughput of one endpoint's samples."""
+    lat = np.array([s.latency_ms for s in samples], dtype=float)
+    if lat.size == 0:
+        return {"n": 0}
+    p50, p95, p99 = np.percentile(lat, [50, 95, 99])
+    statuses = Counter(str(s.status) for s in samples)
+    return {
+        "n": int(lat.size),
+        "errors": sum(1 for s in samples if s.status == 0 or s.status >= 400),
+        "status_counts": dict(sorted(statuses.items())),
+        "mean_ms": float(lat.mean()),
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+        "max_ms": float(lat.max()),
+        "wall_s": wall_s,
+        "throughput_rps": lat.size / wall_s if wall_s > 0 else None,
+    }
+
+
+async def run_load(
+    cfg: LoadConfig, client: httpx.AsyncClient, api_sessions: list[Session]
+) -> dict[str, Any]:
+    """Drive the ingest phase, then the runs phase; per-endpoint summaries."""
+    out: dict[str, Any] = {}
+    params = None if cfg.run_deadline_ms is None else {"deadline_ms": cfg.run_deadline_ms}
+    athlete_ids = sorted({s.athlete_id for s in api_sessions}) or [
+        f"load-a{i + 1}" for i in range(cfg.athletes)
+    ]
+    phases = (
+        (INGEST, ingest_requests(api_sessions, batch_size=cfg.batch_size), None),
+        (RUNS, run_requests(athlete_ids, repeats=cfg.runs_per_athlete), params),
+    )
+    for endpoint, reqs, p in phases:
+        t0 = time.perf_counter()
+        samples = await drive(client, reqs, concurrency=cfg.concurrency, params=p)
+        out[endpoint] = summarize(samples, time.perf_counter() - t0)
+    return out
+
+
+def _db_dependency(factory: sessionmaker) -> Callable[[], Generator[OrmSession, None, None]]:
+    def dep() -> Generator[OrmSession, None, None]:
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    return dep
+
+
+def load_test(
+    cfg: LoadConfig,
+    *,
+    database_url: str,
+    base_url: str | None = None,
+    create_tables: bool = False,
+    timeout_s: float = 60.0,
+) -> dict[str, Any]:
+    """Simulate, bulk-load the history, then drive the API (in-process unless base_url).
+
+    In-process runs use httpx.ASGITransport against create_app(), with the app's DB
+    dependency pointed at `database_url`; with base_url, the server must use that DB.
+    """
+    connect_args = {"check_same_thread": False} if database_url.startswith("sqlite") else {}
+    engine = create_engine(database_url, connect_args=connect_args)
+    factory = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    if create_tables:
+        tables = [Athlete.__table__, TrainingSession.__table__, Run.__table__]
+        Base.metadata.create_all(engine, tables=tables)
+        add_missing_columns(engine, tables)
+
+    history, api_sessions = simulate_load_sessions(cfg)
+    t0 = time.perf_counter()
+    with factory() as db:
+        fixture = bulk_load(db, history)
+    fixture["wall_s"] = time.perf_counter() - t0
+
+    async def go() -> dict[str, Any]:
+        if base_url is None:
+            app = create_app()
+            app.dependency_overrides[get_db] = _db_dependency(factory)
+            transport = httpx.ASGITransport(app=app)
+            url = "http://loadgen"
+        else:
+            transport, url = None, base_url
+        async with httpx.AsyncClient(transport=transport, base_url=url, timeout=timeout_s) as c:
+            return await run_load(cfg, c, api_sessions)
+
+    try:
+        endpoints = asyncio.run(go())
+    finally:
+        engine.dispose()
+    return {
+        "generated_at_utc": datetime.now(UTC).isoformat(),
+        "config": asdict(cfg),
+        "target": base_url or "in-process",
+        "fixture": {**fixture, "sessions": len(history)},
+        "api_sessions": len(api_sessions),
+        "endpoints": endpoints,
+    }
+
+
+def main() -> None:
+    d = LoadConfig()
+    p = argparse.ArgumentParser(description="Simulator-driven load test of sessions/runs API.")
+    p.add_argument("--athletes", type=int, default=d.athletes)
+    p.add_argument("--days", type=int, default=d.days)
+    p.add_argument("--sessions-per-week", type=int, default=d.sessions_per_week)
+    p.add_argument("--sets-per-session", type=int, default=d.sets_per_session)
+    p.add_argument("--exercises-per-session", type=int, default=d.exercises_per_session)
+    p.add_argument("--api-days", type=int, default=d.api_days, help="Days posted via the API")
+    p.add_argument("--batch-size", type=int, default=d.batch_size)
+    p.add_argument("--runs-per-athlete", type=int, default=d.runs_per_athlete)
+    p.add_argument("--concurrency", type=int, default=d.concurrency)
+    p.add_argument("--seed", type=int, default=d.seed)
+    p.add_argument("--deadline-ms", type=float, default=None, help="deadline_ms of POST /runs")
+    p.add_argument("--database-url", default=Settings().database_url)
+    p.add_argument("--create-tables", action="store_true", help="Create missing data tables")
+    p.add_argument("--base-url", default=None, help="Live server URL (default: in-process)")
+    p.add_argument("--timeout-s", type=float, default=60.0)
+    p.add_argument("--out", default="data/load/report.json", help="Report JSON path")
+
+    args = p.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)  # one INFO line per request
+    cfg = LoadConfig(
+        athletes=args.athletes,
+        days=args.days,
+        sessions_per_week=args.sessions_per_week,
+        sets_per_session=args.sets_per_session,
+        exercises_per_session=args.exercises_per_session,
+        api_days=args.api_days,
+        batch_size=args.batch_size,
+        runs_per_athlete=args.runs_per_athlete,
+        concurrency=args.concurrency,
+        seed=args.seed,
+        run_deadline_ms=args.deadline_ms,
+    )
+    rep = load_test(
+        cfg,
+        database_url=args.database_url,
+        base_url=args.base_url,
+        create_tables=args.create_tables,
+        timeout_s=args.timeout_s,
+    )
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(rep, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    print("Load test done.")
+    fx = rep["fixture"]
+    print(f"Fixture: {fx['inserted']} sessions bulk-loaded in {fx['wall_s']:.2f} s")
+    for endpoint, s in rep["endpoints"].items():
+        if not s["n"]:
+            continue
+        print(
+            f"{endpoint:<24} n={s['n']:<5} errors={s['errors']:<4}"
+            f" p50={s['p50_ms']:.1f}ms p95={s['p95_ms']:.1f}ms p99={s['p99_ms']:.1f}ms"
+            f" {s['throughput_rps']:.1f} req/s"
+        )
+    print("Report:", str(out))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+from .compare import Thresholds, compare_reports
+from .suite import BenchCase, run_case, run_suite
+
+__all__ = ["BenchCase", "Thresholds", "compare_reports", "run_case", "run_suite"]
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from .compare import Thresholds, compare_reports, regressions
+from .suite import DEFAULT_GRID, QUICK_GRID, STAGES, BenchCase, run_suite
+
+
+def _fmt_ratio(r: float | None) -> str:
+    return "-" if r is None else f"{r:.2f}x"
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Benchmark the pipeline stages on simulated data.")
+    p.add_argument("--grid", choices=["quick", "default"], default="quick")
+    p.add_argument(
+        "--cases",
+        default=None,
+        help="Comma-separated ATHLETESxDAYS[xSETS] cases (overrides --grid), e.g. 10x84x3",
+    )
+    p.add_argument("--stages", default=",".join(STAGES), help="Comma-separated stages")
+    p.add_argument("--repeats", type=int, default=3)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak pass")
+    p.add_argument(
+        "--memory-profile",
+        default=None,
+        help="Profile each stage (top sites, bytes by type) and write the profiles to this JSON",
+    )
+    p.add_argument("--out", default="data/bench/report.json", help="Report JSON path")
+    p.add_argument("--baseline", default=None, help="Baseline report JSON to compare against")
+    p.add_argument("--save-baseline", default=None, help="Also write this report as a baseline")
+    p.add_argument("--max-slowdown", type=float, default=1.25)
+    p.add_argument("--max-memory-growth", type=float, default=1.5)
+
+    args = p.parse_args()
+    if args.cases:
+        cases = tuple(BenchCase.parse(c) for c in args.cases.split(",") if c.strip())
+    else:
+        cases = QUICK_GRID if args.grid == "quick" else DEFAULT_GRID
+    stages = tuple(s for s in args.stages.split(",") if s.strip())
+
+    rep = run_suite(
+        cases,
+        seed=args.seed,
+        repeats=args.repeats,
+        stages=stages,
+        memory=not args.no_memory,
+        memory_profile=args.memory_profile is not None,
+    )
+    if args.memory_profile:
+        prof = Path(args.memory_profile)
+        prof.parent.mkdir(parents=True, exist_ok=True)
+        profiles = {c["case"]: c["memory_profile"] for c in rep["cases"]}
+        prof.write_text(json.dumps(profiles, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    failed = []
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        rows = compare_reports(
+            rep,
+            baseline,
+            thresholds=Thresholds(
+                max_slowdown=args.max_slowdown, max_memory_growth=args.max_memory_growth
+            ),
+        )
+        rep["comparison"] = {"baseline": args.baseline, "rows": rows}
+        failed = regressions(rows)
+
+    for path in filter(None, (args.out, args.save_baseline)):
+        out = Path(path)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(rep, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    print("Benchmark done.")
+    for c in rep["cases"]:
+        print(f"{c['case']} ({c['n_sessions']} sessions, {c['n_sets']} sets)")
+        for stage, r in c["stages"].items():
+            thr = r["throughput_per_s"]
+            print(
+                f"  {stage:<22} {r['median_s'] * 1000:10.1f} ms"
+                f"  {thr or 0:12.0f} sessions/s"
+                + ("" if r["peak_bytes"] is None else f"  peak {r['peak_bytes'] / 2**20:8.1f} MiB")
+            )
+    print("Scaling (log-log slope):", rep["scaling"])
+    if args.baseline:
+        for r in rep["comparison"]["rows"]:
+            if r["status"] != "ok":
+                print(
+                    f"  {r['status']:<10} {r['case']} {r['stage']}"
+                    f" time {_fmt_ratio(r['time_ratio'])} memory {_fmt_ratio(r['memory_ratio'])}"
+                )
+        print("Regressions:", len(failed))
+    print("Report:", args.out)
+    if args.memory_profile:
+        print("Memory profile:", args.memory_profile)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
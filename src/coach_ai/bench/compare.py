@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Literal
+
+CompareStatus = Literal["ok", "regression", "improved", "missing"]
+
+
+@dataclass(frozen=True, slots=True)
+class Thresholds:
+    """Allowed current/baseline ratios before a stage counts as a regression.
+
+    min_seconds: stages faster than this in the baseline are too noisy to judge on time.
+    """
+
+    max_slowdown: float = 1.25
+    max_memory_growth: float = 1.5
+    min_seconds: float = 0.005
+
+
+def _ratio(cur: float | None, base: float | None) -> float | None:
+    if cur is None or base is None or base <= 0:
+        return None
+    return cur / base
+
+
+def compare_reports(
+    current: dict[str, Any], baseline: dict[str, Any], *, thresholds: Thresholds | None = None
+) -> list[dict[str, Any]]:
+    """One row per (case, stage) of the current report, matched to the baseline by name.
+
+    status: "regression" when median time or peak memory grew past the thresholds,
+    "improved" when time dropped by the same margin, "missing" when the baseline has no
+    such case/stage, "ok" otherwise.
+    """
+    th = thresholds or Thresholds()
+    base_cases = {c["case"]: c for c in baseline.get("cases", [])}
+    rows: list[dict[str, Any]] = []
+    for case in current.get("cases", []):
+        base_case = base_cases.get(case["case"])
+        for stage, cur in case["stages"].items():
+            base = None if base_case is None else base_case["stages"].get(stage)
+            row: dict[str, Any] = {"case": case["case"], "stage": stage}
+            if base is None:
+                rows.append({**row, "status": "missing", "time_ratio": None, "memory_ratio": None})
+                continue
+
+            t = _ratio(cur["median_s"], base["median_s"])
+            m = _ratio(cur.get("peak_bytes"), base.get("peak_bytes"))
+            timed = base["median_s"] >= th.min_seconds
+            status: CompareStatus = "ok"
+            if (timed and t is not None and t > th.max_slowdown) or (
+                m is not None and m > th.max_memory_growth
+            ):
+                status = "regression"
+            elif timed and t is not None and t < 1.0 / th.max_slowdown:
+                status = "improved"
+            rows.append(
+                {
+                    **row,
+                    "status": status,
+                    "time_ratio": t,
+                    "memory_ratio": m,
+                    "baseline_median_s": base["median_s"],
+                    "median_s": cur["median_s"],
+                }
+            )
+    return rows
+
+
+def regressions(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    return [r for r in rows if r["status"] == "regression"]
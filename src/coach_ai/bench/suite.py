@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import platform
+import statistics
+import time
+import tracemalloc
+from collections.abc import Callable, Iterable
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+import numpy as np
+
+from coach_ai.e2e import EndToEndConfig, run_end_to_end
+from coach_ai.e2e.memprof import MemoryProfiler
+from coach_ai.e2e.versioning import ENGINE_VERSION
+from coach_ai.latents import compute_latent_states
+from coach_ai.suggestions import suggest_scenarios
+from coach_ai.training_core import Session
+from coach_ai.training_core.pipeline import process_sessions
+from coach_ai.trends import compute_trends
+from coach_ai.validation.simulator import simulate_population_batch
+from coach_ai.validation.types import AthleteSimConfig
+
+STAGES: tuple[str, ...] = (
+    "process_sessions",
+    "compute_trends",
+    "compute_latent_states",
+    "suggest_scenarios",
+    "run_end_to_end",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class BenchCase:
+    """One dataset size: athletes x days of history x sets per session."""
+
+    athletes: int
+    days: int
+    sets_per_session: int = 3
+    sessions_per_week: int = 4
+
+    @property
+    def name(self) -> str:
+        return f"a{self.athletes}-d{self.days}-s{self.sets_per_session}"
+
+    @classmethod
+    def parse(cls, spec: str) -> BenchCase:
+        """'athletes x days x sets', e.g. '50x365x5' (sets defaults to 3)."""
+        parts = [int(p) for p in spec.lower().split("x")]
+        if len(parts) not in (2, 3) or min(parts) <= 0:
+            raise ValueError(f"Bad case spec {spec!r}; expected ATHLETESxDAYS[xSETS]")
+        return cls(*parts)
+
+
+QUICK_GRID: tuple[BenchCase, ...] = (
+    BenchCase(athletes=5, days=84),
+    BenchCase(athletes=20, days=84),
+    BenchCase(athletes=20, days=365),
+)
+
+DEFAULT_GRID: tuple[BenchCase, ...] = tuple(
+    BenchCase(athletes=a, days=d, sets_per_session=s)
+    for a in (10, 50)
+    for d in (84, 365)
+    for s in (3, 8)
+)
+
+
+def make_dataset(case: BenchCase, *, seed: int = 0) -> list[Session]:
+    """Simulated sessions for a case (vectorized simulator, deterministic per seed)."""
+    athletes = [
+        AthleteSimConfig(
+            athlete_id=f"a{i + 1}",
+            days=case.days,
+            sessions_per_week=case.sessions_per_week,
+            sets_per_session=case.sets_per_session,
+        )
+        for i in range(case.athletes)
+    ]
+    return simulate_population_batch(athletes, seed=seed).to_sessions()
+
+
+def _group_by_athlete(sessions: list[Session]) -> dict[str, list[Session]]:
+    out: dict[str, list[Session]] = {}
+    for s in sessions:
+        out.setdefault(s.athlete_id, []).append(s)
+    return out
+
+
+def stage_callables(sessions: list[Session]) -> dict[str, Callable[[], Any]]:
+    """One zero-argument callable per stage, each over the whole population.
+
+    Inputs of a stage are computed here, outside the timed call (trends for the latents,
+    trends + latents for the suggestions).
+    """
+    tc = process_sessions(sessions)
+    series = list(tc.by_athlete.values())
+    trends = [compute_trends(s) for s in series]
+    latents = [compute_latent_states(s, trend=t) for s, t in zip(series, trends, strict=True)]
+    by_athlete = _group_by_athlete(sessions)
+
+    def e2e() -> list[Any]:
+        return [
+            run_end_to_end(ss, config=EndToEndConfig(athlete_id=aid, log_enabled=False))
+            for aid, ss in by_athlete.items()
+        ]
+
+    return {
+        "process_sessions": lambda: process_sessions(sessions),
+        "compute_trends": lambda: [compute_trends(s) for s in series],
+        "compute_latent_states": lambda: [
+            compute_latent_states(s, trend=t) for s, t in zip(series, trends, strict=True)
+        ],
+        "suggest_scenarios": lambda: [
+            suggest_scenarios(s, trend=t, latents=lat)
+            for s, t, lat in zip(series, trends, latents, strict=True)
+        ],
+        "run_end_to_end": e2e,
+    }
+
+
+def _peak_bytes(fn: Callable[[], Any]) -> int:
+    # separate, untimed pass: tracemalloc slows allocation-heavy code down
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        fn()
+        return tracemalloc.get_traced_memory()[1] - base
+    finally:
+        if started:
+            tracemalloc.stop()
+
+
+def time_stage(fn: Callable[[], Any], *, repeats: int = 3, warmup: int = 1) -> dict[str, Any]:
+    """Wall-clock seconds of `fn` over `repeats` runs (after `warmup` untimed runs)."""
+    for _ in range(warmup):
+        fn()
+    wall: list[float] = []
+    for _ in range(max(1, repeats)):
+        t0 = time.perf_counter()
+        fn()
+        wall.append(time.perf_counter() - t0)
+    return {
+        "median_s": statistics.median(wall),
+        "min_s": min(wall),
+        "max_s": max(wall),
+        "runs": len(wall),
+    }
+
+
+def run_case(
+    case: BenchCase,
+    *,
+    seed: int = 0,
+    repeats: int = 3,
+    stages: Iterable[str] = STAGES,
+    memory: bool = True,
+    memory_profile: bool = False,
+) -> dict[str, Any]:
+    """Benchmark every requested stage on one dataset.
+
+    throughput_per_s is sessions per second of the median run (every stage covers the
+    whole population); peak_bytes is the tracemalloc peak above the pre-call baseline.
+    memory_profile adds one more (untimed) pass per stage under MemoryProfiler, reported
+    as `memory_profile` (top allocation sites, output bytes by type and field).
+    """
+    stages = tuple(stages)
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        raise ValueError(f"Unknown stages: {sorted(unknown)}")
+    sessions = make_dataset(case, seed=seed)
+    calls = stage_callables(sessions)
+    n_sessions = len(sessions)
+    n_sets = sum(len(ex.sets) for s in sessions for ex in s.exercises)
+
+    out: dict[str, Any] = {}
+    for stage in stages:
+        fn = calls[stage]
+        res = time_stage(fn, repeats=repeats)
+        res["throughput_per_s"] = n_sessions / res["median_s"] if res["median_s"] > 0 else None
+        res["peak_bytes"] = _peak_bytes(fn) if memory else None
+        out[stage] = res
+
+    profile = None
+    if memory_profile:
+        with MemoryProfiler() as prof:
+            for stage in stages:
+                prof.measure(stage, calls[stage])
+        profile = prof.report()
+    return {
+        "case": case.name,
+        **asdict(case),
+        "n_sessions": n_sessions,
+        "n_sets": n_sets,
+        "stages": out,
+        "memory_profile": profile,
+    }
+
+
+def scaling_exponents(cases: list[dict[str, Any]]) -> dict[str, float | None]:
+    """Log-log slope of median time vs sessions per stage (1.0 = linear scaling)."""
+    out: dict[str, float | None] = {}
+    stages = {s for c in cases for s in c["stages"]}
+    for stage in sorted(stages, key=lambda s: STAGES.index(s) if s in STAGES else len(STAGES)):
+        pts = [
+            (c["n_sessions"], c["stages"][stage]["median_s"])
+            for c in cases
+            if stage in c["stages"] and c["stages"][stage]["median_s"] > 0
+        ]
+        xs = np.log([p[0] for p in pts])
+        if len(pts) < 2 or np.ptp(xs) == 0:
+            out[stage] = None
+            continue
+        out[stage] = float(np.polyfit(xs, np.log([p[1] for p in pts]), 1)[0])
+    return out
+
+
+def run_suite(
+    cases: Iterable[BenchCase] = QUICK_GRID,
+    *,
+    seed: int = 0,
+    repeats: int = 3,
+    stages: Iterable[str] = STAGES,
+    memory: bool = True,
+    memory_profile: bool = False,
+) -> dict[str, Any]:
+    """Benchmark report over a grid of cases (JSON-serializable)."""
+    stages = tuple(stages)
+    results = [
+        run_case(
+            c,
+            seed=seed,
+            repeats=repeats,
+            stages=stages,
+            memory=memory,
+            memory_profile=memory_profile,
+        )
+        for c in cases
+    ]
+    return {
+        "generated_at_utc": datetime.now(UTC).isoformat(),
+        "engine_version": ENGINE_VERSION,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "seed": seed,
+        "repeats": repeats,
+        "cases": results,
+        "scaling": scaling_exponents(results),
+    }
@@ -1,8 +1,21 @@
+from .batch import run_end_to_end_batch
+from .cache import ArtifactCache, DiskArtifactCache
+from .decision_log import DecisionLogReader, DecisionLogWriter, SegmentedLogStore
+from .memprof import MemoryProfiler
 from .runner import run_end_to_end
-from .types import EndToEndConfig, EndToEndResult
+from .types import BatchRunResult, EndToEndConfig, EndToEndResult, StageTiming
 
 __all__ = [
+    "ArtifactCache",
+    "BatchRunResult",
+    "DecisionLogReader",
+    "DecisionLogWriter",
+    "DiskArtifactCache",
     "EndToEndConfig",
     "EndToEndResult",
+    "MemoryProfiler",
+    "SegmentedLogStore",
+    "StageTiming",
     "run_end_to_end",
+    "run_end_to_end_batch",
 ]
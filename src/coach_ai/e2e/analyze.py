@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import math
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from dataclasses import field as dc_field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from coach_ai.training_core.types import Severity
+
+from .decision_log import DecisionLogReader
+
+GroupKey = tuple[str, str, str]  # (engine_version, config_fingerprint, iso week)
+
+DEFAULT_QUANTILES: tuple[float, ...] = (0.1, 0.5, 0.9)
+# issues_summary keys, as written by summarize_issues_for_log
+SEVERITIES: tuple[str, ...] = tuple(s.value for s in Severity)
+
+
+def iter_log_lines(path: str) -> Iterator[bytes]:
+    """Raw lines from a segment directory, a `.jsonl` file or a `.jsonl.gz` file."""
+    p = Path(path)
+    if p.is_dir():
+        yield from DecisionLogReader(str(p)).iter_lines()
+        return
+    opener = gzip.open if p.suffix == ".gz" else open
+    with opener(p, "rb") as f:
+        for line in f:
+            if line.strip():
+                yield line
+
+
+def iso_week(ts: str) -> str:
+    """'2024-W03' for an ISO timestamp ('unknown' if it does not parse)."""
+    try:
+        y, w, _ = datetime.fromisoformat(ts).isocalendar()
+    except (TypeError, ValueError):
+        return "unknown"
+    return f"{y:04d}-W{w:02d}"
+
+
+class StreamingHistogram:
+    """Fixed-bin histogram on [lo, hi] for streaming quantiles in O(bins) memory.
+
+    Quantiles are exact to within one bin width; values outside the range are clipped
+    into the edge bins and non-finite values are ignored.
+    """
+
+    __slots__ = ("lo", "hi", "counts", "n", "total")
+
+    def __init__(self, *, lo: float = 0.0, hi: float = 1.0, bins: int = 1000) -> None:
+        if not hi > lo or bins <= 0:
+            raise ValueError("Need hi > lo and bins > 0")
+        self.lo = float(lo)
+        self.hi = float(hi)
+        self.counts = np.zeros(int(bins), dtype=np.int64)
+        self.n = 0
+        self.total = 0.0
+
+    def add(self, x: float) -> None:
+        if not math.isfinite(x):
+            return
+        nb = self.counts.size
+        i = int((x - self.lo) / (self.hi - self.lo) * nb)
+        self.counts[min(max(i, 0), nb - 1)] += 1
+        self.n += 1
+        self.total += float(x)
+
+    def merge(self, other: StreamingHistogram) -> None:
+        if other.counts.size != self.counts.size or (other.lo, other.hi) != (self.lo, self.hi):
+            raise ValueError("Histograms must share range and bins")
+        self.counts += other.counts
+        self.n += other.n
+        self.total += other.total
+
+    def quantile(self, q: float) -> float | None:
+        """Bin midpoint holding the q-quantile (None when empty)."""
+        if self.n == 0:
+            return None
+        cum = np.cumsum(self.counts)
+        i = int(np.searchsorted(cum, q * self.n, side="left"))
+        i = min(max(i, 0), self.counts.size - 1)
+        width = (self.hi - self.lo) / self.counts.size
+        return self.lo + (i + 0.5) * width
+
+    def mean(self) -> float | None:
+        return self.total / self.n if self.n else None
+
+
+@dataclass(slots=True)
+class GroupStats:
+    """Aggregates for one (engine_version, config_fingerprint, week) group."""
+
+    n: int = 0
+    top_scenarios: Counter[str] = dc_field(default_factory=Counter)
+    probability_sums: Counter[str] = dc_field(default_factory=Counter)
+    issue_counts: Counter[str] = dc_field(default_factory=Counter)
+    runs_with: Counter[str] = dc_field(default_factory=Counter)
+    confidence: StreamingHistogram = dc_field(default_factory=StreamingHistogram)
+    top_probability: StreamingHistogram = dc_field(default_factory=StreamingHistogram)
+
+    def add(self, entry: dict[str, Any]) -> None:
+        """Fold one entry in; raises ValueError / TypeError (leaving the stats untouched)
+        when a field has the wrong type."""
+        summary = _mapping(entry.get("summary"))
+        probs = [
+            (str(sc.get("name")), float(sc.get("probability", 0.0)))
+            for sc in (_mapping(x) for x in entry.get("scenarios") or [])
+        ]
+        issues = [(str(sev), int(c)) for sev, c in _mapping(entry.get("issues_summary")).items()]
+        conf = float(summary.get("confidence_top", np.nan))
+        top_p = float(summary.get("top_probability", np.nan))
+
+        self.n += 1
+        self.top_scenarios[str(summary.get("top_scenario", "none"))] += 1
+        for name, p in probs:
+            self.probability_sums[name] += p
+        for sev, c in issues:
+            self.issue_counts[sev] += c
+            if c > 0:
+                self.runs_with[sev] += 1
+        self.confidence.add(conf)
+        self.top_probability.add(top_p)
+
+    def merge(self, other: GroupStats) -> None:
+        self.n += other.n
+        self.top_scenarios.update(other.top_scenarios)
+        self.probability_sums.update(other.probability_sums)
+        self.issue_counts.update(other.issue_counts)
+        self.runs_with.update(other.runs_with)
+        self.confidence.merge(other.confidence)
+        self.top_probability.merge(other.top_probability)
+
+    def top_share(self) -> dict[str, float]:
+        return {k: v / self.n for k, v in sorted(self.top_scenarios.items())} if self.n else {}
+
+    def to_dict(self, quantiles: Iterable[float]) -> dict[str, Any]:
+        qs = tuple(quantiles)
+        n = max(self.n, 1)
+        return {
+            "n": self.n,
+            "top_scenario_share": self.top_share(),
+            "mean_probability": {
+                k: round(v / n, 6) for k, v in sorted(self.probability_sums.items())
+            },
+            "issues_per_run": {s: round(self.issue_counts[s] / n, 6) for s in SEVERITIES},
+            "run_rate_with": {s: round(self.runs_with[s] / n, 6) for s in SEVERITIES},
+            "confidence_top": _hist_summary(self.confidence, qs),
+            "top_probability": _hist_summary(self.top_probability, qs),
+        }
+
+
+def _mapping(value: Any) -> dict[str, Any]:
+    if value is None:
+        return {}
+    if not isinstance(value, dict):
+        raise TypeError(f"Expected an object, got {type(value).__name__}")
+    return value
+
+
+def _hist_summary(h: StreamingHistogram, qs: tuple[float, ...]) -> dict[str, Any]:
+    mean = h.mean()
+    return {
+        "mean": None if mean is None else round(mean, 6),
+        "quantiles": {f"p{round(q * 100):02d}": h.quantile(q) for q in qs},
+    }
+
+
+def total_variation(p: dict[str, float], q: dict[str, float]) -> float:
+    keys = set(p) | set(q)
+    return 0.5 * sum(abs(p.get(k, 0.0) - q.get(k, 0.0)) for k in keys)
+
+
+@dataclass(slots=True)
+class LogAnalysis:
+    """Streaming aggregation of decision log entries (memory bounded by the group count)."""
+
+    groups: dict[GroupKey, GroupStats] = dc_field(default_factory=dict)
+    n_entries: int = 0
+    n_skipped: int = 0
+
+    def add(self, entry: dict[str, Any]) -> None:
+        key = (
+            str(entry.get("engine_version", "unknown")),
+            str(entry.get("config_fingerprint", "unknown")),
+            iso_week(str(entry.get("generated_at_utc", ""))),
+        )
+        g = self.groups.get(key) or GroupStats()
+        try:
+            g.add(entry)
+        except (ValueError, TypeError):
+            self.n_skipped += 1  # malformed entry: skipped, the stream goes on
+            return
+        self.groups[key] = g
+        self.n_entries += 1
+
+    def add_lines(self, lines: Iterable[bytes]) -> None:
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                self.n_skipped += 1
+                continue
+            if not isinstance(entry, dict):
+                self.n_skipped += 1
+                continue
+            self.add(entry)
+
+    def drift(self) -> list[dict[str, Any]]:
+        """Week-over-week top-scenario drift (total variation) per version/config."""
+        series: dict[tuple[str, str], list[tuple[str, dict[str, float]]]] = {}
+        for (ver, fp, week), g in sorted(self.groups.items()):
+            series.setdefault((ver, fp), []).append((week, g.top_share()))
+        out = []
+        for (ver, fp), weeks in series.items():
+            first = weeks[0][1]
+            prev = first
+            for week, share in weeks:
+                out.append(
+                    {
+                        "engine_version": ver,
+                        "config_fingerprint": fp,
+                        "week": week,
+                        "tv_vs_prev_week": round(total_variation(share, prev), 6),
+                        "tv_vs_first_week": round(total_variation(share, first), 6),
+                    }
+                )
+                prev = share
+        return out
+
+    def report(self, *, quantiles: Iterable[float] = DEFAULT_QUANTILES) -> dict[str, Any]:
+        qs = tuple(quantiles)
+        overall = GroupStats()
+        for g in self.groups.values():
+            overall.merge(g)
+        return {
+            "n_entries": self.n_entries,
+            "n_skipped": self.n_skipped,
+            "overall": overall.to_dict(qs),
+            "groups": [
+                {"engine_version": ver, "config_fingerprint": fp, "week": week, **g.to_dict(qs)}
+                for (ver, fp, week), g in sorted(self.groups.items())
+            ],
+            "drift": self.drift(),
+        }
+
+
+def analyze_logs(
+    paths: Iterable[str], *, quantiles: Iterable[float] = DEFAULT_QUANTILES
+) -> dict[str, Any]:
+    """Stream one or more log sources and return the aggregated report."""
+    an = LogAnalysis()
+    for p in paths:
+        an.add_lines(iter_log_lines(p))
+    return an.report(quantiles=quantiles)
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Aggregate decision logs (streaming).")
+    p.add_argument("paths", nargs="+", help="Segment directories or .jsonl / .jsonl.gz log files")
+    p.add_argument("--out", default="data/logs/decision_report.json", help="Report JSON path")
+    p.add_argument("--quantiles", default="0.1,0.5,0.9", help="Comma-separated quantiles")
+
+    args = p.parse_args()
+    qs = tuple(float(x) for x in args.quantiles.split(",") if x.strip())
+
+    rep = analyze_logs(args.paths, quantiles=qs)
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(rep, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+
+    print("Analysis done.")
+    print("Entries:", rep["n_entries"], "skipped:", rep["n_skipped"])
+    print("Groups:", len(rep["groups"]))
+    print("Report:", str(out))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, replace
+from typing import Any, Literal
+from uuid import uuid4
+
+from coach_ai.training_core import Session
+from coach_ai.training_core.pipeline import PipelineResult, process_sessions
+from coach_ai.training_core.types import Issue, Severity
+
+from .cache import ArtifactCache, ArtifactStore
+from .decision_log import DecisionLogWriter, summarize_issues_for_log
+from .runner import _now_utc, run_end_to_end
+from .stages import TRAINING_CORE
+from .types import BatchRunResult, EndToEndConfig, EndToEndResult
+from .versioning import ENGINE_VERSION, fingerprint_config
+
+ExecutorKind = Literal["thread", "process"]
+
+
+def _training_core_key(config: EndToEndConfig) -> tuple[Any, ...]:
+    # everything stage_training_core depends on
+    return (config.metric_key, config.normalizer_min_n, config.clip_z)
+
+
+def _run_one(
+    config: EndToEndConfig,
+    artifacts: dict[str, Any],
+    log_writer: DecisionLogWriter | None = None,
+    cache: ArtifactStore | None = None,
+) -> EndToEndResult:
+    # module-level so it can be shipped to a process pool
+    return run_end_to_end(
+        [], config=config, artifacts=artifacts, log_writer=log_writer, cache=cache
+    )
+
+
+def _failed_result(config: EndToEndConfig, error: BaseException) -> EndToEndResult:
+    cfg_dict = asdict(config)
+    issue = Issue(
+        severity=Severity.ERROR,
+        code="athlete_run_failed",
+        message="Run failed for this athlete; other athletes are unaffected.",
+        field="athlete_id",
+        value=str(error),
+        meta={"athlete_id": config.athlete_id},
+    )
+    run_id = str(uuid4())
+    return EndToEndResult(
+        run_id=run_id,
+        generated_at_utc=_now_utc(),
+        engine_version=ENGINE_VERSION,
+        config_fingerprint=fingerprint_config(cfg_dict),
+        config=cfg_dict,
+        training_core=None,
+        athlete_series=None,
+        trend=None,
+        latents=None,
+        suggestions=None,
+        issues=[issue],
+        summary={"run_id": run_id, "athlete_id": config.athlete_id, "top_scenario": "none"},
+    )
+
+
+def run_end_to_end_batch(
+    sessions: list[Session],
+    configs: Sequence[EndToEndConfig],
+    *,
+    max_workers: int | None = None,
+    executor: ExecutorKind = "thread",
+    log_writer: DecisionLogWriter | None = None,
+    cache: ArtifactStore | None = None,
+) -> BatchRunResult:
+    """Run many athletes with one shared training_core pass.
+
+    - process_sessions runs once per distinct (metric_key, normalizer_min_n, clip_z)
+      among the configs (usually once), not once per athlete
+    - per-athlete stages (trends -> latents -> suggestions -> logging) fan out over a
+      thread pool (default) or a process pool; workers only receive their AthleteSeries
+    - failures are isolated: stage failures become issues as in run_end_to_end, and an
+      athlete whose whole run raises gets a result with an `athlete_run_failed` issue
+    - `deadline_ms` budgets start per athlete in the worker, so the shared training_core
+      pass is outside every budget
+
+    A shared `log_writer` takes every athlete's decision log entry off the worker
+    threads, and a shared artifact `cache` serves all of them. Both stay in-process
+    (thread executor only), except a DiskArtifactCache, which process workers reopen.
+
+    Athlete ids must be unique across configs.
+    """
+    ids = [c.athlete_id for c in configs]
+    if len(set(ids)) != len(ids):
+        raise ValueError("athlete_id must be unique across configs")
+    if executor == "process" and (log_writer is not None or isinstance(cache, ArtifactCache)):
+        raise ValueError(
+            "log_writer and in-memory caches are only supported with the thread executor"
+        )
+
+    shared: dict[tuple[Any, ...], PipelineResult | None] = {}
+    for cfg in configs:
+        key = _training_core_key(cfg)
+        if key in shared:
+            continue
+        try:
+            shared[key] = process_sessions(
+                sessions,
+                metric_keys=(cfg.metric_key, "srpe_load"),
+                normalizer_min_n=cfg.normalizer_min_n,
+                clip_z=cfg.clip_z,
+            )
+        except Exception:
+            shared[key] = None  # each athlete re-runs it and records the failure itself
+
+    results: dict[str, EndToEndResult] = {}
+    pending: list[tuple[EndToEndConfig, dict[str, Any]]] = []
+
+    for cfg in configs:
+        tc = shared[_training_core_key(cfg)]
+        series = None if tc is None else tc.by_athlete.get(cfg.athlete_id)
+        if series is None:
+            # cheap paths (missing athlete / failed training_core): run inline
+            try:
+                artifacts = {} if tc is None else {TRAINING_CORE: tc}
+                results[cfg.athlete_id] = run_end_to_end(
+                    sessions, config=cfg, artifacts=artifacts, log_writer=log_writer, cache=cache
+                )
+            except Exception as e:
+                results[cfg.athlete_id] = _failed_result(cfg, e)
+            continue
+        # workers get a one-athlete stand-in instead of the whole PipelineResult; the
+        # athlete_series stage still runs there, so deadline downsampling matches single runs
+        light = PipelineResult(processed=[], by_athlete={cfg.athlete_id: series})
+        pending.append((cfg, {TRAINING_CORE: light}))
+
+    if pending:
+        pool: Executor = (
+            ProcessPoolExecutor(max_workers=max_workers)
+            if executor == "process"
+            else ThreadPoolExecutor(max_workers=max_workers)
+        )
+        with pool:
+            futures = [
+                (cfg, pool.submit(_run_one, cfg, art, log_writer, cache)) for cfg, art in pending
+            ]
+            for cfg, fut in futures:
+                try:
+                    res = fut.result()
+                    results[cfg.athlete_id] = replace(
+                        res, training_core=shared[_training_core_key(cfg)]
+                    )
+                except Exception as e:
+                    results[cfg.athlete_id] = _failed_result(cfg, e)
+
+    ordered = {aid: results[aid] for aid in ids}
+    all_issues = [i for r in ordered.values() for i in r.issues]
+    return BatchRunResult(
+        results=ordered,
+        issues_summary=summarize_issues_for_log(all_issues),
+        issues_by_code=dict(Counter(i.code for i in all_issues)),
+        failed=[aid for aid, r in ordered.items() if r.suggestions is None],
+    )
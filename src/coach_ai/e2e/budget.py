@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from dataclasses import field as dc_field
+from typing import Any, Literal
+
+from coach_ai.training_core.pipeline import AthleteSeries
+from coach_ai.training_core.types import Issue, Severity
+
+DegradationStep = Literal["skip_explanations", "downsample", "skip_latents", "cached_fallback"]
+
+# Fixed order: each step is taken only once the budget is tighter than for the previous one,
+# and taking a step takes every earlier computing step too (see Budget.take).
+DEGRADATION_ORDER: tuple[DegradationStep, ...] = (
+    "skip_explanations",
+    "downsample",
+    "skip_latents",
+    "cached_fallback",
+)
+
+_MESSAGES: dict[DegradationStep, str] = {
+    "skip_explanations": "Time budget low: explanations were not generated.",
+    "downsample": "Time budget low: only the most recent part of the history was used.",
+    "skip_latents": "Time budget low: latent states were skipped (neutral latents used).",
+    "cached_fallback": "Time budget exhausted: returned the last cached suggestions.",
+}
+
+
+@dataclass(slots=True)
+class Budget:
+    """Wall-clock budget of one run and the degradations taken to stay within it.
+
+    A step is wanted once the remaining fraction of the budget drops below its
+    threshold (cached_fallback: once nothing is left). Stages ask `wants(step)` at
+    their boundaries and call `take(step, ...)`, which reports each step once as a
+    WARN issue `deadline_<step>`.
+
+    Stages reach their checks in graph order (downsample at athlete_series, skip_latents
+    and skip_explanations at latents), not ladder order, so `take` first takes every
+    earlier step of DEGRADATION_ORDER: a run that downsamples has also committed to
+    skipping explanations, and `taken` always follows the ladder. cached_fallback stands
+    alone, since it replaces the remaining stages instead of degrading them.
+
+    A stage that owns a step and finds it would change nothing (downsample when the
+    history already fits the window) or has run without taking it calls `settle(step)`;
+    settled steps are never back-filled, so no issue reports a degradation that did
+    not happen.
+
+    The clock starts when the budget is created. Work before the first check (the
+    training_core stage, i.e. process_sessions) counts against it but is never cut short.
+    """
+
+    deadline_ms: float
+    thresholds: dict[str, float] = dc_field(
+        default_factory=lambda: {
+            "skip_explanations": 0.5,
+            "downsample": 0.35,
+            "skip_latents": 0.2,
+            "cached_fallback": 0.0,
+        }
+    )
+    started: float = dc_field(default_factory=time.perf_counter)
+    taken: list[DegradationStep] = dc_field(default_factory=list)
+    settled: list[DegradationStep] = dc_field(default_factory=list)
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000.0
+
+    def remaining_ms(self) -> float:
+        return self.deadline_ms - self.elapsed_ms()
+
+    def remaining_fraction(self) -> float:
+        return self.remaining_ms() / self.deadline_ms if self.deadline_ms > 0 else 0.0
+
+    def expired(self) -> bool:
+        return self.remaining_ms() <= 0.0
+
+    def wants(self, step: DegradationStep) -> bool:
+        if step in self.taken:
+            return True
+        if step in self.settled:
+            return False
+        if step == "cached_fallback":
+            return self.expired()
+        return self.remaining_fraction() < self.thresholds[step]
+
+    def settle(self, step: DegradationStep) -> None:
+        if step not in self.taken and step not in self.settled:
+            self.settled.append(step)
+
+    def take(self, step: DegradationStep, issues: list[Issue], **meta: Any) -> None:
+        if step in self.taken:
+            return
+        if step != "cached_fallback":
+            for earlier in DEGRADATION_ORDER[: DEGRADATION_ORDER.index(step)]:
+                if earlier not in self.settled:
+                    self.take(earlier, issues)
+        self.taken.append(step)
+        issues.append(
+            Issue(
+                severity=Severity.WARN,
+                code=f"deadline_{step}",
+                message=_MESSAGES[step],
+                field="deadline_ms",
+                value=self.deadline_ms,
+                meta={"elapsed_ms": round(self.elapsed_ms(), 3), **meta},
+            )
+        )
+
+    @property
+    def degraded(self) -> bool:
+        return bool(self.taken)
+
+
+def tail_series(series: AthleteSeries, n: int) -> AthleteSeries:
+    """The last `n` points of a series (normalizers keep their full-history params)."""
+    if n >= len(series.order):
+        return series
+    start = len(series.order) - max(0, n)
+    return AthleteSeries(
+        athlete_id=series.athlete_id,
+        order=series.order[start:],
+        start_times=series.start_times[start:],
+        metrics={k: v[start:] for k, v in series.metrics.items()},
+        normalizers=series.normalizers,
+        normalizer_issues=series.normalizer_issues,
+        normalized={k: v[start:] for k, v in series.normalized.items()},
+    )
@@ -0,0 +1,371 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Protocol
+
+import numpy as np
+
+from coach_ai.training_core.pipeline import AthleteSeries
+
+from . import versioning
+from .types import EndToEndConfig
+
+# Config fields each cached stage depends on (cumulative: a stage's key covers its inputs).
+_TRAINING_CORE_FIELDS = ("metric_key", "use_normalized", "normalizer_min_n", "clip_z")
+_TREND_FIELDS = _TRAINING_CORE_FIELDS + (
+    "smooth_method",
+    "ewma_alpha",
+    "slope_threshold_norm",
+    "lookback",
+)
+_LATENT_FIELDS = _TREND_FIELDS + (
+    "fatigue_alpha",
+    "plateau_lookback",
+    "fatigue_engine",
+    "kalman_tau_days",
+    "kalman_process_var",
+    "kalman_obs_var",
+)
+_SUGGESTION_FIELDS = _LATENT_FIELDS + ("scenario_top_k",)
+
+STAGE_CONFIG_FIELDS: dict[str, tuple[str, ...]] = {
+    "trends": _TREND_FIELDS,
+    "latents": _LATENT_FIELDS,
+    "suggestions": _SUGGESTION_FIELDS,
+}
+
+
+def stage_fingerprint(config: EndToEndConfig, stage: str) -> str:
+    """Fingerprint of the config fields that can change `stage`'s output."""
+    cfg = asdict(config)
+    return versioning.fingerprint_config({k: cfg[k] for k in STAGE_CONFIG_FIELDS[stage]})
+
+
+def _values_bytes(values: list[float | None]) -> bytes:
+    return np.array([np.nan if v is None else v for v in values], dtype=np.float64).tobytes()
+
+
+def series_hash(series: AthleteSeries) -> str:
+    """Content hash of an athlete series (times plus every raw and normalized metric)."""
+    h = hashlib.sha256()
+    h.update(series.athlete_id.encode("utf-8"))
+    h.update("|".join(t.isoformat() for t in series.start_times).encode("utf-8"))
+    for label, table in (("m", series.metrics), ("z", series.normalized)):
+        for key in sorted(table):
+            h.update(f"|{label}:{key}:".encode())
+            h.update(_values_bytes(table[key]))
+    return h.hexdigest()
+
+
+class ArtifactStore(Protocol):
+    """Lookup interface shared by the artifact cache backends.
+
+    get returns None on a miss (None artifacts are never stored).
+    """
+
+    def get(self, stage: str, config_fp: str, input_hash: str) -> Any | None: ...
+
+    def put(self, stage: str, config_fp: str, input_hash: str, value: Any) -> None: ...
+
+
+class ArtifactCache:
+    """Bounded in-process LRU cache for stage artifacts.
+
+    - key: (ENGINE_VERSION, stage, stage config fingerprint, input series hash)
+    - bounded by entry count and by approximate bytes (pickled size of each artifact)
+    - a change of `versioning.ENGINE_VERSION` drops every entry on the next access
+    - thread-safe; cached artifacts are shared, so treat them as read-only
+
+    stats: hits, misses, evictions, invalidations, entries, bytes.
+    """
+
+    def __init__(self, *, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024) -> None:
+        if max_entries <= 0 or max_bytes <= 0:
+            raise ValueError("max_entries and max_bytes must be > 0")
+        self.max_entries = int(max_entries)
+        self.max_bytes = int(max_bytes)
+        self._data: OrderedDict[tuple[str, str, str, str], tuple[Any, int]] = OrderedDict()
+        self._bytes = 0
+        self._version = versioning.ENGINE_VERSION
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _check_version(self) -> str:
+        version = versioning.ENGINE_VERSION
+        if version != self._version:
+            self._data.clear()
+            self._bytes = 0
+            self._version = version
+            self.invalidations += 1
+        return version
+
+    def get(self, stage: str, config_fp: str, input_hash: str) -> Any | None:
+        with self._lock:
+            key = (self._check_version(), stage, config_fp, input_hash)
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, stage: str, config_fp: str, input_hash: str, value: Any) -> None:
+        if value is None:
+            return
+        size = len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            key = (self._check_version(), stage, config_fp, input_hash)
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._data[key] = (value, size)
+            self._bytes += size
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, freed) = self._data.popitem(last=False)
+                self._bytes -= freed
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    @property
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "entries": len(self._data),
+                "bytes": self._bytes,
+            }
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    engine_version TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    config_fp TEXT NOT NULL,
+    input_hash TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL,
+    PRIMARY KEY (engine_version, stage, config_fp, input_hash)
+);
+CREATE INDEX IF NOT EXISTS artifacts_last_access ON artifacts (last_access);
+"""
+
+
+class DiskArtifactCache:
+    """Cross-process artifact cache in one SQLite file (WAL mode), e.g. under data/cache.
+
+    Same interface and keys as ArtifactCache, shared by every process that opens the
+    same path (API workers, batch jobs):
+      - writes are single transactions (atomic); WAL lets readers run alongside a writer
+      - least-recently-used rows are evicted once the stored artifacts exceed `max_bytes`;
+        a hit only rewrites `last_access` when it is older than `touch_interval_s`, so
+        hot reads stay lock-free and recency is approximate to that interval
+      - rows from other engine versions are purged when a process first connects
+      - connections are opened lazily, per thread and per process (fork-safe)
+
+    Storage errors (locked past `timeout_s`, disk full...) are counted in `errors` and
+    behave as a miss / no-op: the cache never fails a run. A row that no longer
+    unpickles (truncated, or naming a class that moved) is counted the same way and
+    deleted. Values are pickled, so only point it at files written by this engine.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        max_bytes: int = 256 * 1024 * 1024,
+        timeout_s: float = 5.0,
+        touch_interval_s: float = 60.0,
+    ) -> None:
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be > 0")
+        self.path = str(path)
+        self.max_bytes = int(max_bytes)
+        self.timeout_s = float(timeout_s)
+        self.touch_interval_s = float(touch_interval_s)
+        self._local = threading.local()
+        self._purged_version: str | None = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.errors = 0
+
+    def __getstate__(self) -> dict[str, Any]:
+        # picklable for process pools: the child reconnects (its counters start at 0)
+        return {
+            "path": self.path,
+            "max_bytes": self.max_bytes,
+            "timeout_s": self.timeout_s,
+            "touch_interval_s": self.touch_interval_s,
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(
+            state["path"],
+            max_bytes=state["max_bytes"],
+            timeout_s=state["timeout_s"],
+            touch_interval_s=state["touch_interval_s"],
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=self.timeout_s, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        version = versioning.ENGINE_VERSION
+        if self._purged_version != version:
+            conn.execute("DELETE FROM artifacts WHERE engine_version != ?", (version,))
+            self._purged_version = version
+        return conn
+
+    def _count(self, attr: str, n: int = 1) -> None:
+        with self._lock:
+            setattr(self, attr, getattr(self, attr) + n)
+
+    def get(self, stage: str, config_fp: str, input_hash: str) -> Any | None:
+        key = (versioning.ENGINE_VERSION, stage, config_fp, input_hash)
+        try:
+            conn = self._conn()
+            row = conn.execute(
+                "SELECT value, last_access FROM artifacts WHERE engine_version = ?"
+                " AND stage = ? AND config_fp = ? AND input_hash = ?",
+                key,
+            ).fetchone()
+            if row is None:
+                self._count("misses")
+                return None
+            now = time.time()
+            if now - row[1] >= self.touch_interval_s:
+                # only stale rows take the write lock
+                conn.execute(
+                    "UPDATE artifacts SET last_access = ? WHERE engine_version = ? AND stage = ?"
+                    " AND config_fp = ? AND input_hash = ?",
+                    (now, *key),
+                )
+        except sqlite3.Error:
+            self._count("errors")
+            self._count("misses")
+            return None
+        try:
+            value = pickle.loads(row[0])
+        except Exception:
+            # unloadable blob: drop it so the next put can replace it
+            self._count("errors")
+            self._count("misses")
+            try:
+                conn.execute(
+                    "DELETE FROM artifacts WHERE engine_version = ? AND stage = ?"
+                    " AND config_fp = ? AND input_hash = ?",
+                    key,
+                )
+            except sqlite3.Error:
+                pass
+            return None
+        self._count("hits")
+        return value
+
+    def put(self, stage: str, config_fp: str, input_hash: str, value: Any) -> None:
+        if value is None:
+            return
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            return
+        key = (versioning.ENGINE_VERSION, stage, config_fp, input_hash)
+        try:
+            conn = self._conn()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO artifacts VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (*key, blob, len(blob), time.time()),
+                )
+                evicted = self._evict(conn)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error:
+            self._count("errors")
+            return
+        if evicted:
+            self._count("evictions", evicted)
+
+    def _evict(self, conn: sqlite3.Connection) -> int:
+        (total,) = conn.execute("SELECT COALESCE(SUM(size), 0) FROM artifacts").fetchone()
+        excess = total - self.max_bytes
+        if excess <= 0:
+            return 0
+        doomed: list[tuple[Any, ...]] = []
+        for row in conn.execute(
+            "SELECT engine_version, stage, config_fp, input_hash, size FROM artifacts"
+            " ORDER BY last_access"
+        ):
+            if excess <= 0:
+                break
+            doomed.append(row[:4])
+            excess -= row[4]
+        conn.executemany(
+            "DELETE FROM artifacts WHERE engine_version = ? AND stage = ? AND config_fp = ?"
+            " AND input_hash = ?",
+            doomed,
+        )
+        return len(doomed)
+
+    def clear(self) -> None:
+        try:
+            self._conn().execute("DELETE FROM artifacts")
+        except sqlite3.Error:
+            self._count("errors")
+
+    def close(self) -> None:
+        """Close this thread's connection (others close when their thread ends)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    @property
+    def stats(self) -> dict[str, int]:
+        try:
+            entries, size = (
+                self._conn()
+                .execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM artifacts")
+                .fetchone()
+            )
+        except sqlite3.Error:
+            entries, size = -1, -1
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "errors": self.errors,
+            "entries": entries,
+            "bytes": size,
+        }
@@ -1,9 +1,18 @@
 from __future__ import annotations
 
+import atexit
+import bisect
+import gzip
 import json
+import os
+import queue
+import threading
+import time
+from collections.abc import Iterator
 from dataclasses import asdict, dataclass
+from dataclasses import field as dc_field
 from pathlib import Path
-from typing import Any
+from typing import Any, Protocol
 
 from coach_ai.training_core.types import Issue, Severity
 
@@ -20,6 +29,7 @@ class DecisionLogEntry:
     summary: dict[str, Any]
     scenarios: list[dict[str, Any]]
     issues_summary: dict[str, int]
+    timings: list[dict[str, Any]] = dc_field(default_factory=list)  # StageTiming as dicts
 
 
 def summarize_issues_for_log(issues: list[Issue]) -> dict[str, int]:
@@ -33,6 +43,499 @@ def write_jsonl(entry: DecisionLogEntry, path: str) -> None:
     """Append one JSON line to a log file (creates directories)."""
     p = Path(path)
     p.parent.mkdir(parents=True, exist_ok=True)
-    payload = asdict(entry)  # <-- funciona con dataclasses con slots
     with p.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(payload, ensure_ascii=False, default=str) + "\n")
+        f.write(entry_to_line(entry))  # asdict funciona con dataclasses con slots
+
+
+def entry_to_line(entry: DecisionLogEntry) -> str:
+    """One JSONL line (with trailing newline) for an entry."""
+    return json.dumps(asdict(entry), ensure_ascii=False, default=str) + "\n"
+
+
+class LogSink(Protocol):
+    """Where DecisionLogWriter puts batches of entries."""
+
+    def write_entries(self, entries: list[DecisionLogEntry]) -> None: ...
+
+    def sync(self) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class JsonlFileSink:
+    """Append-only JSONL file kept open for the writer's lifetime."""
+
+    def __init__(self, path: str) -> None:
+        p = Path(path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        self.path = str(p)
+        self._f = p.open("a", encoding="utf-8")
+
+    def write_entries(self, entries: list[DecisionLogEntry]) -> None:
+        self._f.write("".join(entry_to_line(e) for e in entries))
+        self._f.flush()
+
+    def sync(self) -> None:
+        os.fsync(self._f.fileno())
+
+    def close(self) -> None:
+        self._f.close()
+
+
+_STOP = object()
+
+
+class DecisionLogWriter:
+    """Buffered background writer for decision log entries.
+
+    - submit() only enqueues; a daemon thread serializes entries, batches up to
+      `max_batch` lines per write and flushes at least every `flush_interval_ms`
+    - fsync policy: after `fsync_every_n` entries and/or when `fsync_interval_ms` has
+      elapsed since the last fsync (both None: rely on the OS page cache)
+    - bounded queue: submit() blocks when `max_queue` entries are pending (back-pressure
+      instead of silently dropping decisions)
+    - close() (also registered with atexit) drains the queue, fsyncs and closes the sink
+
+    Write errors never reach the caller; they are counted in `stats` (`last_error`).
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        *,
+        sink: LogSink | None = None,
+        max_batch: int = 256,
+        flush_interval_ms: float = 50.0,
+        fsync_every_n: int | None = None,
+        fsync_interval_ms: float | None = 1000.0,
+        max_queue: int = 10_000,
+    ) -> None:
+        if (path is None) == (sink is None):
+            raise ValueError("Provide exactly one of path or sink")
+        if max_batch <= 0:
+            raise ValueError("max_batch must be > 0")
+
+        self._sink: LogSink = JsonlFileSink(path) if sink is None else sink
+        self._max_batch = int(max_batch)
+        self._flush_interval = max(0.001, flush_interval_ms / 1000.0)
+        self._fsync_every_n = fsync_every_n
+        self._fsync_interval = None if fsync_interval_ms is None else fsync_interval_ms / 1000.0
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=max_queue)
+        self._closed = False
+        self._lock = threading.Lock()
+        self.stats: dict[str, Any] = {
+            "submitted": 0,
+            "written": 0,
+            "batches": 0,
+            "fsyncs": 0,
+            "errors": 0,
+            "last_error": None,
+        }
+
+        self._thread = threading.Thread(target=self._loop, name="decision-log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, entry: DecisionLogEntry) -> None:
+        """Enqueue one entry (do not mutate it afterwards; it is serialized later)."""
+        # enqueue under the lock so close() cannot slip _STOP in ahead of this entry
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("DecisionLogWriter is closed")
+            self._queue.put(entry)
+            self.stats["submitted"] += 1
+
+    def flush(self) -> None:
+        """Block until every entry submitted so far has been written."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Drain pending entries, fsync and close the sink (idempotent)."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        atexit.unregister(self.close)
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def __enter__(self) -> DecisionLogWriter:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def _record_error(self, e: Exception) -> None:
+        self.stats["errors"] += 1
+        self.stats["last_error"] = repr(e)
+
+    def _loop(self) -> None:
+        unsynced = 0
+        last_sync = time.monotonic()
+        stopping = False
+
+        while not stopping:
+            try:
+                first = self._queue.get(timeout=self._flush_interval)
+            except queue.Empty:
+                first = None
+
+            items = [] if first is None else [first]
+            while len(items) < self._max_batch:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            entries = [x for x in items if x is not _STOP]
+            stopping = len(entries) != len(items)
+
+            if entries:
+                try:
+                    self._sink.write_entries(entries)
+                    self.stats["written"] += len(entries)
+                    self.stats["batches"] += 1
+                    unsynced += len(entries)
+                except Exception as e:
+                    self._record_error(e)
+
+            now = time.monotonic()
+            due = unsynced > 0 and (
+                stopping
+                or (self._fsync_every_n is not None and unsynced >= self._fsync_every_n)
+                or (self._fsync_interval is not None and now - last_sync >= self._fsync_interval)
+            )
+            if due:
+                try:
+                    self._sink.sync()
+                    self.stats["fsyncs"] += 1
+                except Exception as e:
+                    self._record_error(e)
+                unsynced = 0
+                last_sync = now
+
+            for _ in items:
+                self._queue.task_done()
+
+        try:
+            self._sink.close()
+        except Exception as e:
+            self._record_error(e)
+
+
+# ---------------------------------------------------------------------------
+# Segmented store
+# ---------------------------------------------------------------------------
+
+_SEGMENT_PREFIX = "decisions-"
+_PLAIN_SUFFIX = ".jsonl"
+_SEALED_SUFFIX = ".sealed.jsonl"
+_GZ_SUFFIX = ".jsonl.gz"
+_INDEX_SUFFIX = ".idx.jsonl"
+_BLOCKS_SUFFIX = ".blocks.json"
+
+
+def _segment_name(seq: int) -> str:
+    return f"{_SEGMENT_PREFIX}{seq:06d}"
+
+
+def _segment_seq(filename: str) -> int | None:
+    if not filename.startswith(_SEGMENT_PREFIX):
+        return None
+    digits = filename[len(_SEGMENT_PREFIX) :].split(".", 1)[0]
+    return int(digits) if digits.isdigit() else None
+
+
+def _index_line(obj: dict[str, Any], offset: int, length: int) -> str:
+    rec = {
+        "run_id": obj.get("run_id"),
+        "athlete_id": obj.get("athlete_id"),
+        "offset": offset,
+        "length": length,
+    }
+    return json.dumps(rec, ensure_ascii=False) + "\n"
+
+
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class SegmentedLogStore:
+    """Decision log split into rotated, compressed and indexed segments.
+
+    Layout under `root` (one `decisions-NNNNNN` stem per segment):
+      - `.jsonl`        active segment, plain append-only JSONL
+      - `.jsonl.gz`     sealed segment: independent gzip members of ~`block_bytes`
+                        uncompressed, cut on line boundaries (any block decompresses alone)
+      - `.blocks.json`  sealed segment block table: [uncompressed_start, gz_offset, gz_length]
+      - `.sealed.jsonl` sealed segment with `compress=False` (plain bytes, never resealed)
+      - `.idx.jsonl`    sidecar index: run_id, athlete_id, offset, length per entry, with
+                        offsets in the uncompressed stream (valid before and after sealing)
+
+    The active segment is sealed once it reaches `max_segment_bytes` or is older than
+    `max_segment_age_s`. A plain segment left behind by a previous process is sealed on
+    open (its index is rebuilt from the data, so a crash between data and index writes
+    loses nothing). Usable directly (`append`) or as a DecisionLogWriter sink.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        *,
+        max_segment_bytes: int = 64 * 1024 * 1024,
+        max_segment_age_s: float | None = 24 * 3600.0,
+        block_bytes: int = 64 * 1024,
+        compress: bool = True,
+    ) -> None:
+        if max_segment_bytes <= 0 or block_bytes <= 0:
+            raise ValueError("max_segment_bytes and block_bytes must be > 0")
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_segment_bytes = int(max_segment_bytes)
+        self.max_segment_age_s = max_segment_age_s
+        self.block_bytes = int(block_bytes)
+        self.compress = bool(compress)
+
+        self._data: Any = None
+        self._index: Any = None
+        self._seq = 0
+        self._size = 0
+        self._opened_at = 0.0
+
+        seqs = sorted(
+            s for s in (_segment_seq(p.name) for p in self.root.iterdir()) if s is not None
+        )
+        for seq in seqs:
+            if (self.root / (_segment_name(seq) + _PLAIN_SUFFIX)).exists():
+                self._seal(seq)
+        self._seq = seqs[-1] if seqs else 0
+
+    # -- writing -----------------------------------------------------------
+
+    def _open_next(self) -> None:
+        self._seq += 1
+        stem = _segment_name(self._seq)
+        self._data = (self.root / (stem + _PLAIN_SUFFIX)).open("ab")
+        self._index = (self.root / (stem + _INDEX_SUFFIX)).open("ab")
+        self._size = 0
+        self._opened_at = time.time()
+
+    def _rotation_due(self) -> bool:
+        if self._size >= self.max_segment_bytes:
+            return True
+        age = self.max_segment_age_s
+        return age is not None and self._size > 0 and time.time() - self._opened_at >= age
+
+    def rotate(self) -> None:
+        """Seal the active segment now (no-op when nothing is open)."""
+        if self._data is None:
+            return
+        self._data.close()
+        self._index.close()
+        self._data = self._index = None
+        self._seal(self._seq)
+
+    def _write_pending(self, data: list[bytes], index: list[str]) -> None:
+        # data before index: an index line always points at complete bytes
+        self._data.write(b"".join(data))
+        self._data.flush()
+        self._index.write("".join(index).encode("utf-8"))
+        self._index.flush()
+
+    def write_entries(self, entries: list[DecisionLogEntry]) -> None:
+        data: list[bytes] = []
+        index: list[str] = []
+        for e in entries:
+            if self._data is not None and self._rotation_due():
+                self._write_pending(data, index)
+                data, index = [], []
+                self.rotate()
+            if self._data is None:
+                self._open_next()
+            line = entry_to_line(e).encode("utf-8")
+            data.append(line)
+            index.append(
+                _index_line({"run_id": e.run_id, "athlete_id": e.athlete_id}, self._size, len(line))
+            )
+            self._size += len(line)
+        if data:
+            self._write_pending(data, index)
+
+    def append(self, entry: DecisionLogEntry) -> None:
+        self.write_entries([entry])
+
+    def sync(self) -> None:
+        if self._data is not None:
+            os.fsync(self._data.fileno())
+            os.fsync(self._index.fileno())
+
+    def close(self) -> None:
+        """Flush and close the active segment (it stays plain until the next rotation)."""
+        if self._data is not None:
+            self.sync()
+            self._data.close()
+            self._index.close()
+            self._data = self._index = None
+
+    def __enter__(self) -> SegmentedLogStore:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # -- sealing -----------------------------------------------------------
+
+    def _seal(self, seq: int) -> None:
+        stem = _segment_name(seq)
+        plain = self.root / (stem + _PLAIN_SUFFIX)
+        index_lines: list[str] = []
+        blocks: list[list[int]] = []
+        gz_parts: list[bytes] = []
+        gz_offset = 0
+        block: list[bytes] = []
+        block_start = 0
+        block_size = 0
+        offset = 0
+
+        def flush_block() -> None:
+            nonlocal gz_offset, block, block_size
+            if not block:
+                return
+            member = gzip.compress(b"".join(block), mtime=0)
+            blocks.append([block_start, gz_offset, len(member)])
+            gz_parts.append(member)
+            gz_offset += len(member)
+            block, block_size = [], 0
+
+        with plain.open("rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # torn tail from a crash: drop it
+                try:
+                    obj = json.loads(line)
+                except ValueError:
+                    obj = {}
+                if block_size == 0:
+                    block_start = offset
+                block.append(line)
+                block_size += len(line)
+                index_lines.append(_index_line(obj, offset, len(line)))
+                offset += len(line)
+                if block_size >= self.block_bytes:
+                    flush_block()
+        flush_block()
+
+        _atomic_write_bytes(self.root / (stem + _INDEX_SUFFIX), "".join(index_lines).encode())
+        if self.compress:
+            _atomic_write_bytes(self.root / (stem + _GZ_SUFFIX), b"".join(gz_parts))
+            _atomic_write_bytes(self.root / (stem + _BLOCKS_SUFFIX), json.dumps(blocks).encode())
+            plain.unlink()
+        else:
+            os.replace(plain, self.root / (stem + _SEALED_SUFFIX))
+
+
+class DecisionLogReader:
+    """Read a SegmentedLogStore directory; lookups seek straight to matching entries."""
+
+    def __init__(self, root: str) -> None:
+        self.root = Path(root)
+
+    def segments(self) -> list[int]:
+        """Segment sequence numbers, oldest first."""
+        if not self.root.is_dir():
+            return []
+        return sorted(
+            {s for s in (_segment_seq(p.name) for p in self.root.iterdir()) if s is not None}
+        )
+
+    def _index(self, seq: int) -> list[dict[str, Any]]:
+        path = self.root / (_segment_name(seq) + _INDEX_SUFFIX)
+        out: list[dict[str, Any]] = []
+        try:
+            with path.open("rb") as f:
+                for line in f:
+                    if line.endswith(b"\n"):
+                        out.append(json.loads(line))
+        except FileNotFoundError:
+            pass
+        return out
+
+    def _read_at(self, seq: int, recs: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        stem = _segment_name(seq)
+        blocks_path = self.root / (stem + _BLOCKS_SUFFIX)
+        if blocks_path.exists():
+            blocks = json.loads(blocks_path.read_text(encoding="utf-8"))
+            starts = [b[0] for b in blocks]
+            cache: dict[int, bytes] = {}
+            out = []
+            with (self.root / (stem + _GZ_SUFFIX)).open("rb") as f:
+                for r in recs:
+                    bi = bisect.bisect_right(starts, r["offset"]) - 1
+                    if bi not in cache:
+                        f.seek(blocks[bi][1])
+                        cache = {bi: gzip.decompress(f.read(blocks[bi][2]))}
+                    rel = r["offset"] - blocks[bi][0]
+                    out.append(json.loads(cache[bi][rel : rel + r["length"]]))
+            return out
+        for suffix in (_PLAIN_SUFFIX, _SEALED_SUFFIX):
+            try:
+                with (self.root / (stem + suffix)).open("rb") as f:
+                    out = []
+                    for r in recs:
+                        f.seek(r["offset"])
+                        out.append(json.loads(f.read(r["length"])))
+                    return out
+            except FileNotFoundError:
+                continue
+        # sealed (compressed) between listing and reading
+        return self._read_at(seq, recs) if blocks_path.exists() else []
+
+    def find(
+        self, *, run_id: str | None = None, athlete_id: str | None = None
+    ) -> Iterator[dict[str, Any]]:
+        """Entries matching every given key, oldest first (only matching bytes are read)."""
+        if run_id is None and athlete_id is None:
+            raise ValueError("Provide run_id and/or athlete_id")
+        for seq in self.segments():
+            recs = [
+                r
+                for r in self._index(seq)
+                if (run_id is None or r["run_id"] == run_id)
+                and (athlete_id is None or r["athlete_id"] == athlete_id)
+            ]
+            if recs:
+                yield from self._read_at(seq, recs)
+
+    def get(self, run_id: str) -> dict[str, Any] | None:
+        return next(self.find(run_id=run_id), None)
+
+    def iter_lines(self) -> Iterator[bytes]:
+        """Every raw JSONL line, oldest first, streaming one block / line at a time."""
+        for seq in self.segments():
+            stem = _segment_name(seq)
+            gz = self.root / (stem + _GZ_SUFFIX)
+            sealed = self.root / (stem + _SEALED_SUFFIX)
+            if (self.root / (stem + _BLOCKS_SUFFIX)).exists():
+                opener = gzip.open(gz, "rb")
+            elif sealed.exists():
+                opener = sealed.open("rb")
+            else:
+                try:
+                    opener = (self.root / (stem + _PLAIN_SUFFIX)).open("rb")
+                except FileNotFoundError:
+                    # sealed between the checks above and here
+                    opener = sealed.open("rb") if sealed.exists() else gzip.open(gz, "rb")
+            with opener as f:
+                for line in f:
+                    if line.endswith(b"\n"):
+                        yield line
+
+    def iter_entries(self) -> Iterator[dict[str, Any]]:
+        """Every entry, oldest first."""
+        for line in self.iter_lines():
+            yield json.loads(line)
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import dataclasses
+import gc
+import json
+import sys
+import tracemalloc
+import types
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Any
+
+# never walked into when sizing artifacts (shared, not owned by the artifact)
+_SHARED = (
+    type,
+    types.ModuleType,
+    types.FunctionType,
+    types.BuiltinFunctionType,
+    types.MethodType,
+    types.CodeType,
+    Enum,
+)
+
+_IGNORED_FILES = (tracemalloc.__file__, __file__, "<frozen importlib._bootstrap>", "<unknown>")
+
+
+def deep_size(obj: Any, *, seen: set[int] | None = None) -> tuple[int, Counter, Counter]:
+    """(bytes, bytes by type name, objects by type name) reachable from obj.
+
+    sys.getsizeof over the gc referents graph, each object counted once (also across
+    calls sharing `seen`); classes, modules, functions and enum members are skipped.
+    """
+    seen = set() if seen is None else seen
+    by_type: Counter = Counter()
+    counts: Counter = Counter()
+    total = 0
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen or isinstance(o, _SHARED):
+            continue
+        seen.add(id(o))
+        size = sys.getsizeof(o, 0)
+        name = type(o).__qualname__
+        by_type[name] += size
+        counts[name] += 1
+        total += size
+        stack.extend(gc.get_referents(o))
+    return total, by_type, counts
+
+
+def field_sizes(obj: Any) -> dict[str, int]:
+    """Deep bytes per dataclass field of obj (or summed over a list of dataclasses)."""
+    items = obj if isinstance(obj, list | tuple) else [obj]
+    if not items or not all(dataclasses.is_dataclass(x) for x in items):
+        return {}
+    out: dict[str, int] = {}
+    for f in dataclasses.fields(items[0]):
+        seen: set[int] = set()
+        out[f.name] = sum(deep_size(getattr(x, f.name, None), seen=seen)[0] for x in items)
+    return dict(sorted(out.items(), key=lambda kv: -kv[1]))
+
+
+@dataclass(frozen=True, slots=True)
+class StageMemory:
+    """tracemalloc view of one stage.
+
+    peak_bytes: highest traced memory during the stage, above the level at its start
+    retained_bytes: traced memory still allocated after the stage (its output and leaks)
+    top_sites: allocation sites with the largest retained growth (file:line)
+    artifact_*: deep size of the stage output, by object type and by top-level field
+    """
+
+    name: str
+    peak_bytes: int
+    retained_bytes: int
+    top_sites: list[dict[str, Any]]
+    artifact_bytes: int
+    artifact_types: list[dict[str, Any]]
+    artifact_fields: dict[str, int]
+
+
+class MemoryProfiler:
+    """Opt-in per-stage memory profile built on tracemalloc snapshots.
+
+    Tracing starts with the first stage (or `start()`) and is stopped by `stop()` only
+    if this profiler started it. Expect stages to run several times slower while traced.
+    """
+
+    def __init__(self, *, top_n: int = 10, nframes: int = 1) -> None:
+        self.top_n = int(top_n)
+        self.nframes = int(nframes)
+        self.stages: list[StageMemory] = []
+        self._started = False
+        self._before: tracemalloc.Snapshot | None = None
+        self._level = 0
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.nframes)
+            self._started = True
+
+    def stop(self) -> None:
+        if self._started:
+            tracemalloc.stop()
+            self._started = False
+
+    def __enter__(self) -> MemoryProfiler:
+        self.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, f) for f in _IGNORED_FILES]
+        )
+
+    def begin(self, name: str) -> None:
+        self.start()
+        self._before = self._snapshot()
+        # measured after the snapshot, so its own allocations are not charged to the stage
+        self._level = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+
+    def end(self, name: str, output: Any) -> StageMemory:
+        current, peak = tracemalloc.get_traced_memory()
+        after = self._snapshot()
+        before, self._before = self._before, None
+        diffs = after.compare_to(before, "lineno") if before is not None else []
+        diffs = sorted((d for d in diffs if d.size_diff > 0), key=lambda d: -d.size_diff)
+        total, by_type, counts = deep_size(output)
+        rec = StageMemory(
+            name=name,
+            peak_bytes=max(0, peak - self._level),
+            retained_bytes=current - self._level,
+            top_sites=[
+                {
+                    "site": f"{d.traceback[0].filename}:{d.traceback[0].lineno}",
+                    "size_diff": d.size_diff,
+                    "count_diff": d.count_diff,
+                }
+                for d in diffs[: self.top_n]
+            ],
+            artifact_bytes=total,
+            artifact_types=[
+                {"type": t, "bytes": b, "count": counts[t]}
+                for t, b in by_type.most_common(self.top_n)
+            ],
+            artifact_fields=field_sizes(output),
+        )
+        self.stages.append(rec)
+        return rec
+
+    def measure(self, name: str, fn: Callable[[], Any]) -> Any:
+        """Run fn as one profiled stage and return its result."""
+        self.begin(name)
+        out = fn()
+        self.end(name, out)
+        return out
+
+    def report(self) -> dict[str, Any]:
+        return {
+            "nframes": self.nframes,
+            "peak_bytes": max((s.peak_bytes for s in self.stages), default=0),
+            "retained_bytes": sum(s.retained_bytes for s in self.stages),
+            "stages": [dataclasses.asdict(s) for s in self.stages],
+        }
+
+    def write_json(self, path: str) -> None:
+        p = Path(path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(json.dumps(self.report(), ensure_ascii=False, indent=2), encoding="utf-8")
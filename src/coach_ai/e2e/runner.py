@@ -1,19 +1,36 @@
 from __future__ import annotations
 
+import time
+from collections.abc import Mapping
 from dataclasses import asdict
 from datetime import UTC, datetime
 from typing import Any
 from uuid import uuid4
 
-from coach_ai.latents import compute_latent_states
-from coach_ai.suggestions import suggest_scenarios
 from coach_ai.training_core import Session
-from coach_ai.training_core.pipeline import AthleteSeries, PipelineResult, process_sessions
+from coach_ai.training_core.pipeline import AthleteSeries, PipelineResult
 from coach_ai.training_core.types import Issue, Severity
-from coach_ai.trends import compute_trends
 
-from .decision_log import DecisionLogEntry, summarize_issues_for_log, write_jsonl
-from .types import EndToEndConfig, EndToEndResult
+from .budget import Budget
+from .cache import ArtifactStore
+from .decision_log import (
+    DecisionLogEntry,
+    DecisionLogWriter,
+    summarize_issues_for_log,
+    write_jsonl,
+)
+from .memprof import MemoryProfiler
+from .stages import (
+    ATHLETE_SERIES,
+    LATENTS,
+    SUGGESTIONS,
+    TRAINING_CORE,
+    TRENDS,
+    StageContext,
+    StageGraph,
+    default_stage_graph,
+)
+from .types import EndToEndConfig, EndToEndResult, StageTiming
 from .versioning import ENGINE_VERSION, fingerprint_config
 
 
@@ -25,100 +42,85 @@ def run_end_to_end(
     sessions: list[Session],
     *,
     config: EndToEndConfig,
+    graph: StageGraph | None = None,
+    artifacts: Mapping[str, Any] | None = None,
+    log_writer: DecisionLogWriter | None = None,
+    cache: ArtifactStore | None = None,
+    profile_memory: bool = False,
 ) -> EndToEndResult:
     """Phase 5 end-to-end runner.
 
-    Steps (fixed order):
+    Steps (fixed order, executed as a StageGraph; each stage runs once per run):
       1) training_core.process_sessions
       2) select AthleteSeries
       3) trends.compute_trends
       4) latents.compute_latent_states
-      5) suggestions.suggest_scenarios
+      5) suggestions.suggest_scenarios (reuses the trend/latents of 3 and 4)
       6) logging + version snapshot
+
+    Each step's wall/CPU time, point counts and issue count end up in `timings`
+    (also logged with the decision entry, minus the logging step itself).
+
+    `artifacts` pre-seeds stage outputs (e.g. a training_core result shared across
+    athletes); seeded stages are not recomputed.
+
+    With `log_writer`, the decision log entry is handed to that background writer
+    (written to its own sink; `config.log_path` is not used) instead of being
+    appended synchronously.
+
+    With `cache`, trends/latents/suggestions are reused for unchanged series and
+    config (see coach_ai.e2e.cache).
+
+    `config.deadline_ms` bounds the run: stages degrade in a fixed order (skip
+    explanations, downsample history, skip latents, last cached suggestions when a
+    cache is given), each step reported as a `deadline_*` WARN issue. The budget
+    starts before training_core, which it counts but cannot interrupt (see Budget).
+
+    With `profile_memory`, each stage is profiled with tracemalloc (peak / retained
+    bytes, top allocation sites, output size by type) into `memory_profile`.
     """
     run_id = str(uuid4())
     now = _now_utc()
-
-    issues: list[Issue] = []
+    budget = None if config.deadline_ms is None else Budget(deadline_ms=config.deadline_ms)
 
     # Snapshot config & versioning
     cfg_dict: dict[str, Any] = asdict(config)
     cfg_fp = fingerprint_config(cfg_dict)
 
-    # 1) training_core
-    tc: PipelineResult | None = None
-    athlete_series: AthleteSeries | None = None
-    trend = None
-    latents = None
-    sugg = None
-
+    # 1-5) stage graph (failures become issues; dependents are skipped)
+    ctx = StageContext(
+        config=config,
+        sessions=sessions,
+        artifacts=dict(artifacts or {}),
+        cache=cache,
+        budget=budget,
+        memory=MemoryProfiler() if profile_memory else None,
+    )
     try:
-        tc = process_sessions(
-            sessions,
-            metric_keys=(config.metric_key, "srpe_load"),
-            normalizer_min_n=config.normalizer_min_n,
-            clip_z=config.clip_z,
-        )
-    except Exception as e:  # keep runner resilient
+        (default_stage_graph() if graph is None else graph).run(ctx)
+    finally:
+        if ctx.memory is not None:
+            ctx.memory.stop()
+
+    issues: list[Issue] = ctx.issues
+    tc: PipelineResult | None = ctx.artifacts.get(TRAINING_CORE)
+    athlete_series: AthleteSeries | None = ctx.artifacts.get(ATHLETE_SERIES)
+    trend = ctx.artifacts.get(TRENDS)
+    latents = ctx.artifacts.get(LATENTS)
+    sugg = ctx.artifacts.get(SUGGESTIONS)
+
+    if budget is not None and budget.expired():
         issues.append(
             Issue(
-                severity=Severity.ERROR,
-                code="training_core_failed",
-                message="training_core processing failed.",
-                field="process_sessions",
-                value=str(e),
+                severity=Severity.WARN,
+                code="deadline_exceeded",
+                message="Run finished after its time budget.",
+                field="deadline_ms",
+                value=config.deadline_ms,
+                meta={"elapsed_ms": round(budget.elapsed_ms(), 3), "degradations": budget.taken},
             )
         )
 
-    # 2) select athlete
-    if tc is not None:
-        athlete_series = tc.by_athlete.get(config.athlete_id)
-        if athlete_series is None:
-            issues.append(
-                Issue(
-                    severity=Severity.ERROR,
-                    code="athlete_not_found",
-                    message="Requested athlete_id not present in processed sessions.",
-                    field="athlete_id",
-                    value=config.athlete_id,
-                    meta={"available": list(tc.by_athlete.keys())},
-                )
-            )
-
-    # 3) trends
-    if athlete_series is not None:
-        trend = compute_trends(
-            athlete_series,
-            metric_key=config.metric_key,
-            use_normalized=config.use_normalized,
-            smooth_method=config.smooth_method,  # "ewma" or "rolling_mean"
-            ewma_alpha=config.ewma_alpha,
-            slope_threshold=config.slope_threshold_norm if config.use_normalized else 1.0,
-            lookback=config.lookback,
-        )
-        issues.extend(trend.issues)
-
-    # 4) latents
-    if athlete_series is not None and trend is not None:
-        latents = compute_latent_states(
-            athlete_series,
-            metric_key=config.metric_key,
-            use_normalized=config.use_normalized,
-            trend=trend,
-            fatigue_alpha=config.fatigue_alpha,
-            plateau_lookback=config.plateau_lookback,
-        )
-        issues.extend(latents.issues)
-
-    # 5) suggestions
-    if athlete_series is not None:
-        sugg = suggest_scenarios(
-            athlete_series,
-            metric_key=config.metric_key,
-            use_normalized=config.use_normalized,
-        )
-        issues.extend(sugg.issues)
-
     # Summary (non-deterministic, just descriptive)
     top = sugg.scenarios[0] if sugg and sugg.scenarios else None
     summary: dict[str, float | str] = {
@@ -130,9 +132,16 @@ def run_end_to_end(
         "top_probability": float(top.probability) if top else 0.0,
         "confidence_top": float(top.confidence) if top else 0.0,
     }
+    if budget is not None:
+        summary["degradations"] = ",".join(budget.taken) or "none"
+
+    timings: list[StageTiming] = ctx.timings
 
     # 6) Logging (JSONL)
     if config.log_enabled and sugg is not None:
+        n_issues = len(issues)
+        wall0, cpu0 = time.perf_counter(), time.thread_time()
+        written = 1
         entry = DecisionLogEntry(
             run_id=run_id,
             generated_at_utc=now.isoformat(),
@@ -141,7 +150,7 @@ def run_end_to_end(
             athlete_id=config.athlete_id,
             metric_key=config.metric_key,
             used_normalized=config.use_normalized,
-            summary=summary,
+            summary=dict(summary),
             scenarios=[
                 {
                     "name": s.name.value,
@@ -153,10 +162,15 @@ def run_end_to_end(
                 for s in sugg.scenarios
             ],
             issues_summary=summarize_issues_for_log(issues),
+            timings=[asdict(t) for t in timings],
         )
         try:
-            write_jsonl(entry, config.log_path)
+            if log_writer is not None:
+                log_writer.submit(entry)
+            else:
+                write_jsonl(entry, config.log_path)
         except Exception as e:
+            written = 0
             issues.append(
                 Issue(
                     severity=Severity.WARN,
@@ -164,9 +178,20 @@ def run_end_to_end(
                     message="Failed to write decision log entry.",
                     field="log_path",
                     value=str(e),
-                    meta={"path": config.log_path},
+                    meta={"path": config.log_path, "background": log_writer is not None},
                 )
             )
+        timings.append(
+            StageTiming(
+                name="logging",
+                wall_ms=(time.perf_counter() - wall0) * 1000.0,
+                cpu_ms=(time.thread_time() - cpu0) * 1000.0,
+                n_in=len(sugg.scenarios),
+                n_out=written,
+                n_issues=len(issues) - n_issues,
+                status="ok" if written else "failed",
+            )
+        )
 
     return EndToEndResult(
         run_id=run_id,
@@ -181,4 +206,6 @@ def run_end_to_end(
         suggestions=sugg,
         issues=issues,
         summary=summary,
+        timings=timings,
+        memory_profile=None if ctx.memory is None else ctx.memory.report(),
     )
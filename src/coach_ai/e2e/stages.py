@@ -0,0 +1,371 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass, replace
+from dataclasses import field as dc_field
+from typing import Any
+
+from coach_ai.latents import KalmanFatigueParams, compute_latent_states
+from coach_ai.latents.types import LatentResult
+from coach_ai.suggestions import suggest_scenarios
+from coach_ai.suggestions.types import SuggestionResult
+from coach_ai.training_core import Session
+from coach_ai.training_core.pipeline import process_sessions
+from coach_ai.training_core.types import Issue, Severity
+from coach_ai.trends import compute_trends
+
+from .budget import Budget, tail_series
+from .cache import ArtifactStore, series_hash, stage_fingerprint
+from .memprof import MemoryProfiler
+from .types import EndToEndConfig, StageStatus, StageTiming
+
+# Stage names (also the artifact keys of a run).
+TRAINING_CORE = "training_core"
+ATHLETE_SERIES = "athlete_series"
+TRENDS = "trends"
+LATENTS = "latents"
+SUGGESTIONS = "suggestions"
+
+# Cache slot holding each athlete's most recent full-quality suggestions (deadline fallback).
+LAST_SUGGESTIONS = "suggestions_last"
+
+
+@dataclass(slots=True)
+class StageContext:
+    """Mutable state of one run: inputs, memoized artifacts and collected issues.
+
+    artifacts[name] holds a stage output once computed; None means the stage ran
+    (or was skipped) and produced nothing usable. Seeding an artifact before the
+    run (e.g. a shared training_core result) makes the graph reuse it.
+    timings gets one StageTiming per stage the graph visited.
+    With a `cache`, trends/latents/suggestions are looked up by (stage config
+    fingerprint, input series hash) before computing; hits are listed in cache_hits.
+    With a `budget`, stages degrade under time pressure (see coach_ai.e2e.budget).
+    With `memory`, every stage is profiled with tracemalloc (see coach_ai.e2e.memprof).
+    """
+
+    config: EndToEndConfig
+    sessions: list[Session]
+    artifacts: dict[str, Any] = dc_field(default_factory=dict)
+    issues: list[Issue] = dc_field(default_factory=list)
+    timings: list[StageTiming] = dc_field(default_factory=list)
+    cache: ArtifactStore | None = None
+    cache_hits: list[str] = dc_field(default_factory=list)
+    input_hash: str | None = None
+    budget: Budget | None = None
+    memory: MemoryProfiler | None = None
+
+
+def artifact_size(obj: Any) -> int:
+    """Point count of a stage artifact (sessions, series points, scenarios...)."""
+    if obj is None:
+        return 0
+    for attr in ("points", "scenarios", "order", "processed"):
+        items = getattr(obj, attr, None)
+        if items is not None:
+            return len(items)
+    return 0
+
+
+StageFn = Callable[[StageContext], Any]
+
+
+@dataclass(frozen=True, slots=True)
+class Stage:
+    """One node of the run graph.
+
+    fn reads its dependencies from ctx.artifacts and returns its own artifact.
+    If fn raises, the artifact is None and an ERROR issue `failure_code` is recorded
+    (default: "<name>_failed"); dependents are skipped, the run continues.
+    """
+
+    name: str
+    deps: tuple[str, ...]
+    fn: StageFn
+    failure_code: str | None = None
+
+
+class StageGraph:
+    """A small DAG of stages executed in dependency order, each at most once per run."""
+
+    def __init__(self, stages: Sequence[Stage]) -> None:
+        self.stages: dict[str, Stage] = {}
+        for st in stages:
+            if st.name in self.stages:
+                raise ValueError(f"Duplicate stage: {st.name}")
+            self.stages[st.name] = st
+        for st in stages:
+            missing = [d for d in st.deps if d not in self.stages]
+            if missing:
+                raise ValueError(f"Stage {st.name} depends on unknown stages: {missing}")
+        self.order: list[str] = self._toposort()
+
+    def _toposort(self) -> list[str]:
+        order: list[str] = []
+        state: dict[str, int] = {}  # 1 = visiting, 2 = done
+
+        def visit(name: str) -> None:
+            if state.get(name) == 2:
+                return
+            if state.get(name) == 1:
+                raise ValueError(f"Cycle in stage graph at {name}")
+            state[name] = 1
+            for d in self.stages[name].deps:
+                visit(d)
+            state[name] = 2
+            order.append(name)
+
+        for name in self.stages:
+            visit(name)
+        return order
+
+    def required(self, targets: Iterable[str] | None = None) -> list[str]:
+        """Stages needed for `targets` (all stages if None), in execution order."""
+        if targets is None:
+            return list(self.order)
+        needed: set[str] = set()
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name in needed:
+                continue
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage: {name}")
+            needed.add(name)
+            stack.extend(self.stages[name].deps)
+        return [n for n in self.order if n in needed]
+
+    def run(self, ctx: StageContext, *, targets: Iterable[str] | None = None) -> StageContext:
+        """Execute the needed stages once each; already-present artifacts are reused."""
+        for name in self.required(targets):
+            stage = self.stages[name]
+            n_in = (
+                artifact_size(ctx.artifacts.get(stage.deps[0])) if stage.deps else len(ctx.sessions)
+            )
+            n_issues = len(ctx.issues)
+            if ctx.memory is not None:
+                ctx.memory.begin(name)
+            wall0, cpu0 = time.perf_counter(), time.thread_time()
+            status: StageStatus = "ok"
+
+            if name in ctx.artifacts:
+                status = "reused"
+            elif any(ctx.artifacts.get(d) is None for d in stage.deps):
+                ctx.artifacts[name] = None
+                status = "skipped"
+            else:
+                try:
+                    ctx.artifacts[name] = stage.fn(ctx)
+                except Exception as e:  # keep runner resilient
+                    ctx.artifacts[name] = None
+                    status = "failed"
+                    ctx.issues.append(
+                        Issue(
+                            severity=Severity.ERROR,
+                            code=stage.failure_code or f"{name}_failed",
+                            message=f"{name} stage failed.",
+                            field=name,
+                            value=str(e),
+                        )
+                    )
+
+            if status == "ok" and name in ctx.cache_hits:
+                status = "cached"
+            ctx.timings.append(
+                StageTiming(
+                    name=name,
+                    wall_ms=(time.perf_counter() - wall0) * 1000.0,
+                    cpu_ms=(time.thread_time() - cpu0) * 1000.0,
+                    n_in=n_in,
+                    n_out=artifact_size(ctx.artifacts[name]),
+                    n_issues=len(ctx.issues) - n_issues,
+                    status=status,
+                )
+            )
+            if ctx.memory is not None:
+                ctx.memory.end(name, ctx.artifacts[name])
+        return ctx
+
+
+def kalman_params(config: EndToEndConfig) -> KalmanFatigueParams:
+    return KalmanFatigueParams(
+        tau_days=config.kalman_tau_days,
+        process_var=config.kalman_process_var,
+        obs_var=config.kalman_obs_var,
+    )
+
+
+def stage_training_core(ctx: StageContext) -> Any:
+    config = ctx.config
+    return process_sessions(
+        ctx.sessions,
+        metric_keys=(config.metric_key, "srpe_load"),
+        normalizer_min_n=config.normalizer_min_n,
+        clip_z=config.clip_z,
+    )
+
+
+def stage_athlete_series(ctx: StageContext) -> Any:
+    tc = ctx.artifacts[TRAINING_CORE]
+    series = tc.by_athlete.get(ctx.config.athlete_id)
+    if series is None:
+        ctx.issues.append(
+            Issue(
+                severity=Severity.ERROR,
+                code="athlete_not_found",
+                message="Requested athlete_id not present in processed sessions.",
+                field="athlete_id",
+                value=ctx.config.athlete_id,
+                meta={"available": list(tc.by_athlete.keys())},
+            )
+        )
+        return None
+    budget = ctx.budget
+    window = ctx.config.deadline_window
+    if budget is not None:
+        if len(series.order) > window and budget.wants("downsample"):
+            budget.take("downsample", ctx.issues, n_points=len(series.order), kept=window)
+            series = tail_series(series, window)
+        else:
+            budget.settle("downsample")  # later steps must not back-fill it
+    return series
+
+
+def _cached(ctx: StageContext, stage: str, compute: Callable[[], Any]) -> Any:
+    if ctx.cache is None:
+        return compute()
+    if ctx.input_hash is None:
+        ctx.input_hash = series_hash(ctx.artifacts[ATHLETE_SERIES])
+    fp = stage_fingerprint(ctx.config, stage)
+    hit = ctx.cache.get(stage, fp, ctx.input_hash)
+    if hit is not None:
+        ctx.cache_hits.append(stage)
+        return hit
+    value = compute()
+    if ctx.budget is None or not ctx.budget.degraded:
+        ctx.cache.put(stage, fp, ctx.input_hash, value)
+    return value
+
+
+def _explain(ctx: StageContext) -> bool:
+    budget = ctx.budget
+    if budget is not None and budget.wants("skip_explanations"):
+        budget.take("skip_explanations", ctx.issues)
+        return False
+    return True
+
+
+def _cached_fallback(ctx: StageContext) -> Any:
+    """Last cached suggestions once the budget is exhausted (None if not applicable)."""
+    budget = ctx.budget
+    if budget is None or ctx.cache is None or not budget.wants("cached_fallback"):
+        return None
+    hit = ctx.cache.get(
+        LAST_SUGGESTIONS, stage_fingerprint(ctx.config, SUGGESTIONS), ctx.config.athlete_id
+    )
+    if hit is not None:
+        budget.take("cached_fallback", ctx.issues, generated_at=hit.generated_at.isoformat())
+        ctx.artifacts[SUGGESTIONS] = hit
+    return hit
+
+
+def stage_trends(ctx: StageContext) -> Any:
+    if _cached_fallback(ctx) is not None:
+        return None  # suggestions already served from cache; dependents are skipped
+    config = ctx.config
+    trend = _cached(
+        ctx,
+        TRENDS,
+        lambda: compute_trends(
+            ctx.artifacts[ATHLETE_SERIES],
+            metric_key=config.metric_key,
+            use_normalized=config.use_normalized,
+            smooth_method=config.smooth_method,  # "ewma" or "rolling_mean"
+            ewma_alpha=config.ewma_alpha,
+            slope_threshold=config.slope_threshold_norm if config.use_normalized else 1.0,
+            lookback=config.lookback,
+        ),
+    )
+    ctx.issues.extend(trend.issues)
+    return trend
+
+
+def stage_latents(ctx: StageContext) -> Any:
+    if _cached_fallback(ctx) is not None:
+        return None
+    config = ctx.config
+    budget = ctx.budget
+    if budget is not None and budget.wants("skip_latents"):
+        budget.take("skip_latents", ctx.issues)
+        trend = ctx.artifacts[TRENDS]
+        # no points: the scenario engine falls back to neutral latents with zero confidence
+        return LatentResult(
+            athlete_id=ctx.config.athlete_id,
+            metric_key=config.metric_key,
+            used_normalized=config.use_normalized,
+            points=[],
+            issues=[],
+            summary={"coverage": trend.summary.get("coverage", 0.0), "skipped": "deadline"},
+        )
+    explain = _explain(ctx)
+    latents = _cached(
+        ctx,
+        LATENTS,
+        lambda: compute_latent_states(
+            ctx.artifacts[ATHLETE_SERIES],
+            metric_key=config.metric_key,
+            use_normalized=config.use_normalized,
+            trend=ctx.artifacts[TRENDS],
+            fatigue_alpha=config.fatigue_alpha,
+            plateau_lookback=config.plateau_lookback,
+            fatigue_engine=config.fatigue_engine,  # "ewma" or "kalman"
+            kalman=kalman_params(config),
+            explain=explain,
+        ),
+    )
+    ctx.issues.extend(latents.issues)
+    return latents
+
+
+def stage_suggestions(ctx: StageContext) -> Any:
+    hit = _cached_fallback(ctx)
+    if hit is not None:
+        return hit
+    config = ctx.config
+    explain = _explain(ctx)
+    sugg = _cached(
+        ctx,
+        SUGGESTIONS,
+        lambda: suggest_scenarios(
+            ctx.artifacts[ATHLETE_SERIES],
+            metric_key=config.metric_key,
+            use_normalized=config.use_normalized,
+            top_k=config.scenario_top_k,
+            trend=ctx.artifacts[TRENDS],
+            latents=ctx.artifacts[LATENTS],
+            explain=explain,
+        ),
+    )
+    if SUGGESTIONS in ctx.cache_hits:
+        # same inputs, same scenarios; but this run is what produced them now
+        sugg = replace(sugg, generated_at=SuggestionResult.now_utc())
+    ctx.issues.extend(sugg.issues)
+    if ctx.cache is not None and (ctx.budget is None or not ctx.budget.degraded):
+        ctx.cache.put(
+            LAST_SUGGESTIONS, stage_fingerprint(config, SUGGESTIONS), config.athlete_id, sugg
+        )
+    return sugg
+
+
+def default_stage_graph() -> StageGraph:
+    """training_core -> athlete_series -> trends -> latents -> suggestions."""
+    return StageGraph(
+        [
+            Stage(TRAINING_CORE, (), stage_training_core),
+            Stage(ATHLETE_SERIES, (TRAINING_CORE,), stage_athlete_series),
+            Stage(TRENDS, (ATHLETE_SERIES,), stage_trends),
+            Stage(LATENTS, (ATHLETE_SERIES, TRENDS), stage_latents),
+            Stage(SUGGESTIONS, (ATHLETE_SERIES, TRENDS, LATENTS), stage_suggestions),
+        ]
+    )
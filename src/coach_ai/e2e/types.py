@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from dataclasses import field as dc_field
 from datetime import datetime
-from typing import Any
+from typing import Any, Literal
 
 from coach_ai.latents.types import LatentResult
 from coach_ai.suggestions.types import SuggestionResult
@@ -31,16 +32,53 @@ class EndToEndConfig:
     # Latents
     fatigue_alpha: float = 0.35
     plateau_lookback: int = 6
+    fatigue_engine: str = "ewma"  # "ewma" or "kalman"
+    kalman_tau_days: float = 7.0
+    kalman_process_var: float = 0.05
+    kalman_obs_var: float = 0.5
+
+    # Suggestions (None = materialize every scenario)
+    scenario_top_k: int | None = None
 
     # training_core normalization
     normalizer_min_n: int = 10
     clip_z: float | None = 5.0
 
+    # Time budget (None = unbounded). Under pressure the run degrades in a fixed order:
+    # skip explanations, keep only the last `deadline_window` points, skip latents,
+    # then fall back to the last cached suggestions (each step reported as an issue).
+    deadline_ms: float | None = None
+    deadline_window: int = 120
+
     # Logging
     log_enabled: bool = True
     log_path: str = "data/logs/decisions.jsonl"
 
 
+StageStatus = Literal["ok", "cached", "failed", "skipped", "reused"]
+
+
+@dataclass(frozen=True, slots=True)
+class StageTiming:
+    """Cost of one stage in one run.
+
+    wall_ms / cpu_ms: elapsed and CPU time of the calling thread
+    n_in: points fed to the stage (its primary dependency, or sessions for the root stage)
+    n_out: points / scenarios / entries produced
+    n_issues: issues the stage added
+    status: ok | cached (artifact cache hit) | failed (raised) | skipped (a dependency
+            was missing) | reused (seeded)
+    """
+
+    name: str
+    wall_ms: float
+    cpu_ms: float
+    n_in: int
+    n_out: int
+    n_issues: int
+    status: StageStatus = "ok"
+
+
 @dataclass(frozen=True, slots=True)
 class EndToEndResult:
     """All artifacts produced by one end-to-end run."""
@@ -59,3 +97,22 @@ class EndToEndResult:
 
     issues: list[Issue]
     summary: dict[str, float | str]
+
+    timings: list[StageTiming] = dc_field(default_factory=list)
+    memory_profile: dict[str, Any] | None = None  # MemoryProfiler.report() when profiled
+
+
+@dataclass(frozen=True, slots=True)
+class BatchRunResult:
+    """Per-athlete results of one batch run plus an aggregated issues view.
+
+    results: athlete_id -> EndToEndResult (failed athletes still get a result with issues)
+    issues_summary: issue counts by severity across all athletes
+    issues_by_code: issue counts by code across all athletes
+    failed: athlete_ids whose run produced no suggestions
+    """
+
+    results: dict[str, EndToEndResult]
+    issues_summary: dict[str, int]
+    issues_by_code: dict[str, int]
+    failed: list[str]
@@ -0,0 +1,13 @@
+from .cases import SeriesCase, adversarial_cases, simulator_cases
+from .harness import KERNELS, Kernel, assert_equivalent, compare_outputs, run_equivalence
+
+__all__ = [
+    "KERNELS",
+    "Kernel",
+    "SeriesCase",
+    "adversarial_cases",
+    "assert_equivalent",
+    "compare_outputs",
+    "run_equivalence",
+    "simulator_cases",
+]
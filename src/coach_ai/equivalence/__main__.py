@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from .cases import adversarial_cases, simulator_cases
+from .harness import KERNELS, run_equivalence
+
+
+def _fmt_speedup(s: float | None) -> str:
+    return "-" if s is None else f"{s:.2f}x"
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Check array fast paths against the reference kernels.")
+    p.add_argument("--athletes", type=int, default=4, help="Simulated athletes (2 series each)")
+    p.add_argument("--days", type=int, default=168)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--adversarial-n", type=int, default=60, help="Length of adversarial series")
+    p.add_argument("--kernels", default=",".join(k.name for k in KERNELS))
+    p.add_argument("--repeats", type=int, default=3)
+    p.add_argument("--rtol", type=float, default=1e-9)
+    p.add_argument("--atol", type=float, default=1e-12)
+    p.add_argument("--out", default="data/equivalence/report.json", help="Report JSON path")
+
+    args = p.parse_args()
+    names = [k for k in args.kernels.split(",") if k.strip()]
+    unknown = set(names) - {k.name for k in KERNELS}
+    if unknown:
+        p.error(f"Unknown kernels: {sorted(unknown)}")
+    cases = simulator_cases(athletes=args.athletes, days=args.days, seed=args.seed)
+    cases += adversarial_cases(n=args.adversarial_n, seed=args.seed)
+    rep = run_equivalence(
+        cases,
+        kernels=[k for k in KERNELS if k.name in names],
+        rtol=args.rtol,
+        atol=args.atol,
+        repeats=args.repeats,
+    )
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(rep, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    print("Equivalence check done.")
+    for r in rep["kernels"]:
+        src = "  ".join(f"{s} {_fmt_speedup(v['speedup'])}" for s, v in r["by_source"].items())
+        b = r["batch"]
+        if b is not None:
+            shape = "x".join(map(str, b["shape"]))
+            ok = "" if b["ok"] else " FAILED"
+            src += f"  batch {shape} {_fmt_speedup(b['speedup'])}{ok}"
+        print(
+            f"  {r['kernel']:<20} {'ok' if r['ok'] else 'FAILED':<7}"
+            f" max|diff|={r['max_abs_diff']:.1e}  speedup {_fmt_speedup(r['speedup'])} ({src})"
+        )
+        for f in r["failures"][:5] + ([] if b is None else b["failures"][:5]):
+            print("     ", f)
+    print("Report:", str(out))
+    if not rep["ok"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+
+from coach_ai.training_core.pipeline import process_sessions
+from coach_ai.validation.simulator import simulate_population_batch
+from coach_ai.validation.types import AthleteSimConfig, epoch_ns
+
+_T0 = datetime(2025, 1, 6, 7, 0, tzinfo=UTC)
+
+
+@dataclass(frozen=True, slots=True)
+class SeriesCase:
+    """One input series: times and values (None / NaN / inf = missing)."""
+
+    name: str
+    times: list[datetime]
+    values: list[float | None]
+
+    @property
+    def t_ns(self) -> np.ndarray:
+        return np.array([epoch_ns(t) for t in self.times], dtype=np.int64)
+
+    @property
+    def array(self) -> np.ndarray:
+        return np.array([np.nan if v is None else v for v in self.values], dtype=float)
+
+
+def simulator_cases(
+    *, athletes: int = 4, days: int = 168, seed: int = 0, missing_exercises_prob: float = 0.05
+) -> list[SeriesCase]:
+    """Raw and normalized volume series of a simulated population (two cases per athlete)."""
+    cfgs = [
+        AthleteSimConfig(
+            athlete_id=f"a{i + 1}",
+            days=days,
+            missing_exercises_prob=missing_exercises_prob,
+            baseline_volume_kg=550.0 + 80.0 * (i % 3),
+        )
+        for i in range(athletes)
+    ]
+    sessions = simulate_population_batch(cfgs, seed=seed).to_sessions()
+    tc = process_sessions(sessions, metric_keys=("volume_load_kg",), normalizer_min_n=5)
+    out = []
+    for aid, s in tc.by_athlete.items():
+        out.append(SeriesCase(f"sim/{aid}/raw", s.start_times, s.metrics["volume_load_kg"]))
+        out.append(SeriesCase(f"sim/{aid}/z", s.start_times, s.normalized["volume_load_kg"]))
+    return out
+
+
+def _daily(n: int) -> list[datetime]:
+    return [_T0 + timedelta(days=i) for i in range(n)]
+
+
+def adversarial_cases(*, n: int = 60, seed: int = 0) -> list[SeriesCase]:
+    """Edge-case series: empty, all-missing, flat, threshold ties, non-increasing times..."""
+    rng = np.random.default_rng(seed)
+    z = rng.normal(0.0, 1.0, n)
+    days = _daily(n)
+
+    # duplicates and backwards steps among otherwise daily times
+    shuffled = list(days)
+    for i in range(3, n, 7):
+        shuffled[i] = shuffled[i - 1]
+    for i in range(5, n - 1, 11):
+        shuffled[i], shuffled[i + 1] = shuffled[i + 1], shuffled[i]
+    gaps = np.cumsum(rng.choice([0.25, 0.5, 1.0, 2.0, 7.0], n))
+    irregular = [_T0 + timedelta(days=float(g)) for g in gaps]
+
+    def with_missing(p: float) -> list[float | None]:
+        return [None if rng.random() < p else float(v) for v in z]
+
+    # derivatives of these hit +-slope/volatile thresholds exactly and tie window means
+    ties = [float(v) for v in rng.choice([0.0, 0.05, 0.1, 0.2, 0.25], n)]
+    nonfinite = [float(v) for v in z]
+    for i in range(0, n, 6):
+        nonfinite[i] = math.nan
+    for i in range(3, n, 9):
+        nonfinite[i] = math.inf if i % 2 else -math.inf
+
+    return [
+        SeriesCase("adv/empty", [], []),
+        SeriesCase("adv/single", days[:1], [1.0]),
+        SeriesCase("adv/all_missing", days, [None] * n),
+        SeriesCase(
+            "adv/leading_missing", days, [None] * (n // 2) + [float(v) for v in z[n // 2 :]]
+        ),
+        SeriesCase("adv/sparse", days, with_missing(0.7)),
+        SeriesCase("adv/flat", days, [1.0] * n),
+        SeriesCase(
+            "adv/flat_zero_with_gaps", days, [None if i % 4 == 1 else 0.0 for i in range(n)]
+        ),
+        SeriesCase("adv/threshold_ties", days, ties),
+        SeriesCase("adv/alternating", days, [(-1.0) ** i for i in range(n)]),
+        SeriesCase("adv/step", days, [0.0] * (n // 2) + [3.0] * (n - n // 2)),
+        SeriesCase("adv/non_increasing_times", shuffled, with_missing(0.1)),
+        SeriesCase("adv/irregular_times", irregular, with_missing(0.1)),
+        SeriesCase("adv/nonfinite", days, nonfinite),
+        SeriesCase("adv/large", days, [float(v) for v in 1e6 + 1e5 * z]),
+        SeriesCase("adv/tiny", days, [float(v) for v in 1e-9 * z]),
+    ]
@@ -0,0 +1,236 @@
+"""Array fast paths of the per-point series kernels, checked by the harness.
+
+Candidates only: the pipelines still run the list kernels. A fast path moves next to
+the kernel it mirrors (like trends.smoothing.ewma_array) once a pipeline calls it.
+All of them work along the last axis, so a (B x n) population matrix is one call.
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+from coach_ai.latents.probability import sigmoid_array
+from coach_ai.training_core.normalization import NormalizerParams
+from coach_ai.trends.smoothing import ewma_array
+from coach_ai.trends.types import TrendDirection
+
+# code i of classify_points_array is DIRECTIONS[i]
+DIRECTIONS: tuple[TrendDirection, ...] = tuple(TrendDirection)
+
+
+def rolling_mean_array(
+    values: np.ndarray,
+    *,
+    window: int,
+    min_periods: int = 1,
+) -> np.ndarray:
+    """Vectorized rolling_mean along the last axis (NaN = missing).
+
+    Same window (the last `window` points, missing ones included) and min_periods rule.
+    Each window is summed oldest-first like rolling_mean, with one array step per
+    window offset, so the cost is `window` passes over the data.
+    """
+    if window <= 0:
+        raise ValueError("window must be > 0")
+    if min_periods <= 0:
+        raise ValueError("min_periods must be > 0")
+
+    x = np.asarray(values, dtype=float)
+    finite = np.isfinite(x)
+    xz = np.where(finite, x, 0.0)
+    n = x.shape[-1]
+    total = np.zeros_like(xz)
+    count = np.zeros(x.shape, dtype=np.int64)
+    for k in range(min(window, n) - 1, -1, -1):
+        # add the point k steps back (oldest first) to every position that has one
+        total[..., k:] += xz[..., : n - k]
+        count[..., k:] += finite[..., : n - k]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = total / count
+    return np.where(count >= min_periods, mean, np.nan)
+
+
+def derivative_per_day_array(
+    t_ns: np.ndarray,
+    values: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Vectorized discrete_derivative_per_day on int64 ns timestamps (NaN = missing).
+
+    Returns (derivatives, non_increasing): NaN wherever `discrete_derivative_per_day`
+    returns None, and a bool mask of the steps it reports as non_increasing_time.
+    """
+    t = np.asarray(t_ns, dtype=np.int64)
+    v = np.asarray(values, dtype=float)
+    if t.shape != v.shape:
+        raise ValueError("times and values must have same length")
+
+    out = np.full(v.shape, np.nan)
+    bad = np.zeros(v.shape, dtype=bool)
+    if v.shape[-1] < 2:
+        return out, bad
+    dt_days = np.diff(t, axis=-1) / 86_400e9
+    both = np.isfinite(v[..., 1:]) & np.isfinite(v[..., :-1])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        d = (v[..., 1:] - v[..., :-1]) / dt_days
+    out[..., 1:] = np.where(both & (dt_days > 0), d, np.nan)
+    bad[..., 1:] = both & (dt_days <= 0)
+    return out, bad
+
+
+def classify_points_array(
+    smooth: np.ndarray,
+    derivative: np.ndarray,
+    *,
+    slope_threshold: float = 0.05,
+    volatile_threshold: float = 0.20,
+    lookback: int = 5,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Vectorized classify_points along the last axis (NaN = missing), without texts.
+
+    Returns (codes, confidence): int8 indices into DIRECTIONS and the same confidences.
+    Window means, sign flips and the decision order follow classify_points; window
+    sums run oldest-first so threshold ties resolve the same way.
+    """
+    s = np.asarray(smooth, dtype=float)
+    d = np.asarray(derivative, dtype=float)
+    if s.shape != d.shape:
+        raise ValueError("smooth and derivative must have same length")
+
+    n = d.shape[-1]
+    finite = np.isfinite(d)
+    dz = np.where(finite, d, 0.0)
+    sign = np.where(finite & ~(np.abs(dz) < slope_threshold), np.where(dz > 0, 1, -1), 0)
+
+    total = np.zeros_like(dz)
+    count = np.zeros(d.shape, dtype=np.int64)
+    flips = np.zeros(d.shape, dtype=np.int64)
+    last = np.zeros(d.shape, dtype=np.int64)  # last nonzero sign seen in the window
+    for k in range(min(lookback, n) - 1, -1, -1):
+        total[..., k:] += dz[..., : n - k]
+        count[..., k:] += finite[..., : n - k]
+        sg = sign[..., : n - k]
+        prev = last[..., k:]
+        flips[..., k:] += (sg != 0) & (prev != 0) & (sg != prev)
+        last[..., k:] = np.where(sg != 0, sg, prev)
+
+    mean = total / np.maximum(count, 1)
+    abs_mean = np.abs(mean)
+    valid = np.isfinite(s) & finite
+    enough = count >= max(2, lookback // 2)
+    volatile = (flips >= 2) & (abs_mean >= volatile_threshold)
+    stable = abs_mean < slope_threshold
+
+    st = max(1e-6, slope_threshold)
+    vt = max(1e-6, volatile_threshold)
+    with np.errstate(over="ignore"):
+        c_volatile = 0.4 + 0.6 / (1.0 + np.exp(-(abs_mean - volatile_threshold) / vt))
+        c_stable = 0.35 + 0.65 / (1.0 + np.exp(-(slope_threshold - abs_mean) / st))
+        c_trend = 0.2 + 0.8 / (1.0 + np.exp(-(abs_mean - slope_threshold) / st))
+
+    code = {dr: i for i, dr in enumerate(DIRECTIONS)}
+    codes = np.select(
+        [~valid, ~enough, volatile, stable, mean > 0],
+        [
+            code[TrendDirection.INSUFFICIENT],
+            code[TrendDirection.INSUFFICIENT],
+            code[TrendDirection.VOLATILE],
+            code[TrendDirection.STABLE],
+            code[TrendDirection.UP],
+        ],
+        code[TrendDirection.DOWN],
+    ).astype(np.int8)
+    conf = np.select(
+        [~valid, ~enough, volatile, stable],
+        [0.0, 0.15, np.minimum(1.0, c_volatile), np.minimum(1.0, c_stable)],
+        np.minimum(1.0, c_trend),
+    )
+    return codes, conf
+
+
+def normalize_array(
+    values: np.ndarray,
+    params: NormalizerParams,
+    *,
+    clip_z: float | None = None,
+) -> np.ndarray:
+    """Vectorized normalize_series (NaN = missing in and out)."""
+    x = np.asarray(values, dtype=float)
+    denom = params.scale
+    if (not math.isfinite(denom)) or abs(denom) < params.epsilon:
+        denom = denom + params.epsilon
+    with np.errstate(invalid="ignore"):
+        z = np.where(np.isfinite(x), (x - params.center) / denom, np.nan)
+    if clip_z is not None:
+        z = np.clip(z, -clip_z, clip_z)
+    return z
+
+
+def fatigue_array(
+    load: np.ndarray,
+    *,
+    alpha: float = 0.35,
+    emphasize_positive: bool = True,
+    k: float = 1.2,
+    x0: float = 0.0,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Vectorized compute_fatigue along the last axis: (fatigue_raw, fatigue_p), NaN = None.
+
+    No issues are reported; an all-missing row simply stays NaN.
+    """
+    if not (0 < alpha <= 1):
+        raise ValueError("alpha must be in (0,1]")
+    x = np.asarray(load, dtype=float)
+    if emphasize_positive:
+        x = np.where(np.isfinite(x), np.maximum(0.0, x), np.nan)
+    raw = ewma_array(x, alpha=alpha)
+    return raw, sigmoid_array(raw, k=k, x0=x0)
+
+
+def plateau_probability_array(
+    directions: np.ndarray,
+    confidence: np.ndarray,
+    derivative: np.ndarray,
+    *,
+    lookback: int = 6,
+    slope_ref: float = 0.05,
+    k: float = 6.0,
+) -> np.ndarray:
+    """Vectorized compute_plateau_probability from trend columns, without texts.
+
+    directions: int codes into DIRECTIONS; derivative: NaN = None.
+    Window sums run oldest-first like the per-point means.
+    """
+    codes = np.asarray(directions)
+    conf = np.clip(np.asarray(confidence, dtype=float), 0.0, 1.0)
+    d = np.asarray(derivative, dtype=float)
+    finite = np.isfinite(d)
+    abs_d = np.where(finite, np.abs(d), 0.0)
+    stable = codes == DIRECTIONS.index(TrendDirection.STABLE)
+    volatile = codes == DIRECTIONS.index(TrendDirection.VOLATILE)
+
+    n = d.shape[-1]
+    size = np.zeros(d.shape, dtype=np.int64)
+    n_stable = np.zeros(d.shape, dtype=np.int64)
+    n_volatile = np.zeros(d.shape, dtype=np.int64)
+    n_slopes = np.zeros(d.shape, dtype=np.int64)
+    conf_sum = np.zeros(d.shape)
+    slope_sum = np.zeros(d.shape)
+    for j in range(min(lookback, n) - 1, -1, -1):
+        size[..., j:] += 1
+        n_stable[..., j:] += stable[..., : n - j]
+        n_volatile[..., j:] += volatile[..., : n - j]
+        n_slopes[..., j:] += finite[..., : n - j]
+        conf_sum[..., j:] += conf[..., : n - j]
+        slope_sum[..., j:] += abs_d[..., : n - j]
+
+    denom = np.maximum(1, size)
+    stable_ratio = n_stable / denom
+    volatile_ratio = n_volatile / denom
+    conf_avg = np.where(size > 0, conf_sum / denom, 0.0)
+    mean_abs_slope = np.where(n_slopes > 0, slope_sum / np.maximum(1, n_slopes), 0.0)
+    score = (
+        (stable_ratio * conf_avg) - (0.8 * volatile_ratio) - (mean_abs_slope / max(1e-6, slope_ref))
+    )
+    return np.clip(sigmoid_array(score, k=k, x0=0.0), 0.0, 1.0)
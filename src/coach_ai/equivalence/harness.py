@@ -0,0 +1,492 @@
+from __future__ import annotations
+
+import math
+import time
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+import numpy as np
+
+from coach_ai.latents.probability import sigmoid_array
+from coach_ai.latents.readiness import readiness_bonus
+from coach_ai.training_core.normalization import fit_normalizer
+from coach_ai.trends.smoothing import ewma_array
+from coach_ai.trends.types import TrendPoint, TrendResult
+
+from . import reference as ref
+from .cases import SeriesCase, adversarial_cases, simulator_cases
+from .fast import (
+    DIRECTIONS,
+    classify_points_array,
+    derivative_per_day_array,
+    fatigue_array,
+    normalize_array,
+    plateau_probability_array,
+    rolling_mean_array,
+)
+
+Outputs = dict[str, Any]
+Prepared = tuple[Callable[[], Outputs], Callable[[], Outputs]]
+BatchCall = Callable[[], Outputs]  # outputs as (B x n) arrays, rows padded past each case
+
+# pipeline defaults (trends.compute_trends / latents.compute_latent_states)
+EWMA_ALPHA = 0.35
+ROLLING_WINDOW = 5
+CLIP_Z = 5.0
+
+
+@dataclass(frozen=True, slots=True)
+class Kernel:
+    """A reference/fast pair: prepare(case) -> (reference call, fast call).
+
+    Inputs are built in prepare, so the two zero-argument calls time only the kernels.
+    Outputs map names to sequences; `categorical` ones must match exactly, the others
+    within tolerance with identical missing positions (None and NaN both count as missing).
+
+    `batch(cases)` (optional) returns one fast call over the padded (B x n) matrix of all
+    cases, timed against the reference looping over them (see run_equivalence).
+    """
+
+    name: str
+    prepare: Callable[[SeriesCase], Prepared]
+    categorical: tuple[str, ...] = ()
+    batch: Callable[[Sequence[SeriesCase]], BatchCall] | None = None
+
+
+def reference_trend(case: SeriesCase) -> TrendResult:
+    """compute_trends (ewma smoothing, defaults) assembled from the reference kernels."""
+    smooth = ref.ewma(case.values, alpha=EWMA_ALPHA)
+    deriv, issues = ref.discrete_derivative_per_day(case.times, smooth)
+    dirs, confs, expl = ref.classify_points(smooth, deriv)
+    points = [
+        TrendPoint(
+            t=t,
+            value=v,
+            smooth=s,
+            derivative=d,
+            direction=di,
+            confidence=float(np.clip(c, 0.0, 1.0)),
+            explanation=e,
+        )
+        for t, v, s, d, di, c, e in zip(
+            case.times, case.values, smooth, deriv, dirs, confs, expl, strict=True
+        )
+    ]
+    return TrendResult(
+        athlete_id=case.name,
+        metric_key="value",
+        used_normalized=True,
+        points=points,
+        issues=issues,
+        summary={},
+    )
+
+
+def _nan(values: Sequence[float | None]) -> np.ndarray:
+    return np.array([np.nan if v is None else v for v in values], dtype=float)
+
+
+def _ewma(case: SeriesCase) -> Prepared:
+    x = case.array
+    return (
+        lambda: {"smooth": ref.ewma(case.values, alpha=EWMA_ALPHA)},
+        lambda: {"smooth": ewma_array(x, alpha=EWMA_ALPHA)},
+    )
+
+
+def _rolling_mean(case: SeriesCase) -> Prepared:
+    x = case.array
+    kw = {"window": ROLLING_WINDOW, "min_periods": max(1, ROLLING_WINDOW // 2)}
+    return (
+        lambda: {"smooth": ref.rolling_mean(case.values, **kw)},
+        lambda: {"smooth": rolling_mean_array(x, **kw)},
+    )
+
+
+def _derivative(case: SeriesCase) -> Prepared:
+    smooth = ref.ewma(case.values, alpha=EWMA_ALPHA)
+    s_arr, t_ns = _nan(smooth), case.t_ns
+
+    def reference() -> Outputs:
+        d, issues = ref.discrete_derivative_per_day(case.times, smooth)
+        bad = np.zeros(len(d), dtype=bool)
+        bad[[int(i.field[len("times[") : -1]) for i in issues]] = True
+        return {"derivative": d, "non_increasing": bad}
+
+    def fast() -> Outputs:
+        d, bad = derivative_per_day_array(t_ns, s_arr)
+        return {"derivative": d, "non_increasing": bad}
+
+    return reference, fast
+
+
+def _classify(case: SeriesCase) -> Prepared:
+    smooth = ref.ewma(case.values, alpha=EWMA_ALPHA)
+    deriv, _ = ref.discrete_derivative_per_day(case.times, smooth)
+    s_arr, d_arr = _nan(smooth), _nan(deriv)
+
+    def reference() -> Outputs:
+        dirs, confs, _ = ref.classify_points(smooth, deriv)
+        return {"direction": [d.value for d in dirs], "confidence": confs}
+
+    def fast() -> Outputs:
+        codes, conf = classify_points_array(s_arr, d_arr)
+        return {"direction": [DIRECTIONS[c].value for c in codes], "confidence": conf}
+
+    return reference, fast
+
+
+def _normalize(case: SeriesCase) -> Prepared:
+    params, _ = fit_normalizer(case.values, min_n=1)
+    x = case.array
+    return (
+        lambda: {"z": ref.normalize_series(case.values, params, clip_z=CLIP_Z)},
+        lambda: {"z": normalize_array(x, params, clip_z=CLIP_Z)},
+    )
+
+
+def _fatigue(case: SeriesCase) -> Prepared:
+    x = case.array
+
+    def reference() -> Outputs:
+        raw, p, _ = ref.compute_fatigue(case.values)
+        return {"fatigue_raw": raw, "fatigue_p": p}
+
+    def fast() -> Outputs:
+        raw, p = fatigue_array(x)
+        return {"fatigue_raw": raw, "fatigue_p": p}
+
+    return reference, fast
+
+
+def _readiness(case: SeriesCase) -> Prepared:
+    trend = reference_trend(case)
+    fatigue_raw, _, _ = ref.compute_fatigue(case.values)
+    f_arr = _nan(fatigue_raw)
+
+    def reference() -> Outputs:
+        raw, p, _ = ref.compute_readiness(fatigue_raw, trend)
+        return {"readiness_raw": raw, "readiness_p": p}
+
+    def fast() -> Outputs:
+        raw = -f_arr + readiness_bonus(trend, f_arr.size)
+        return {"readiness_raw": raw, "readiness_p": sigmoid_array(raw, k=1.2)}
+
+    return reference, fast
+
+
+def _plateau(case: SeriesCase) -> Prepared:
+    trend = reference_trend(case)
+    codes = np.array([DIRECTIONS.index(p.direction) for p in trend.points], dtype=np.int8)
+    conf = np.array([p.confidence for p in trend.points], dtype=float)
+    deriv = _nan([p.derivative for p in trend.points])
+    return (
+        lambda: {"plateau_p": ref.compute_plateau_probability(trend)[0]},
+        lambda: {"plateau_p": plateau_probability_array(codes, conf, deriv)},
+    )
+
+
+def _padded(rows: Sequence[Sequence[Any]], fill: float = np.nan, dtype: Any = float) -> np.ndarray:
+    """(B x max length) matrix of the rows, padded at the end with `fill`."""
+    out = np.full((len(rows), max((len(r) for r in rows), default=0)), fill, dtype=dtype)
+    for i, r in enumerate(rows):
+        out[i, : len(r)] = [fill if v is None else v for v in r]
+    return out
+
+
+def _padded_times(cases: Sequence[SeriesCase]) -> np.ndarray:
+    # padding repeats the last time: the padded values are NaN, so no step is reported
+    t = _padded([c.t_ns.tolist() for c in cases], fill=0, dtype=np.int64)
+    for i, c in enumerate(cases):
+        if 0 < len(c.values) < t.shape[1]:
+            t[i, len(c.values) :] = t[i, len(c.values) - 1]
+    return t
+
+
+def _ewma_batch(cases: Sequence[SeriesCase]) -> BatchCall:
+    x = _padded([c.values for c in cases])
+    return lambda: {"smooth": ewma_array(x, alpha=EWMA_ALPHA)}
+
+
+def _rolling_mean_batch(cases: Sequence[SeriesCase]) -> BatchCall:
+    x = _padded([c.values for c in cases])
+    kw = {"window": ROLLING_WINDOW, "min_periods": max(1, ROLLING_WINDOW // 2)}
+    return lambda: {"smooth": rolling_mean_array(x, **kw)}
+
+
+def _derivative_batch(cases: Sequence[SeriesCase]) -> BatchCall:
+    s = _padded([ref.ewma(c.values, alpha=EWMA_ALPHA) for c in cases])
+    t = _padded_times(cases)
+
+    def fast() -> Outputs:
+        d, bad = derivative_per_day_array(t, s)
+        return {"derivative": d, "non_increasing": bad}
+
+    return fast
+
+
+def _classify_batch(cases: Sequence[SeriesCase]) -> BatchCall:
+    smooth = [ref.ewma(c.values, alpha=EWMA_ALPHA) for c in cases]
+    deriv = [
+        ref.discrete_derivative_per_day(c.times, sm)[0] for c, sm in zip(cases, smooth, strict=True)
+    ]
+    s, d = _padded(smooth), _padded(deriv)
+
+    def fast() -> Outputs:
+        codes, conf = classify_points_array(s, d)
+        return {"direction": np.array([dr.value for dr in DIRECTIONS])[codes], "confidence": conf}
+
+    return fast
+
+
+def _fatigue_batch(cases: Sequence[SeriesCase]) -> BatchCall:
+    x = _padded([c.values for c in cases])
+
+    def fast() -> Outputs:
+        raw, p = fatigue_array(x)
+        return {"fatigue_raw": raw, "fatigue_p": p}
+
+    return fast
+
+
+def _plateau_batch(cases: Sequence[SeriesCase]) -> BatchCall:
+    trends = [reference_trend(c).points for c in cases]
+    codes = _padded([[DIRECTIONS.index(p.direction) for p in t] for t in trends], 0, np.int8)
+    conf = _padded([[p.confidence for p in t] for t in trends], 0.0)
+    deriv = _padded([[p.derivative for p in t] for t in trends])
+    return lambda: {"plateau_p": plateau_probability_array(codes, conf, deriv)}
+
+
+KERNELS: tuple[Kernel, ...] = (
+    Kernel("ewma", _ewma, batch=_ewma_batch),
+    Kernel("rolling_mean", _rolling_mean, batch=_rolling_mean_batch),
+    Kernel(
+        "derivative_per_day",
+        _derivative,
+        categorical=("non_increasing",),
+        batch=_derivative_batch,
+    ),
+    Kernel("classify_points", _classify, categorical=("direction",), batch=_classify_batch),
+    Kernel("normalize", _normalize),
+    Kernel("fatigue", _fatigue, batch=_fatigue_batch),
+    Kernel("readiness", _readiness),
+    Kernel("plateau", _plateau, batch=_plateau_batch),
+)
+
+
+def _jsonable(v: Any) -> Any:
+    if isinstance(v, np.generic):
+        v = v.item()
+    if isinstance(v, float) and not math.isfinite(v):
+        return None if math.isnan(v) else str(v)
+    return v
+
+
+def compare_outputs(
+    reference: Outputs,
+    fast: Outputs,
+    *,
+    rtol: float = 1e-9,
+    atol: float = 1e-12,
+    categorical: Iterable[str] = (),
+) -> tuple[list[dict[str, Any]], float]:
+    """(mismatches, max |reference - fast| over values present in both).
+
+    One mismatch per disagreeing output, with the count and the first bad index.
+    """
+    categorical = set(categorical)
+    mismatches: list[dict[str, Any]] = []
+    max_diff = 0.0
+    for key, r_raw in reference.items():
+        if key not in fast:
+            mismatches.append({"output": key, "error": "missing from fast outputs"})
+            continue
+        if key in categorical:
+            r, f = np.asarray(list(r_raw)), np.asarray(list(fast[key]))
+            bad = r != f if r.shape == f.shape else None
+        else:
+            r, f = _nan(list(r_raw)), _nan(list(fast[key]))
+            bad = None
+            if r.shape == f.shape:
+                miss_r, miss_f = np.isnan(r), np.isnan(f)
+                both = ~miss_r & ~miss_f
+                with np.errstate(invalid="ignore"):
+                    close = np.isclose(r, f, rtol=rtol, atol=atol)
+                    diff = np.abs(r[both] - f[both])
+                bad = (miss_r != miss_f) | (both & ~close)
+                diff = diff[np.isfinite(diff)]
+                max_diff = max(max_diff, float(diff.max()) if diff.size else 0.0)
+        if bad is None:
+            mismatches.append(
+                {"output": key, "error": f"length {len(r)} (reference) != {len(f)} (fast)"}
+            )
+        elif bad.any():
+            i = int(np.argmax(bad))
+            mismatches.append(
+                {
+                    "output": key,
+                    "n_bad": int(bad.sum()),
+                    "first_index": i,
+                    "reference": _jsonable(r[i]),
+                    "fast": _jsonable(f[i]),
+                }
+            )
+    return mismatches, max_diff
+
+
+def _timed(fn: Callable[[], Outputs], repeats: int) -> tuple[float, Outputs | None, str | None]:
+    best, out = math.inf, None
+    try:
+        for _ in range(max(1, repeats)):
+            t0 = time.perf_counter()
+            out = fn()
+            best = min(best, time.perf_counter() - t0)
+    except Exception as e:  # an exception is a result to compare, not a harness failure
+        return 0.0, None, type(e).__name__
+    return best, out, None
+
+
+def _speedup(ref_s: float, fast_s: float) -> float | None:
+    return ref_s / fast_s if fast_s > 0 else None
+
+
+def _run_batch(
+    k: Kernel, cases: Sequence[SeriesCase], *, rtol: float, atol: float, repeats: int
+) -> dict[str, Any] | None:
+    """Reference looping over the cases vs one fast call on their (B x n) matrix."""
+    if k.batch is None or not cases:
+        return None
+    refs = [k.prepare(c)[0] for c in cases]
+
+    def reference() -> Outputs:
+        outs = [f() for f in refs]
+        return {key: [v for o in outs for v in o[key]] for key in outs[0]}
+
+    t_ref, out_ref, err_ref = _timed(reference, repeats)
+    t_fast, out_fast, err_fast = _timed(k.batch(cases), repeats)
+    mism: list[dict[str, Any]] = []
+    if err_ref or err_fast:
+        if err_ref != err_fast:
+            mism = [{"output": "<raised>", "reference": err_ref, "fast": err_fast}]
+    else:
+        # drop each row's padding, then compare like one long case
+        lengths = [len(c.values) for c in cases]
+        flat = {
+            key: [
+                v for row, n in zip(np.asarray(m), lengths, strict=True) for v in row[:n].tolist()
+            ]
+            for key, m in out_fast.items()
+        }
+        mism, _ = compare_outputs(out_ref, flat, rtol=rtol, atol=atol, categorical=k.categorical)
+    return {
+        "ok": not mism,
+        "failures": mism,
+        "shape": [len(cases), max(len(c.values) for c in cases)],
+        "reference_s": t_ref,
+        "fast_s": t_fast,
+        "speedup": _speedup(t_ref, t_fast),
+    }
+
+
+def run_equivalence(
+    cases: Sequence[SeriesCase] | None = None,
+    *,
+    kernels: Sequence[Kernel] = KERNELS,
+    rtol: float = 1e-9,
+    atol: float = 1e-12,
+    repeats: int = 3,
+    max_failures: int = 20,
+) -> dict[str, Any]:
+    """Run every kernel's reference and fast path on every case; agreement + speedups.
+
+    cases default to simulator_cases() + adversarial_cases(). Times are the best of
+    `repeats` calls, summed over cases, overall and per case source ("sim", "adv").
+    A case where both paths raise the same exception type counts as agreement.
+
+    Kernels with a `batch` also run once on the padded (B x n) matrix of the simulator
+    cases (the population as the pipelines would feed it), reported under "batch":
+    per-series timings understate fast paths that vectorize across rows.
+    """
+    cases = list(cases) if cases is not None else simulator_cases() + adversarial_cases()
+    rows = []
+    for k in kernels:
+        failures: list[dict[str, Any]] = []
+        n_failed = 0
+        max_diff = 0.0
+        by_source: dict[str, list[float]] = {}
+        for case in cases:
+            ref_fn, fast_fn = k.prepare(case)
+            t_ref, out_ref, err_ref = _timed(ref_fn, repeats)
+            t_fast, out_fast, err_fast = _timed(fast_fn, repeats)
+            src = by_source.setdefault(case.name.split("/", 1)[0], [0.0, 0.0])
+            src[0] += t_ref
+            src[1] += t_fast
+
+            if err_ref or err_fast:
+                mism = (
+                    []
+                    if err_ref == err_fast
+                    else [{"output": "<raised>", "reference": err_ref, "fast": err_fast}]
+                )
+            else:
+                mism, diff = compare_outputs(
+                    out_ref, out_fast, rtol=rtol, atol=atol, categorical=k.categorical
+                )
+                max_diff = max(max_diff, diff)
+            if mism:
+                n_failed += 1
+                failures.extend({"case": case.name, **m} for m in mism)
+
+        ref_s = sum(v[0] for v in by_source.values())
+        fast_s = sum(v[1] for v in by_source.values())
+        rows.append(
+            {
+                "kernel": k.name,
+                "ok": n_failed == 0,
+                "n_cases": len(cases),
+                "n_points": sum(len(c.values) for c in cases),
+                "n_failed_cases": n_failed,
+                "failures": failures[:max_failures],
+                "max_abs_diff": max_diff,
+                "reference_s": ref_s,
+                "fast_s": fast_s,
+                "speedup": _speedup(ref_s, fast_s),
+                "by_source": {
+                    s: {"reference_s": r, "fast_s": f, "speedup": _speedup(r, f)}
+                    for s, (r, f) in by_source.items()
+                },
+                "batch": _run_batch(
+                    k,
+                    [c for c in cases if c.name.startswith("sim/")],
+                    rtol=rtol,
+                    atol=atol,
+                    repeats=repeats,
+                ),
+            }
+        )
+    return {
+        "generated_at_utc": datetime.now(UTC).isoformat(),
+        "ok": all(r["ok"] and (r["batch"] is None or r["batch"]["ok"]) for r in rows),
+        "tolerance": {"rtol": rtol, "atol": atol},
+        "repeats": repeats,
+        "cases": [c.name for c in cases],
+        "kernels": rows,
+    }
+
+
+def assert_equivalent(report: dict[str, Any]) -> None:
+    """Raise AssertionError listing the first failures of every disagreeing kernel."""
+    lines = [
+        f"{r['kernel']}: {r['n_failed_cases']} case(s), e.g. {r['failures'][:3]}"
+        for r in report["kernels"]
+        if not r["ok"]
+    ]
+    lines += [
+        f"{r['kernel']} (batch): {r['batch']['failures'][:3]}"
+        for r in report["kernels"]
+        if r["batch"] is not None and not r["batch"]["ok"]
+    ]
+    if lines:
+        raise AssertionError("Fast paths disagree with the reference:\n" + "\n".join(lines))
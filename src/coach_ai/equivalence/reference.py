@@ -0,0 +1,469 @@
+"""Frozen pure-Python kernels: the semantics the array fast paths are checked against.
+
+Verbatim copies of the per-point implementations in trends, training_core.normalization
+and latents. Keep them as they are: when a live kernel changes on purpose, update the
+copy in the same change, never to make a failing equivalence check pass.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Sequence
+from datetime import datetime
+
+import numpy as np
+
+from coach_ai.training_core.normalization import NormalizerParams
+from coach_ai.training_core.types import Issue, Severity
+from coach_ai.trends.types import TrendDirection, TrendResult
+
+# Readiness modulation per unit of trend confidence (directions not listed are neutral).
+_DIRECTION_BONUS: dict[TrendDirection, float] = {
+    TrendDirection.DOWN: +0.30,
+    TrendDirection.UP: -0.30,
+    TrendDirection.VOLATILE: -0.15,
+}
+
+
+def rolling_mean(
+    values: Sequence[float | None],
+    *,
+    window: int,
+    min_periods: int = 1,
+) -> list[float | None]:
+    """Count-based rolling mean that ignores None.
+
+    - window: number of last points to include
+    - min_periods: minimum number of non-missing points required to output a mean
+    """
+    if window <= 0:
+        raise ValueError("window must be > 0")
+    if min_periods <= 0:
+        raise ValueError("min_periods must be > 0")
+
+    out: list[float | None] = []
+
+    for i, _x in enumerate(values):
+        # maintain a sliding window buffer of the last `window` raw values (including None),
+        # but compute mean only on non-missing.
+        start = max(0, i - window + 1)
+        w = values[start : i + 1]
+        finite = [float(v) for v in w if v is not None and np.isfinite(v)]
+        if len(finite) < min_periods:
+            out.append(None)
+        else:
+            out.append(float(np.mean(finite)))
+    return out
+
+
+def ewma(
+    values: Sequence[float | None],
+    *,
+    alpha: float,
+) -> list[float | None]:
+    """Exponentially weighted moving average (None-safe).
+
+    - alpha in (0,1]: higher alpha = more reactive
+    - If x is None, EWMA carries forward the previous value (keeps smoothing continuity),
+      but remains None until the first finite value appears.
+    """
+    if not (0 < alpha <= 1):
+        raise ValueError("alpha must be in (0, 1]")
+
+    out: list[float | None] = []
+    s: float | None = None
+
+    for x in values:
+        if x is None or not np.isfinite(x):
+            out.append(s)
+            continue
+        xv = float(x)
+        s = xv if s is None else (alpha * xv + (1 - alpha) * s)
+        out.append(float(s))
+    return out
+
+
+def discrete_derivative_per_day(
+    times: Sequence[datetime],
+    values: Sequence[float | None],
+) -> tuple[list[float | None], list[Issue]]:
+    """Compute discrete derivative dv/dt per day.
+
+    Returns (derivatives, issues).
+    - derivative[i] corresponds to slope between i-1 and i (derivative[0]=None; empty in, empty out).
+    - If time difference <= 0 or missing values, derivative is None and an issue may be emitted.
+    """
+    if len(times) != len(values):
+        raise ValueError("times and values must have same length")
+
+    out: list[float | None] = [None] if times else []
+    issues: list[Issue] = []
+
+    for i in range(1, len(times)):
+        t0, t1 = times[i - 1], times[i]
+        v0, v1 = values[i - 1], values[i]
+
+        if v0 is None or v1 is None:
+            out.append(None)
+            continue
+        if not (np.isfinite(v0) and np.isfinite(v1)):
+            out.append(None)
+            continue
+
+        dt_days = (t1 - t0).total_seconds() / 86400.0
+        if dt_days <= 0:
+            out.append(None)
+            issues.append(
+                Issue(
+                    severity=Severity.WARN,
+                    code="non_increasing_time",
+                    message="Non-increasing timestamps encountered; derivative undefined at this step.",
+                    field=f"times[{i}]",
+                    value=t1.isoformat(),
+                    meta={"prev_time": t0.isoformat(), "dt_days": dt_days},
+                )
+            )
+            continue
+
+        out.append(float((float(v1) - float(v0)) / dt_days))
+
+    return out, issues
+
+
+def _sigmoid(x: float) -> float:
+    return 1.0 / (1.0 + math.exp(-x))
+
+
+def classify_points(
+    smooth: Sequence[float | None],
+    derivative: Sequence[float | None],
+    *,
+    slope_threshold: float = 0.05,
+    volatile_threshold: float = 0.20,
+    lookback: int = 5,
+) -> tuple[list[TrendDirection], list[float], list[str]]:
+    """Classify trend per point.
+
+    Assumptions (explicit):
+    - Designed primarily for *normalized* series (z-scores).
+      If used on raw metrics, tune thresholds accordingly.
+    - slope_threshold: minimum |slope| (z/day) to call UP/DOWN
+    - volatile_threshold: if recent slope sign flips and magnitude is high -> VOLATILE
+
+    Returns: (direction, confidence, explanation) per point.
+    """
+    n = len(smooth)
+    if len(derivative) != n:
+        raise ValueError("smooth and derivative must have same length")
+
+    dirs: list[TrendDirection] = []
+    confs: list[float] = []
+    expl: list[str] = []
+
+    for i in range(n):
+        s = smooth[i]
+        d = derivative[i]
+
+        if s is None or d is None or not np.isfinite(s) or not np.isfinite(d):
+            dirs.append(TrendDirection.INSUFFICIENT)
+            confs.append(0.0)
+            expl.append("Insufficient data (missing smooth/derivative).")
+            continue
+
+        # recent derivative window
+        j0 = max(0, i - lookback + 1)
+        recent = [x for x in derivative[j0 : i + 1] if x is not None and np.isfinite(x)]
+        if len(recent) < max(2, lookback // 2):
+            dirs.append(TrendDirection.INSUFFICIENT)
+            confs.append(0.15)
+            expl.append("Too few recent derivative points to classify reliably.")
+            continue
+
+        mean_slope = float(np.mean(recent))
+        abs_mean = abs(mean_slope)
+
+        # sign flip count (volatility proxy)
+        signs = []
+        for x in recent:
+            if abs(float(x)) < slope_threshold:
+                continue
+            signs.append(1 if float(x) > 0 else -1)
+        flips = sum(1 for k in range(1, len(signs)) if signs[k] != signs[k - 1])
+
+        if flips >= 2 and abs_mean >= volatile_threshold:
+            dirs.append(TrendDirection.VOLATILE)
+            # confidence: high that it's volatile when flips + magnitude exist
+            c = 0.4 + 0.6 * _sigmoid(
+                (abs_mean - volatile_threshold) / max(1e-6, volatile_threshold)
+            )
+            confs.append(float(min(1.0, c)))
+            expl.append(
+                f"Volatile: frequent sign flips (flips={flips}) with sizable slope (mean={mean_slope:.3f})."
+            )
+            continue
+
+        if abs_mean < slope_threshold:
+            dirs.append(TrendDirection.STABLE)
+            # confidence higher when mean slope is near 0 and recent slopes are small
+            c = 0.35 + 0.65 * _sigmoid((slope_threshold - abs_mean) / max(1e-6, slope_threshold))
+            confs.append(float(min(1.0, c)))
+            expl.append(
+                f"Stable: mean slope below threshold (mean={mean_slope:.3f} < {slope_threshold})."
+            )
+            continue
+
+        if mean_slope > 0:
+            dirs.append(TrendDirection.UP)
+            c = 0.2 + 0.8 * _sigmoid((abs_mean - slope_threshold) / max(1e-6, slope_threshold))
+            confs.append(float(min(1.0, c)))
+            expl.append(f"Up: positive mean slope above threshold (mean={mean_slope:.3f}).")
+        else:
+            dirs.append(TrendDirection.DOWN)
+            c = 0.2 + 0.8 * _sigmoid((abs_mean - slope_threshold) / max(1e-6, slope_threshold))
+            confs.append(float(min(1.0, c)))
+            expl.append(f"Down: negative mean slope above threshold (mean={mean_slope:.3f}).")
+
+    return dirs, confs, expl
+
+
+def normalize_value(x: float | int | None, params: NormalizerParams) -> float | None:
+    """Normalize a single value using fitted params.
+
+    Returns None if x is None or non-finite.
+
+    Note: epsilon is only applied when scale is too small to be numerically safe.
+    """
+    if x is None:
+        return None
+    try:
+        v = float(x)
+    except (TypeError, ValueError):
+        return None
+    if not math.isfinite(v):
+        return None
+
+    denom = params.scale
+    if (not math.isfinite(denom)) or abs(denom) < params.epsilon:
+        denom = denom + params.epsilon
+
+    return (v - params.center) / denom
+
+
+def normalize_series(
+    values: Sequence[float | int | None],
+    params: NormalizerParams,
+    *,
+    clip_z: float | None = None,
+) -> list[float | None]:
+    """Normalize a series, optionally clipping z-scores.
+
+    Clipping is useful to prevent extreme outliers from dominating downstream steps.
+    It is *not* a correction; it is a bounded transform.
+    """
+
+    out: list[float | None] = []
+    for x in values:
+        z = normalize_value(x, params)
+        if z is None:
+            out.append(None)
+            continue
+        if clip_z is not None:
+            z = float(np.clip(z, -clip_z, clip_z))
+        out.append(float(z))
+    return out
+
+
+def sigmoid(x: float, *, k: float = 1.0, x0: float = 0.0) -> float:
+    """Logistic mapping to (0,1).
+
+    p = 1 / (1 + exp(-k*(x-x0)))
+
+    - k controls steepness
+    - x0 is the midpoint where p=0.5
+    """
+    z = -k * (x - x0)
+    # numerical safety
+    z = float(np.clip(z, -60.0, 60.0))
+    return 1.0 / (1.0 + math.exp(z))
+
+
+def to_probability_series(
+    values: list[float | None],
+    *,
+    k: float = 1.0,
+    x0: float = 0.0,
+) -> list[float | None]:
+    out: list[float | None] = []
+    for v in values:
+        if v is None:
+            out.append(None)
+            continue
+        out.append(float(sigmoid(float(v), k=k, x0=x0)))
+    return out
+
+
+def compute_fatigue(
+    load_series: list[float | None],
+    *,
+    alpha: float = 0.35,
+    emphasize_positive: bool = True,
+    k: float = 1.2,
+    x0: float = 0.0,
+) -> tuple[list[float | None], list[float | None], list[Issue]]:
+    """Compute Fatigue_t from a (preferably normalized) load series.
+
+    Output:
+    - fatigue_raw: EWMA of load (optionally positive-only)
+    - fatigue_p: sigmoid-mapped probability in [0,1]
+    - issues: uncertainty notes
+
+    Assumptions:
+    - Using normalized load (z-scores) makes parameters more portable per athlete.
+    - emphasize_positive=True focuses fatigue on above-usual loading.
+    """
+    issues: list[Issue] = []
+
+    if not (0 < alpha <= 1):
+        raise ValueError("alpha must be in (0,1]")
+
+    x: list[float | None] = []
+    finite = 0
+    for v in load_series:
+        if v is None or not np.isfinite(v):
+            x.append(None)
+            continue
+        vv = float(v)
+        if emphasize_positive:
+            vv = max(0.0, vv)
+        x.append(vv)
+        finite += 1
+
+    if finite == 0:
+        issues.append(
+            Issue(
+                severity=Severity.ERROR,
+                code="fatigue_no_data",
+                message="No finite load values available to infer fatigue.",
+                field="load_series",
+                value=None,
+            )
+        )
+        raw = [None] * len(load_series)
+        return raw, [None] * len(load_series), issues
+
+    raw = ewma(x, alpha=alpha)
+    fatigue_p = to_probability_series(raw, k=k, x0=x0)
+    return raw, fatigue_p, issues
+
+
+def compute_readiness(
+    fatigue_raw: list[float | None],
+    trend: TrendResult | None,
+    *,
+    k: float = 1.2,
+    x0: float = 0.0,
+) -> tuple[list[float | None], list[float | None], list[str]]:
+    """Compute Readiness_t as a probabilistic state.
+
+    Heuristic (explicit):
+    - readiness_raw is inversely related to fatigue_raw
+    - small modulation from the current load trend direction:
+        DOWN  -> slightly higher readiness (possible recovery context)
+        UP    -> slightly lower readiness (possible accumulating context)
+        VOLATILE -> slightly lower (uncertainty)
+        STABLE/INSUFFICIENT -> neutral
+
+    Returns:
+    - readiness_raw
+    - readiness_p in [0,1]
+    - explanations per point
+    """
+    n = len(fatigue_raw)
+    readiness_raw: list[float | None] = []
+    expl: list[str] = []
+
+    for i in range(n):
+        f = fatigue_raw[i]
+        if f is None or not np.isfinite(f):
+            readiness_raw.append(None)
+            expl.append("Insufficient fatigue signal (missing).")
+            continue
+
+        bonus = 0.0
+        note = "Base readiness from inverse fatigue."
+
+        if trend is not None and i < len(trend.points):
+            d = trend.points[i].direction
+            c = float(np.clip(trend.points[i].confidence, 0.0, 1.0))
+
+            bonus = _DIRECTION_BONUS.get(d, 0.0) * c
+            if d == TrendDirection.DOWN:
+                note = f"Inverse fatigue + small recovery bonus (load trend DOWN, c={c:.2f})."
+            elif d == TrendDirection.UP:
+                note = f"Inverse fatigue + small accumulation penalty (load trend UP, c={c:.2f})."
+            elif d == TrendDirection.VOLATILE:
+                note = f"Inverse fatigue + volatility penalty (c={c:.2f})."
+
+        readiness_raw.append(float((-float(f)) + bonus))
+        expl.append(note)
+
+    readiness_p = to_probability_series(readiness_raw, k=k, x0=x0)
+    return readiness_raw, readiness_p, expl
+
+
+def compute_plateau_probability(
+    trend: TrendResult | None,
+    *,
+    lookback: int = 6,
+    slope_ref: float = 0.05,
+    k: float = 6.0,
+) -> tuple[list[float | None], list[str]]:
+    """Compute Plateau_t probability per point from trend classification.
+
+    Interpretation (explicit, gym-focused):
+    - Plateau here means "stagnation-like pattern in the *chosen metric trend*",
+      not a diagnosis, not a performance guarantee.
+    - High probability when recent points are mostly STABLE with low slope magnitude,
+      and not VOLATILE.
+
+    Returns:
+    - plateau_p per point (None if no trend)
+    - explanations per point
+    """
+    if trend is None:
+        return [], []
+
+    n = len(trend.points)
+    out: list[float | None] = []
+    expl: list[str] = []
+
+    for i in range(n):
+        j0 = max(0, i - lookback + 1)
+        window = trend.points[j0 : i + 1]
+
+        dirs = [p.direction for p in window]
+        confs = [float(np.clip(p.confidence, 0.0, 1.0)) for p in window]
+        slopes = [
+            p.derivative for p in window if p.derivative is not None and np.isfinite(p.derivative)
+        ]
+
+        stable_ratio = dirs.count(TrendDirection.STABLE) / max(1, len(dirs))
+        volatile_ratio = dirs.count(TrendDirection.VOLATILE) / max(1, len(dirs))
+        conf_avg = float(np.mean(confs)) if confs else 0.0
+        mean_abs_slope = float(np.mean([abs(float(s)) for s in slopes])) if slopes else 0.0
+
+        # score: stable helps, volatile hurts, high slope hurts
+        score = (
+            (stable_ratio * conf_avg)
+            - (0.8 * volatile_ratio)
+            - (mean_abs_slope / max(1e-6, slope_ref))
+        )
+        p = sigmoid(score, k=k, x0=0.0)
+
+        out.append(float(np.clip(p, 0.0, 1.0)))
+        expl.append(
+            f"Plateau score from window: stable={stable_ratio:.2f}, volatile={volatile_ratio:.2f}, "
+            f"|slope|={mean_abs_slope:.3f}, conf={conf_avg:.2f}."
+        )
+
+    return out, expl
@@ -1,9 +1,21 @@
-from .pipeline import compute_latent_states
-from .types import LatentName, LatentPoint, LatentResult
+from .banister import BanisterParams, BanisterResult, compute_banister, fit_banister
+from .bootstrap import bootstrap_latent_bands
+from .kalman import KalmanFatigueParams, kalman_fatigue_population
+from .pipeline import FatigueEngine, compute_latent_states
+from .types import LatentBands, LatentName, LatentPoint, LatentResult
 
 __all__ = [
+    "BanisterParams",
+    "BanisterResult",
+    "FatigueEngine",
+    "KalmanFatigueParams",
+    "LatentBands",
     "LatentName",
     "LatentPoint",
     "LatentResult",
+    "bootstrap_latent_bands",
+    "compute_banister",
     "compute_latent_states",
+    "fit_banister",
+    "kalman_fatigue_population",
 ]
@@ -0,0 +1,343 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Literal
+
+import numpy as np
+
+from coach_ai.training_core.pipeline import AthleteSeries
+from coach_ai.training_core.types import Issue, Severity
+
+ConvolutionMethod = Literal["fft", "recursive"]
+
+DEFAULT_TAU_FITNESS_GRID: tuple[float, ...] = tuple(float(x) for x in range(15, 61, 5))
+DEFAULT_TAU_FATIGUE_GRID: tuple[float, ...] = tuple(float(x) for x in range(2, 15))
+
+
+@dataclass(frozen=True, slots=True)
+class BanisterParams:
+    """Fitness-fatigue (impulse-response) model parameters.
+
+    performance(t) = p0 + k_fitness * fitness(t) - k_fatigue * fatigue(t)
+    fitness/fatigue(t) = sum_{s<t} load(s) * exp(-(t-s)/tau)   (daily grid)
+    """
+
+    tau_fitness: float = 42.0
+    tau_fatigue: float = 7.0
+    k_fitness: float = 1.0
+    k_fatigue: float = 2.0
+    p0: float = 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class BanisterResult:
+    """Banister model output for one athlete on a daily grid (first..last session day)."""
+
+    athlete_id: str
+    load_key: str
+    days: list[date]
+    load: list[float]
+    fitness: list[float]
+    fatigue: list[float]
+    performance: list[float]
+    params: BanisterParams
+    fit_sse: float | None
+    issues: list[Issue]
+    summary: dict[str, float | str]
+
+
+def daily_load_grid(
+    series: AthleteSeries,
+    *,
+    load_key: str = "srpe_load",
+) -> tuple[list[date], np.ndarray, list[Issue]]:
+    """Bin a raw metric onto a daily grid (sum per calendar day, 0 on rest days).
+
+    Sessions with a missing load contribute 0 and are reported as one INFO issue:
+    the impulse-response model needs a load for every day, it cannot carry None.
+    """
+    issues: list[Issue] = []
+    values = series.metrics.get(load_key)
+    if values is None:
+        issues.append(
+            Issue(
+                severity=Severity.ERROR,
+                code="banister_load_missing",
+                message="Requested load metric not present in raw metrics series.",
+                field="metrics",
+                value=load_key,
+            )
+        )
+        values = [None] * len(series.start_times)
+
+    if not series.start_times:
+        return [], np.zeros(0, dtype=float), issues
+
+    ordinals = np.array([t.date().toordinal() for t in series.start_times], dtype=np.int64)
+    first = int(ordinals.min())
+    n_days = int(ordinals.max()) - first + 1
+
+    x = np.array([np.nan if v is None else float(v) for v in values], dtype=float)
+    missing = ~np.isfinite(x)
+    if missing.any():
+        issues.append(
+            Issue(
+                severity=Severity.INFO,
+                code="banister_load_missing_values",
+                message="Sessions without a load were binned as 0 load.",
+                field=load_key,
+                value=int(missing.sum()),
+            )
+        )
+
+    load = np.bincount(ordinals - first, weights=np.where(missing, 0.0, x), minlength=n_days)
+    days = [date.fromordinal(first + i) for i in range(n_days)]
+    return days, load.astype(float), issues
+
+
+def impulse_response(
+    load: np.ndarray,
+    taus: np.ndarray | list[float] | tuple[float, ...],
+    *,
+    method: ConvolutionMethod = "fft",
+) -> np.ndarray:
+    """Exponential impulse responses of a daily load for several decay constants at once.
+
+    Returns a (len(taus) x days) array with r[j, t] = sum_{s<t} load[s] * exp(-(t-s)/taus[j]).
+    - "fft": one zero-padded FFT convolution for all taus, O(T * D log D)
+    - "recursive": r[t] = exp(-1/tau) * (r[t-1] + load[t-1]), vectorized over taus, O(T * D)
+    """
+    w = np.asarray(load, dtype=float)
+    tau = np.atleast_1d(np.asarray(taus, dtype=float))
+    if np.any(tau <= 0):
+        raise ValueError("taus must be > 0")
+
+    D = w.size
+    if D == 0:
+        return np.zeros((tau.size, 0), dtype=float)
+
+    if method == "recursive":
+        decay = np.exp(-1.0 / tau)
+        out = np.zeros((tau.size, D), dtype=float)
+        for t in range(1, D):
+            out[:, t] = decay * (out[:, t - 1] + w[t - 1])
+        return out
+
+    if method != "fft":
+        raise ValueError(f"Unsupported method: {method}")
+
+    nfft = 1 << int(2 * D - 1).bit_length()
+    lags = np.arange(D, dtype=float)
+    kernel = np.exp(-lags[None, :] / tau[:, None])
+    kernel[:, 0] = 0.0  # only past days contribute
+    spec = np.fft.rfft(kernel, n=nfft, axis=1) * np.fft.rfft(w, n=nfft)[None, :]
+    return np.fft.irfft(spec, n=nfft, axis=1)[:, :D]
+
+
+def _result(
+    series: AthleteSeries,
+    *,
+    load_key: str,
+    days: list[date],
+    load: np.ndarray,
+    fitness: np.ndarray,
+    fatigue: np.ndarray,
+    params: BanisterParams,
+    fit_sse: float | None,
+    issues: list[Issue],
+) -> BanisterResult:
+    perf = params.p0 + params.k_fitness * fitness - params.k_fatigue * fatigue
+    summary: dict[str, float | str] = {
+        "n_days": float(len(days)),
+        "tau_fitness": float(params.tau_fitness),
+        "tau_fatigue": float(params.tau_fatigue),
+        "last_performance": float(perf[-1]) if perf.size else "none",
+        "load_key": load_key,
+    }
+    return BanisterResult(
+        athlete_id=series.athlete_id,
+        load_key=load_key,
+        days=days,
+        load=[float(v) for v in load],
+        fitness=[float(v) for v in fitness],
+        fatigue=[float(v) for v in fatigue],
+        performance=[float(v) for v in perf],
+        params=params,
+        fit_sse=fit_sse,
+        issues=issues,
+        summary=summary,
+    )
+
+
+def compute_banister(
+    series: AthleteSeries,
+    *,
+    params: BanisterParams | None = None,
+    load_key: str = "srpe_load",
+    method: ConvolutionMethod = "fft",
+) -> BanisterResult:
+    """Fitness-minus-fatigue model with fixed parameters (daily grid)."""
+    p = BanisterParams() if params is None else params
+    days, load, issues = daily_load_grid(series, load_key=load_key)
+    resp = impulse_response(load, (p.tau_fitness, p.tau_fatigue), method=method)
+    return _result(
+        series,
+        load_key=load_key,
+        days=days,
+        load=load,
+        fitness=resp[0],
+        fatigue=resp[1],
+        params=p,
+        fit_sse=None,
+        issues=issues,
+    )
+
+
+def fit_banister(
+    series: AthleteSeries,
+    *,
+    load_key: str = "srpe_load",
+    performance_key: str = "volume_load_kg",
+    use_normalized_performance: bool = True,
+    tau_fitness_grid: tuple[float, ...] = DEFAULT_TAU_FITNESS_GRID,
+    tau_fatigue_grid: tuple[float, ...] = DEFAULT_TAU_FATIGUE_GRID,
+    method: ConvolutionMethod = "fft",
+) -> BanisterResult:
+    """Fit (tau_fitness, tau_fatigue) on a grid and (p0, k_fitness, k_fatigue) by least squares.
+
+    Performance proxy (explicit assumption): the per-session `performance_key` series
+    (normalized by default), averaged per day. It is a proxy, not a measured outcome.
+
+    All taus are convolved in one `impulse_response` call; the 3-parameter least squares
+    for every (tau_fitness, tau_fatigue) pair is solved as one batched normal-equation
+    system. Only pairs with tau_fatigue < tau_fitness and non-negative gains are eligible.
+    """
+    days, load, issues = daily_load_grid(series, load_key=load_key)
+
+    perf_src = (
+        series.normalized.get(performance_key)
+        if use_normalized_performance
+        else series.metrics.get(performance_key)
+    )
+    perf_vals = np.array([np.nan if v is None else float(v) for v in (perf_src or [])], dtype=float)
+
+    def unfitted(code: str, message: str) -> BanisterResult:
+        issues.append(
+            Issue(
+                severity=Severity.ERROR,
+                code=code,
+                message=message,
+                field=performance_key,
+                value=None,
+            )
+        )
+        p = BanisterParams()
+        resp = impulse_response(load, (p.tau_fitness, p.tau_fatigue), method=method)
+        return _result(
+            series,
+            load_key=load_key,
+            days=days,
+            load=load,
+            fitness=resp[0],
+            fatigue=resp[1],
+            params=p,
+            fit_sse=None,
+            issues=issues,
+        )
+
+    if perf_src is None or not days:
+        return unfitted("banister_performance_missing", "Performance series not available.")
+
+    # daily mean performance on days with at least one finite value
+    first = days[0].toordinal()
+    day_idx = np.array([t.date().toordinal() - first for t in series.start_times], dtype=np.int64)
+    ok = np.isfinite(perf_vals)
+    sums = np.bincount(day_idx[ok], weights=perf_vals[ok], minlength=len(days))
+    counts = np.bincount(day_idx[ok], minlength=len(days))
+    obs_days = np.flatnonzero(counts > 0)
+    y = sums[obs_days] / counts[obs_days]
+
+    if y.size < 4:
+        return unfitted(
+            "banister_too_few_points", "Fewer than 4 performance days; cannot fit 3 gains."
+        )
+    if y.size < 10:
+        issues.append(
+            Issue(
+                severity=Severity.WARN,
+                code="banister_low_sample",
+                message=f"Only {y.size} performance days used to fit the Banister model.",
+                field=performance_key,
+                value=int(y.size),
+            )
+        )
+
+    tf = np.asarray(tau_fitness_grid, dtype=float)
+    tg = np.asarray(tau_fatigue_grid, dtype=float)
+    resp = impulse_response(load, np.concatenate([tf, tg]), method=method)[:, obs_days]
+    a = resp[: tf.size]  # (F x m)
+    b = resp[tf.size :]  # (G x m)
+
+    # Design per pair: [1, a_i, -b_j]; normal equations G beta = X^T y, batched over pairs.
+    m = float(y.size)
+    sa, sb = a.sum(axis=1), b.sum(axis=1)
+    saa, sbb = (a * a).sum(axis=1), (b * b).sum(axis=1)
+    sab = a @ b.T
+    say, sby = a @ y, b @ y
+    F, G = tf.size, tg.size
+
+    gram = np.empty((F, G, 3, 3), dtype=float)
+    gram[..., 0, 0] = m
+    gram[..., 0, 1] = gram[..., 1, 0] = sa[:, None]
+    gram[..., 0, 2] = gram[..., 2, 0] = -sb[None, :]
+    gram[..., 1, 1] = saa[:, None]
+    gram[..., 1, 2] = gram[..., 2, 1] = -sab
+    gram[..., 2, 2] = sbb[None, :]
+    rhs = np.empty((F, G, 3), dtype=float)
+    rhs[..., 0] = y.sum()
+    rhs[..., 1] = say[:, None]
+    rhs[..., 2] = -sby[None, :]
+
+    # small ridge keeps near-collinear pairs (tau_fitness ~ tau_fatigue) solvable
+    gram = gram + 1e-9 * np.eye(3)
+    beta = np.linalg.solve(gram, rhs[..., None])[..., 0]  # (F x G x 3)
+
+    pred = beta[..., 0:1] + beta[..., 1:2] * a[:, None, :] - beta[..., 2:3] * b[None, :, :]
+    sse = ((pred - y[None, None, :]) ** 2).sum(axis=2)
+
+    eligible = (
+        (tg[None, :] < tf[:, None]) & (beta[..., 1] >= 0) & (beta[..., 2] >= 0) & np.isfinite(sse)
+    )
+    if not eligible.any():
+        issues.append(
+            Issue(
+                severity=Severity.WARN,
+                code="banister_no_physiological_fit",
+                message="No grid pair gave tau_fatigue < tau_fitness with non-negative gains.",
+                field=performance_key,
+                value=None,
+            )
+        )
+        eligible = np.isfinite(sse)
+
+    i, j = np.unravel_index(np.argmin(np.where(eligible, sse, np.inf)), sse.shape)
+    params = BanisterParams(
+        tau_fitness=float(tf[i]),
+        tau_fatigue=float(tg[j]),
+        k_fitness=float(beta[i, j, 1]),
+        k_fatigue=float(beta[i, j, 2]),
+        p0=float(beta[i, j, 0]),
+    )
+    full = impulse_response(load, (params.tau_fitness, params.tau_fatigue), method=method)
+    return _result(
+        series,
+        load_key=load_key,
+        days=days,
+        load=load,
+        fitness=full[0],
+        fatigue=full[1],
+        params=params,
+        fit_sse=float(sse[i, j]),
+        issues=issues,
+    )
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import warnings
+
+import numpy as np
+
+from coach_ai.training_core.pipeline import AthleteSeries
+from coach_ai.training_core.types import Issue, Severity
+from coach_ai.trends.smoothing import ewma_array
+from coach_ai.trends.types import TrendResult
+
+from .pipeline import default_trend, latent_input_values
+from .probability import sigmoid_array
+from .readiness import readiness_bonus
+from .types import LatentBands, LatentName
+
+# 8-byte arrays held per time column while a block is processed: int64 positions,
+# resampled load, fatigue_raw, the two probability blocks, the nanquantile copy
+# and kernel temporaries.
+_ARRAYS_PER_COLUMN = 10
+
+
+def moving_block_indices(
+    n: int,
+    *,
+    n_boot: int,
+    block_length: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """Draw block starts for a moving-block bootstrap of a length-n series.
+
+    Returns an (n_boot x n_blocks) int array of block start positions. Blocks keep
+    short-range autocorrelation that an i.i.d. resample of a load series would destroy.
+    """
+    if n <= 0:
+        return np.zeros((n_boot, 0), dtype=np.int64)
+    L = max(1, min(int(block_length), n))
+    n_blocks = -(-n // L)
+    return rng.integers(0, n - L + 1, size=(n_boot, n_blocks), dtype=np.int64)
+
+
+def _expand_blocks(
+    starts: np.ndarray, *, n: int, block_length: int, cols: slice = slice(None)
+) -> np.ndarray:
+    """(b x n_blocks) block starts -> (b x n) resampled positions (only `cols` of them)."""
+    L = max(1, min(int(block_length), n))
+    t = np.arange(n, dtype=np.int64)[cols]
+    return starts[:, t // L] + t % L
+
+
+def _quantiles_or_none(mat: np.ndarray, quantiles: tuple[float, ...]) -> list[list[float | None]]:
+    # all-NaN columns (no replicate has seen a finite value yet) are expected
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        q = np.nanquantile(mat, quantiles, axis=0)
+    return [[None if not np.isfinite(v) else float(v) for v in row] for row in q]
+
+
+def bootstrap_latent_bands(
+    series: AthleteSeries,
+    *,
+    metric_key: str = "volume_load_kg",
+    use_normalized: bool = True,
+    trend: TrendResult | None = None,
+    n_boot: int = 200,
+    quantiles: tuple[float, ...] = (0.1, 0.9),
+    block_length: int = 3,
+    fatigue_alpha: float = 0.35,
+    fatigue_k: float = 1.2,
+    readiness_k: float = 1.2,
+    rng: np.random.Generator | None = None,
+    seed: int = 0,
+    max_bytes: int = 32 * 1024 * 1024,
+) -> LatentBands:
+    """Bootstrap percentile bands for fatigue/readiness (batched, no per-replicate pipeline).
+
+    Method (explicit):
+    - moving-block resample of the (normalized) load series, all B replicates built
+      as one (B x n) array
+    - the fatigue kernel (positive-only EWMA -> sigmoid) and readiness kernel
+      (-fatigue + trend bonus -> sigmoid) run across all replicates at once
+    - the trend is held fixed (bands reflect load-sampling uncertainty only)
+
+    Memory:
+    - max_bytes bounds the (B x w) working and result blocks: time is processed in
+      column blocks of width w, the EWMA state is carried across blocks and each
+      block's quantiles are taken before the next one (no (B x n) matrix is built).
+    - not bounded: the (B x ceil(n / block_length)) int64 block starts, drawn up front
+      so results do not depend on max_bytes, and the (len(quantiles) x n) bands.
+
+    Randomness comes only from `rng` (default: np.random.default_rng(seed)).
+    """
+    if n_boot <= 0:
+        raise ValueError("n_boot must be > 0")
+    if not (0 < fatigue_alpha <= 1):
+        raise ValueError("alpha must be in (0,1]")
+    if any(not (0.0 <= q <= 1.0) for q in quantiles):
+        raise ValueError("quantiles must be in [0,1]")
+
+    gen = np.random.default_rng(seed) if rng is None else rng
+    issues: list[Issue] = []
+
+    values, value_issues = latent_input_values(
+        series, metric_key=metric_key, use_normalized=use_normalized
+    )
+    issues.extend(value_issues)
+
+    n = len(series.start_times)
+    x = np.array([np.nan if v is None else float(v) for v in values], dtype=float)
+    finite = np.isfinite(x)
+
+    fatigue = LatentName.FATIGUE.value
+    readiness = LatentName.READINESS.value
+
+    def result(bands: dict[str, list[list[float | None]]]) -> LatentBands:
+        return LatentBands(
+            athlete_id=series.athlete_id,
+            metric_key=metric_key,
+            used_normalized=use_normalized,
+            n_boot=int(n_boot),
+            block_length=int(block_length),
+            quantiles=tuple(float(q) for q in quantiles),
+            t=list(series.start_times),
+            bands=bands,
+            issues=issues,
+        )
+
+    if not finite.any():
+        issues.append(
+            Issue(
+                severity=Severity.ERROR,
+                code="bootstrap_no_data",
+                message="No finite load values available to bootstrap latent bands.",
+                field="load_series",
+                value=None,
+            )
+        )
+        empty = [[None] * n for _ in quantiles]
+        return result({fatigue: empty, readiness: [list(r) for r in empty]})
+
+    if trend is None:
+        trend = default_trend(series, metric_key=metric_key, use_normalized=use_normalized)
+    bonus = readiness_bonus(trend, n)
+
+    # same input transform as compute_fatigue(emphasize_positive=True)
+    x = np.where(finite, np.maximum(x, 0.0), np.nan)
+
+    starts = moving_block_indices(n, n_boot=n_boot, block_length=block_length, rng=gen)
+
+    col_bytes = n_boot * 8 * _ARRAYS_PER_COLUMN
+    width = int(np.clip(max_bytes // col_bytes, 1, n))
+
+    bands: dict[str, list[list[float | None]]] = {
+        fatigue: [[] for _ in quantiles],
+        readiness: [[] for _ in quantiles],
+    }
+    state = np.full(n_boot, np.nan)
+    for t0 in range(0, n, width):
+        cols = slice(t0, min(n, t0 + width))
+        xb = x[_expand_blocks(starts, n=n, block_length=block_length, cols=cols)]
+        raw = ewma_array(xb, alpha=fatigue_alpha, initial=state)
+        state = raw[:, -1]
+        for name, p in (
+            (fatigue, sigmoid_array(raw, k=fatigue_k, x0=0.0)),
+            (readiness, sigmoid_array(-raw + bonus[cols], k=readiness_k, x0=0.0)),
+        ):
+            for out, row in zip(bands[name], _quantiles_or_none(p, quantiles), strict=True):
+                out.extend(row)
+
+    return result(bands)
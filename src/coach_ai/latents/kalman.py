@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+
+from coach_ai.training_core.types import Issue, Severity
+
+from .probability import sigmoid_array
+
+
+@dataclass(frozen=True, slots=True)
+class KalmanFatigueParams:
+    """Scalar linear-Gaussian fatigue model (units: normalized load, days).
+
+    State:       x_t = phi_t * x_{t-1} + w_t,  phi_t = exp(-dt/tau_days),  w_t ~ N(0, process_var * dt)
+    Observation: y_t = x_t + v_t,              v_t ~ N(0, obs_var)
+
+    - tau_days: how fast fatigue decays toward baseline (0) between sessions
+    - process_var: fatigue drift per day; long gaps widen the variance
+    - m0/p0: prior mean/variance before the first observation
+    """
+
+    tau_days: float = 7.0
+    process_var: float = 0.05
+    obs_var: float = 0.5
+    m0: float = 0.0
+    p0: float = 1.0
+
+
+def kalman_filter_batch(
+    obs: np.ndarray,
+    dt_days: np.ndarray,
+    *,
+    params: KalmanFatigueParams | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Forward Kalman filter over many series at once.
+
+    obs: (A x n) observations, NaN = missing (predict only, no update)
+    dt_days: (A x n) days since the previous point (column 0 is ignored);
+             padding cells can use dt=0 with NaN obs (state is left untouched)
+
+    Returns filtered (mean, variance), both (A x n). Cells before a row's first finite
+    observation are NaN, mirroring the EWMA engine's "None until first value".
+    """
+    p = KalmanFatigueParams() if params is None else params
+    if p.tau_days <= 0:
+        raise ValueError("tau_days must be > 0")
+    if p.process_var < 0 or p.obs_var <= 0 or p.p0 < 0:
+        raise ValueError("variances must be non-negative (obs_var > 0)")
+
+    y = np.asarray(obs, dtype=float)
+    dt = np.clip(np.nan_to_num(np.asarray(dt_days, dtype=float), nan=0.0), 0.0, None)
+    if y.shape != dt.shape:
+        raise ValueError("obs and dt_days must have the same shape")
+
+    n_rows, n = y.shape
+    mean = np.empty_like(y)
+    var = np.empty_like(y)
+    m = np.full(n_rows, float(p.m0))
+    P = np.full(n_rows, float(p.p0))
+    seen = np.zeros(n_rows, dtype=bool)
+
+    for i in range(n):
+        # predict
+        if i > 0:
+            phi = np.exp(-dt[:, i] / p.tau_days)
+            m = phi * m
+            P = phi * phi * P + p.process_var * dt[:, i]
+
+        # update where observed
+        yi = y[:, i]
+        ok = np.isfinite(yi)
+        gain = P / (P + p.obs_var)
+        m = np.where(ok, m + gain * (np.where(ok, yi, 0.0) - m), m)
+        P = np.where(ok, (1.0 - gain) * P, P)
+        seen |= ok
+
+        mean[:, i] = np.where(seen, m, np.nan)
+        var[:, i] = np.where(seen, P, np.nan)
+
+    return mean, var
+
+
+def _dt_days(times: Sequence[datetime]) -> tuple[np.ndarray, list[Issue]]:
+    issues: list[Issue] = []
+    dt = np.zeros(len(times), dtype=float)
+    for i in range(1, len(times)):
+        d = (times[i] - times[i - 1]).total_seconds() / 86400.0
+        if d < 0:
+            issues.append(
+                Issue(
+                    severity=Severity.WARN,
+                    code="kalman_non_increasing_time",
+                    message="Non-increasing timestamps; no decay/drift applied at this step.",
+                    field=f"start_times[{i}]",
+                    value=times[i].isoformat(),
+                    meta={"dt_days": d},
+                )
+            )
+            d = 0.0
+        dt[i] = d
+    return dt, issues
+
+
+def _prepare(values: Sequence[float | None], emphasize_positive: bool) -> np.ndarray:
+    x = np.array([np.nan if v is None else float(v) for v in values], dtype=float)
+    x[~np.isfinite(x)] = np.nan
+    if emphasize_positive:
+        x = np.where(np.isnan(x), np.nan, np.maximum(x, 0.0))
+    return x
+
+
+def _none_list(a: np.ndarray) -> list[float | None]:
+    return [None if not np.isfinite(v) else float(v) for v in a]
+
+
+def compute_fatigue_kalman(
+    load_series: list[float | None],
+    start_times: Sequence[datetime],
+    *,
+    params: KalmanFatigueParams | None = None,
+    emphasize_positive: bool = True,
+    k: float = 1.2,
+    x0: float = 0.0,
+) -> tuple[list[float | None], list[float | None], list[float | None], list[Issue]]:
+    """State-space alternative to `compute_fatigue` for one athlete.
+
+    Output:
+    - fatigue_mean: filtered state mean (same role as the EWMA fatigue_raw)
+    - fatigue_p: sigmoid-mapped probability in [0,1]
+    - fatigue_var: filtered state variance (grows over gaps, shrinks with data)
+    - issues: uncertainty notes
+    """
+    if len(load_series) != len(start_times):
+        raise ValueError("load_series and start_times must have same length")
+
+    issues: list[Issue] = []
+    x = _prepare(load_series, emphasize_positive)
+
+    if not np.isfinite(x).any():
+        issues.append(
+            Issue(
+                severity=Severity.ERROR,
+                code="fatigue_no_data",
+                message="No finite load values available to infer fatigue.",
+                field="load_series",
+                value=None,
+            )
+        )
+        none = [None] * len(load_series)
+        return list(none), list(none), list(none), issues
+
+    dt, dt_issues = _dt_days(start_times)
+    issues.extend(dt_issues)
+
+    mean, var = kalman_filter_batch(x[None, :], dt[None, :], params=params)
+    p = sigmoid_array(mean[0], k=k, x0=x0)
+    return _none_list(mean[0]), _none_list(p), _none_list(var[0]), issues
+
+
+def kalman_fatigue_population(
+    series: Sequence[tuple[str, Sequence[datetime], Sequence[float | None]]],
+    *,
+    params: KalmanFatigueParams | None = None,
+    emphasize_positive: bool = True,
+) -> dict[str, tuple[list[float | None], list[float | None], list[Issue]]]:
+    """Run the forward filter for many athletes in one padded (A x n_max) pass.
+
+    series: (athlete_id, start_times, load_series) per athlete
+    Returns athlete_id -> (fatigue_mean, fatigue_var, issues), each aligned to its own
+    series; issues are the ones `compute_fatigue_kalman` reports for that athlete
+    (no data, non-increasing times).
+    """
+    if not series:
+        return {}
+
+    n_max = max(len(t) for _, t, _ in series)
+    obs = np.full((len(series), n_max), np.nan)
+    dt = np.zeros((len(series), n_max))
+    lengths: list[int] = []
+    row_issues: list[list[Issue]] = []
+
+    for row, (_, times, values) in enumerate(series):
+        n = len(times)
+        if len(values) != n:
+            raise ValueError("load_series and start_times must have same length")
+        x = _prepare(values, emphasize_positive)
+        issues: list[Issue] = []
+        if not np.isfinite(x).any():
+            issues.append(
+                Issue(
+                    severity=Severity.ERROR,
+                    code="fatigue_no_data",
+                    message="No finite load values available to infer fatigue.",
+                    field="load_series",
+                    value=None,
+                )
+            )
+        else:
+            obs[row, :n] = x
+            dt[row, :n], dt_issues = _dt_days(times)
+            issues.extend(dt_issues)
+        lengths.append(n)
+        row_issues.append(issues)
+
+    mean, var = kalman_filter_batch(obs, dt, params=params)
+    return {
+        athlete_id: (_none_list(mean[row, :n]), _none_list(var[row, :n]), row_issues[row])
+        for row, ((athlete_id, _, _), n) in enumerate(zip(series, lengths, strict=True))
+    }
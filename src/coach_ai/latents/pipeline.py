@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Literal
+
 import numpy as np
 
 from coach_ai.training_core.pipeline import AthleteSeries
@@ -9,36 +11,28 @@ from coach_ai.trends.types import TrendResult
 
 from .confidence import combine_confidence
 from .fatigue import compute_fatigue
+from .kalman import KalmanFatigueParams, compute_fatigue_kalman
 from .plateau import compute_plateau_probability
 from .readiness import compute_readiness
 from .types import LatentName, LatentPoint, LatentResult
 
+FatigueEngine = Literal["ewma", "kalman"]
 
-def compute_latent_states(
-    series: AthleteSeries,
-    *,
-    metric_key: str = "volume_load_kg",
-    use_normalized: bool = True,
-    trend: TrendResult | None = None,
-    fatigue_alpha: float = 0.35,
-    fatigue_k: float = 1.2,
-    readiness_k: float = 1.2,
-    plateau_lookback: int = 6,
-) -> LatentResult:
-    """Phase 3 pipeline: trends -> latent probabilistic states.
+_FATIGUE_EXPLANATION: dict[str, str] = {
+    "ewma": "Fatigue from EWMA of (normalized) load, mapped via sigmoid.",
+    "kalman": "Fatigue from a Kalman-filtered state of (normalized) load, mapped via sigmoid.",
+}
 
-    Inputs:
-    - AthleteSeries (from training_core.process_sessions)
-    - TrendResult for the same metric (from trends.compute_trends); if not provided, it is computed here.
 
-    Outputs:
-    - per-time probabilities for fatigue/readiness/plateau
-    - confidence + explanations
-    - issues (uncertainty surfaced, not hidden)
-    """
+def latent_input_values(
+    series: AthleteSeries,
+    *,
+    metric_key: str,
+    use_normalized: bool,
+) -> tuple[list[float | None], list[Issue]]:
+    """Pull the metric series latents are inferred from (all-None + ERROR if absent)."""
     issues: list[Issue] = []
 
-    # Pull metric series
     if use_normalized:
         values = series.normalized.get(metric_key)
         if values is None:
@@ -66,26 +60,86 @@ def compute_latent_states(
             )
             values = [None] * len(series.start_times)
 
+    return values, issues
+
+
+def default_trend(
+    series: AthleteSeries,
+    *,
+    metric_key: str,
+    use_normalized: bool,
+) -> TrendResult:
+    """Trend used by the latent engines when the caller does not provide one."""
+    return compute_trends(
+        series,
+        metric_key=metric_key,
+        use_normalized=use_normalized,
+        smooth_method="ewma",
+        ewma_alpha=0.35,
+        slope_threshold=0.05 if use_normalized else 1.0,  # raw requires tuning later
+        lookback=5,
+    )
+
+
+def compute_latent_states(
+    series: AthleteSeries,
+    *,
+    metric_key: str = "volume_load_kg",
+    use_normalized: bool = True,
+    trend: TrendResult | None = None,
+    fatigue_alpha: float = 0.35,
+    fatigue_k: float = 1.2,
+    readiness_k: float = 1.2,
+    plateau_lookback: int = 6,
+    fatigue_engine: FatigueEngine = "ewma",
+    kalman: KalmanFatigueParams | None = None,
+    explain: bool = True,
+) -> LatentResult:
+    """Phase 3 pipeline: trends -> latent probabilistic states.
+
+    Inputs:
+    - AthleteSeries (from training_core.process_sessions)
+    - TrendResult for the same metric (from trends.compute_trends); if not provided, it is computed here.
+    - fatigue_engine: "ewma" (fixed-alpha EWMA) or "kalman" (state-space filter that uses
+      the gaps between start_times and also reports a per-point variance)
+
+    Outputs:
+    - per-time probabilities for fatigue/readiness/plateau
+    - confidence + explanations
+    - issues (uncertainty surfaced, not hidden)
+    """
+    issues: list[Issue] = []
+
+    values, value_issues = latent_input_values(
+        series, metric_key=metric_key, use_normalized=use_normalized
+    )
+    issues.extend(value_issues)
+
     # Ensure we have a trend aligned to time ordering
     if trend is None:
-        trend = compute_trends(
-            series,
-            metric_key=metric_key,
-            use_normalized=use_normalized,
-            smooth_method="ewma",
-            ewma_alpha=0.35,
-            slope_threshold=0.05 if use_normalized else 1.0,  # raw requires tuning later
-            lookback=5,
-        )
+        trend = default_trend(series, metric_key=metric_key, use_normalized=use_normalized)
 
     # Fatigue
-    fatigue_raw, fatigue_p, fat_issues = compute_fatigue(
-        values,
-        alpha=fatigue_alpha,
-        emphasize_positive=True,
-        k=fatigue_k,
-        x0=0.0,
-    )
+    fatigue_var: list[float | None] | None = None
+    if fatigue_engine == "ewma":
+        fatigue_raw, fatigue_p, fat_issues = compute_fatigue(
+            values,
+            alpha=fatigue_alpha,
+            emphasize_positive=True,
+            k=fatigue_k,
+            x0=0.0,
+        )
+    elif fatigue_engine == "kalman":
+        fatigue_raw, fatigue_p, fatigue_var, fat_issues = compute_fatigue_kalman(
+            values,
+            series.start_times,
+            params=kalman,
+            emphasize_positive=True,
+            k=fatigue_k,
+            x0=0.0,
+        )
+    else:
+        raise ValueError(f"Unsupported fatigue_engine: {fatigue_engine}")
     issues.extend(fat_issues)
 
     # Readiness
@@ -133,12 +187,17 @@ def compute_latent_states(
                 },
                 confidence=float(np.clip(conf, 0.0, 1.0)),
                 explanation={
-                    LatentName.FATIGUE.value: "Fatigue from EWMA of (normalized) load, mapped via sigmoid.",
+                    LatentName.FATIGUE.value: _FATIGUE_EXPLANATION[fatigue_engine],
                     LatentName.READINESS.value: readiness_expl[i]
                     if i < len(readiness_expl)
                     else "Readiness unavailable.",
                     LatentName.PLATEAU.value: plateau_expl[i],
-                },
+                }
+                if explain
+                else {},
+                variance={}
+                if fatigue_var is None
+                else {LatentName.FATIGUE.value: fatigue_var[i] if i < len(fatigue_var) else None},
             )
         )
 
@@ -157,6 +216,7 @@ def compute_latent_states(
         else "none",
         "used_normalized": str(bool(use_normalized)),
         "metric_key": metric_key,
+        "fatigue_engine": fatigue_engine,
     }
 
     # Include trend issues (propagate uncertainty)
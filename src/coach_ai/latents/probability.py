@@ -32,3 +32,9 @@ def to_probability_series(
             continue
         out.append(float(sigmoid(float(v), k=k, x0=x0)))
     return out
+
+
+def sigmoid_array(x: np.ndarray, *, k: float = 1.0, x0: float = 0.0) -> np.ndarray:
+    """Vectorized `sigmoid` (NaN in -> NaN out), with the same numerical clipping."""
+    z = np.clip(-k * (np.asarray(x, dtype=float) - x0), -60.0, 60.0)
+    return 1.0 / (1.0 + np.exp(z))
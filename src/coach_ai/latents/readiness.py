@@ -6,6 +6,13 @@ from coach_ai.trends.types import TrendDirection, TrendResult
 
 from .probability import to_probability_series
 
+# Readiness modulation per unit of trend confidence (directions not listed are neutral).
+_DIRECTION_BONUS: dict[TrendDirection, float] = {
+    TrendDirection.DOWN: +0.30,
+    TrendDirection.UP: -0.30,
+    TrendDirection.VOLATILE: -0.15,
+}
+
 
 def compute_readiness(
     fatigue_raw: list[float | None],
@@ -47,14 +54,12 @@ def compute_readiness(
             d = trend.points[i].direction
             c = float(np.clip(trend.points[i].confidence, 0.0, 1.0))
 
+            bonus = _DIRECTION_BONUS.get(d, 0.0) * c
             if d == TrendDirection.DOWN:
-                bonus = +0.30 * c
                 note = f"Inverse fatigue + small recovery bonus (load trend DOWN, c={c:.2f})."
             elif d == TrendDirection.UP:
-                bonus = -0.30 * c
                 note = f"Inverse fatigue + small accumulation penalty (load trend UP, c={c:.2f})."
             elif d == TrendDirection.VOLATILE:
-                bonus = -0.15 * c
                 note = f"Inverse fatigue + volatility penalty (c={c:.2f})."
 
         readiness_raw.append(float((-float(f)) + bonus))
@@ -62,3 +67,17 @@ def compute_readiness(
 
     readiness_p = to_probability_series(readiness_raw, k=k, x0=x0)
     return readiness_raw, readiness_p, expl
+
+
+def readiness_bonus(trend: TrendResult | None, n: int) -> np.ndarray:
+    """Per-point trend modulation used by `compute_readiness`, as an (n,) array.
+
+    Lets array kernels compute readiness_raw = -fatigue_raw + bonus without the
+    per-point loop (points beyond the trend, or without one, get 0).
+    """
+    out = np.zeros(n, dtype=float)
+    if trend is None:
+        return out
+    for i, tp in enumerate(trend.points[:n]):
+        out[i] = _DIRECTION_BONUS.get(tp.direction, 0.0) * float(np.clip(tp.confidence, 0.0, 1.0))
+    return out
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from dataclasses import field as dc_field
 from datetime import datetime
 from enum import StrEnum
 
@@ -20,12 +21,14 @@ class LatentPoint:
     states: probabilities in [0,1] (or None if missing data)
     confidence: 0..1 heuristic confidence about the quality of the inference
     explanation: short human-readable rationale per latent
+    variance: state variance per latent, when the engine provides one (e.g. Kalman fatigue)
     """
 
     t: datetime
     states: dict[str, float | None]
     confidence: float
     explanation: dict[str, str]
+    variance: dict[str, float | None] = dc_field(default_factory=dict)
 
 
 @dataclass(frozen=True, slots=True)
@@ -38,3 +41,22 @@ class LatentResult:
     points: list[LatentPoint]
     issues: list[Issue]
     summary: dict[str, float | str]
+
+
+@dataclass(frozen=True, slots=True)
+class LatentBands:
+    """Bootstrap uncertainty bands for latent probabilities (one athlete).
+
+    bands[latent][q] is the per-point series for quantiles[q] (None where no
+    bootstrap replicate had a finite value yet). Bands are aligned to `t`.
+    """
+
+    athlete_id: str
+    metric_key: str
+    used_normalized: bool
+    n_boot: int
+    block_length: int
+    quantiles: tuple[float, ...]
+    t: list[datetime]
+    bands: dict[str, list[list[float | None]]]
+    issues: list[Issue]
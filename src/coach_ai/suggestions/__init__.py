@@ -1,9 +1,21 @@
+from .batch import suggest_scenarios_batch
 from .pipeline import suggest_scenarios
-from .types import Scenario, ScenarioName, SuggestionResult
+from .timeline import scenario_timeline
+from .types import (
+    Scenario,
+    ScenarioBatchResult,
+    ScenarioName,
+    ScenarioTimeline,
+    SuggestionResult,
+)
 
 __all__ = [
     "Scenario",
+    "ScenarioBatchResult",
     "ScenarioName",
+    "ScenarioTimeline",
     "SuggestionResult",
+    "scenario_timeline",
     "suggest_scenarios",
+    "suggest_scenarios_batch",
 ]
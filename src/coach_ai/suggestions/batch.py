@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+
+from coach_ai.latents import FatigueEngine, KalmanFatigueParams
+from coach_ai.suggestions.engine import (
+    SCENARIO_ORDER,
+    build_context,
+    score_contexts,
+    top_k_indices,
+)
+from coach_ai.suggestions.pipeline import scenario_inputs
+from coach_ai.suggestions.types import ScenarioBatchResult
+from coach_ai.training_core.pipeline import AthleteSeries
+from coach_ai.training_core.types import Issue
+
+
+def suggest_scenarios_batch(
+    series: Mapping[str, AthleteSeries] | Iterable[AthleteSeries],
+    *,
+    metric_key: str = "volume_load_kg",
+    use_normalized: bool = True,
+    fatigue_engine: FatigueEngine = "ewma",
+    kalman: KalmanFatigueParams | None = None,
+    top_k: int = 3,
+) -> ScenarioBatchResult:
+    """Scenario probabilities for many athletes (dashboards, nightly jobs).
+
+    Trends and latents are still computed per athlete; the scenario step is one
+    (athletes x features) @ (features x 6) product plus one row-wise softmax.
+    Probabilities match `suggest_scenarios` for the same series.
+    """
+    items = list(series.values()) if isinstance(series, Mapping) else list(series)
+
+    contexts = []
+    issues: dict[str, list[Issue]] = {}
+    for s in items:
+        trend, latents = scenario_inputs(
+            s,
+            metric_key=metric_key,
+            use_normalized=use_normalized,
+            fatigue_engine=fatigue_engine,
+            kalman=kalman,
+        )
+        contexts.append(build_context(trend=trend, latents=latents))
+        issues[s.athlete_id] = list(trend.issues) + list(latents.issues)
+
+    ids = [s.athlete_id for s in items]
+    scores, probs, conf = score_contexts(contexts)
+
+    top: dict[str, list] = {}
+    for row, idx in enumerate(top_k_indices(probs, top_k)):
+        top[ids[row]] = [(SCENARIO_ORDER[j], float(probs[row, j])) for j in idx]
+
+    return ScenarioBatchResult(
+        athlete_ids=ids,
+        scenario_names=SCENARIO_ORDER,
+        scores=scores,
+        probabilities=probs,
+        confidence=conf,
+        top=top,
+        issues=issues,
+    )
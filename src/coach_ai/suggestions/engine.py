@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+from collections.abc import Mapping, Sequence
 from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any
+
+import numpy as np
 
 from coach_ai.latents.types import LatentResult
-from coach_ai.suggestions.scoring import clamp01, issue_penalty, softmax
+from coach_ai.suggestions.scoring import clamp01, issue_penalty, softmax_rows
 from coach_ai.suggestions.types import Scenario, ScenarioName
 from coach_ai.trends.types import TrendDirection, TrendResult
 
@@ -63,224 +68,373 @@ def build_context(
     )
 
 
-def generate_scenarios(ctx: SuggestionContext) -> list[Scenario]:
-    """Generate scenario list with probabilities and confidences.
+# Column order of every (athletes x 6) score/probability matrix.
+SCENARIO_ORDER: tuple[ScenarioName, ...] = (
+    ScenarioName.RECOVERY,
+    ScenarioName.MAINTENANCE,
+    ScenarioName.PROGRESSION,
+    ScenarioName.VARIATION,
+    ScenarioName.STABILIZE,
+    ScenarioName.DATA_REVIEW,
+)
+
+# Raw context columns (see context_matrix); missing probabilities are NaN.
+CONTEXT_COLUMNS: tuple[str, ...] = (
+    "fatigue_p",
+    "readiness_p",
+    "plateau_p",
+    "trend_dir",  # index into TREND_DIRECTIONS
+    "trend_conf",
+    "latent_conf",
+    "coverage",
+    "issues_penalty",
+)
+
+TREND_DIRECTIONS: tuple[TrendDirection, ...] = tuple(TrendDirection)
+
+# Scoring features derived from the raw context (f/r/p: probabilities, None -> 0.5).
+SCORE_FEATURES: tuple[str, ...] = (
+    "issues_penalty",  # issues_penalty
+    "fatigue_high",  # max(0, f - 0.65)
+    "readiness_low",  # max(0, 0.35 - r)
+    "up_conf",  # trend UP * trend_conf
+    "readiness_high",  # max(0, r - 0.60)
+    "fatigue_not_high",  # max(0, 0.55 - f)
+    "down_conf",  # trend DOWN * trend_conf
+    "plateau_high",  # max(0, p - 0.60)
+    "readiness_ok",  # max(0, r - 0.45)
+    "stable_conf",  # trend STABLE * trend_conf
+    "volatile_conf",  # trend VOLATILE * trend_conf
+    "volatile_low_coverage",  # trend VOLATILE * (1 - coverage)
+    "mid_signals",  # max(0, 1 - |f - 0.5| - |r - 0.5|), highest near middle
+    "flat_unsure",  # trend STABLE/INSUFFICIENT * (1 - trend_conf)
+)
+
+
+def _coefficients() -> np.ndarray:
+    rules: dict[ScenarioName, dict[str, float]] = {
+        # DATA_REVIEW: if issues penalty is high, bring this option up.
+        ScenarioName.DATA_REVIEW: {"issues_penalty": 2.2},
+        # RECOVERY: fatigue high and/or readiness low
+        ScenarioName.RECOVERY: {"fatigue_high": 2.0, "readiness_low": 1.6, "up_conf": 0.4},
+        # PROGRESSION: readiness high and fatigue not high
+        ScenarioName.PROGRESSION: {
+            "readiness_high": 1.8,
+            "fatigue_not_high": 1.2,
+            "down_conf": 0.2,
+        },
+        # VARIATION: plateau risk high with acceptable readiness
+        ScenarioName.VARIATION: {"plateau_high": 2.0, "readiness_ok": 0.8, "stable_conf": 0.3},
+        # STABILIZE: trend volatile
+        ScenarioName.STABILIZE: {"volatile_conf": 1.8, "volatile_low_coverage": 0.6},
+        # MAINTENANCE: default safe middle when nothing screams
+        ScenarioName.MAINTENANCE: {"mid_signals": 0.8, "flat_unsure": 0.2},
+    }
+    w = np.zeros((len(SCORE_FEATURES), len(SCENARIO_ORDER)), dtype=float)
+    for j, name in enumerate(SCENARIO_ORDER):
+        for feat, coef in rules[name].items():
+            w[SCORE_FEATURES.index(feat), j] = coef
+    w.setflags(write=False)
+    return w
+
+
+# (features x scenarios) coefficient matrix: scores = features @ SCORE_COEFFS
+SCORE_COEFFS: np.ndarray = _coefficients()
+
+
+def context_matrix(contexts: Sequence[SuggestionContext]) -> np.ndarray:
+    """Stack contexts into an (n x len(CONTEXT_COLUMNS)) float matrix."""
+    out = np.empty((len(contexts), len(CONTEXT_COLUMNS)), dtype=float)
+    for i, c in enumerate(contexts):
+        out[i] = (
+            np.nan if c.fatigue_p is None else c.fatigue_p,
+            np.nan if c.readiness_p is None else c.readiness_p,
+            np.nan if c.plateau_p is None else c.plateau_p,
+            TREND_DIRECTIONS.index(c.trend_dir),
+            c.trend_conf,
+            c.latent_conf,
+            c.coverage,
+            c.issues_penalty,
+        )
+    return out
+
+
+def score_features(ctx: np.ndarray) -> np.ndarray:
+    """(n x CONTEXT_COLUMNS) -> (n x SCORE_FEATURES)."""
+    x = np.atleast_2d(np.asarray(ctx, dtype=float))
+    f, r, p = (np.where(np.isnan(x[:, j]), 0.5, x[:, j]) for j in range(3))
+    d = x[:, 3].astype(int)
+    tc, cov, pen = x[:, 4], x[:, 6], x[:, 7]
+
+    def is_dir(*dirs: TrendDirection) -> np.ndarray:
+        return np.isin(d, [TREND_DIRECTIONS.index(v) for v in dirs]).astype(float)
+
+    up, down = is_dir(TrendDirection.UP), is_dir(TrendDirection.DOWN)
+    stable, volatile = is_dir(TrendDirection.STABLE), is_dir(TrendDirection.VOLATILE)
+    flat = is_dir(TrendDirection.STABLE, TrendDirection.INSUFFICIENT)
+
+    return np.column_stack(
+        [
+            pen,
+            np.maximum(0.0, f - 0.65),
+            np.maximum(0.0, 0.35 - r),
+            up * tc,
+            np.maximum(0.0, r - 0.60),
+            np.maximum(0.0, 0.55 - f),
+            down * tc,
+            np.maximum(0.0, p - 0.60),
+            np.maximum(0.0, r - 0.45),
+            stable * tc,
+            volatile * tc,
+            volatile * (1.0 - cov),
+            np.maximum(0.0, 1.0 - np.abs(f - 0.5) - np.abs(r - 0.5)),
+            flat * (1.0 - tc),
+        ]
+    )
 
-    This is intentionally:
-    - directional (levers), not prescriptive (no exact kg/sets)
-    - probabilistic and explainable
+
+def scenario_confidence(ctx: np.ndarray) -> np.ndarray:
+    """Evidence-quality confidence per (row, scenario), penalized by issues."""
+    x = np.atleast_2d(np.asarray(ctx, dtype=float))
+    base = np.clip(0.15 + 0.55 * x[:, 5] + 0.30 * x[:, 4], 0.0, 1.0)
+    conf = np.clip(base * (1.0 - x[:, 7]), 0.0, 1.0)
+    out = np.repeat(conf[:, None], len(SCENARIO_ORDER), axis=1)
+    out[:, SCENARIO_ORDER.index(ScenarioName.DATA_REVIEW)] = np.clip(conf * 0.9, 0.0, 1.0)
+    return out
+
+
+def score_contexts(
+    contexts: Sequence[SuggestionContext] | np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Score many contexts at once.
+
+    Returns (scores, probabilities, confidence), each (n x 6) in SCENARIO_ORDER:
+    one matrix product over SCORE_FEATURES and one row-wise softmax.
     """
-    f = _safe(ctx.fatigue_p)
-    r = _safe(ctx.readiness_p)
-    p = _safe(ctx.plateau_p)
+    ctx = contexts if isinstance(contexts, np.ndarray) else context_matrix(contexts)
+    scores = score_features(ctx) @ SCORE_COEFFS
+    return scores, softmax_rows(scores), scenario_confidence(ctx)
 
-    # Heuristic scores (higher = more recommended), later softmax -> probabilities.
-    # We keep it transparent: each score is built from simple signal terms.
-    scores: dict[ScenarioName, float] = {
-        ScenarioName.RECOVERY: 0.0,
-        ScenarioName.MAINTENANCE: 0.0,
-        ScenarioName.PROGRESSION: 0.0,
-        ScenarioName.VARIATION: 0.0,
-        ScenarioName.STABILIZE: 0.0,
-        ScenarioName.DATA_REVIEW: 0.0,
-    }
 
-    # DATA_REVIEW: if issues penalty is high, bring this option up.
-    scores[ScenarioName.DATA_REVIEW] += 2.2 * ctx.issues_penalty
-
-    # RECOVERY: fatigue high and/or readiness low
-    scores[ScenarioName.RECOVERY] += 2.0 * max(0.0, f - 0.65)
-    scores[ScenarioName.RECOVERY] += 1.6 * max(0.0, 0.35 - r)
-    if ctx.trend_dir == TrendDirection.UP:
-        scores[ScenarioName.RECOVERY] += 0.4 * ctx.trend_conf
-
-    # PROGRESSION: readiness high and fatigue not high
-    scores[ScenarioName.PROGRESSION] += 1.8 * max(0.0, r - 0.60)
-    scores[ScenarioName.PROGRESSION] += 1.2 * max(0.0, 0.55 - f)
-    if ctx.trend_dir == TrendDirection.DOWN:
-        scores[ScenarioName.PROGRESSION] += 0.2 * ctx.trend_conf
-
-    # VARIATION: plateau risk high with acceptable readiness
-    scores[ScenarioName.VARIATION] += 2.0 * max(0.0, p - 0.60)
-    scores[ScenarioName.VARIATION] += 0.8 * max(0.0, r - 0.45)
-    if ctx.trend_dir == TrendDirection.STABLE:
-        scores[ScenarioName.VARIATION] += 0.3 * ctx.trend_conf
-
-    # STABILIZE: trend volatile
-    if ctx.trend_dir == TrendDirection.VOLATILE:
-        scores[ScenarioName.STABILIZE] += 1.8 * ctx.trend_conf
-        scores[ScenarioName.STABILIZE] += 0.6 * (1.0 - ctx.coverage)
-
-    # MAINTENANCE: default safe middle when nothing screams
-    mid = 1.0 - abs(f - 0.5) - abs(r - 0.5)  # highest near middle
-    scores[ScenarioName.MAINTENANCE] += 0.8 * max(0.0, mid)
-    if ctx.trend_dir in (TrendDirection.STABLE, TrendDirection.INSUFFICIENT):
-        scores[ScenarioName.MAINTENANCE] += 0.2 * (1.0 - ctx.trend_conf)
-
-    # Convert to probabilities
-    ordered = [
-        ScenarioName.RECOVERY,
-        ScenarioName.MAINTENANCE,
-        ScenarioName.PROGRESSION,
-        ScenarioName.VARIATION,
-        ScenarioName.STABILIZE,
-        ScenarioName.DATA_REVIEW,
-    ]
-    probs = softmax([scores[n] for n in ordered])
+@dataclass(frozen=True, slots=True)
+class ScenarioTemplate:
+    """Immutable texts/levers of one scenario.
 
-    # Scenario confidence = evidence quality (not probability), penalized by issues
-    base_evidence = clamp01(0.15 + 0.55 * ctx.latent_conf + 0.30 * ctx.trend_conf)
-    conf = clamp01(base_evidence * (1.0 - ctx.issues_penalty))
+    `explanation` lines are format strings filled at materialization time with:
+    f, r, p (fatigue/readiness/plateau probabilities), trend (direction) and trend_conf.
+    """
 
-    def mk(
-        name: ScenarioName,
-        prob: float,
-    ) -> Scenario:
-        if name == ScenarioName.RECOVERY:
-            return Scenario(
-                name=name,
-                probability=prob,
-                confidence=conf,
-                title="Escenario: recuperación / reducción de estrés",
-                explanation=[
-                    f"Fatiga relativa alta (p≈{f:.2f}) y/o preparación baja (p≈{r:.2f}).",
-                    f"Tendencia actual: {ctx.trend_dir.value} (conf≈{ctx.trend_conf:.2f}).",
-                    "Objetivo: bajar incertidumbre fisiológica reduciendo carga relativa reciente.",
-                ],
-                tradeoffs=[
-                    "Puede frenar la progresión a corto plazo.",
-                    "Si se extiende demasiado, puede reducir estímulo.",
-                ],
-                levers={
+    title: str
+    explanation: tuple[str, ...]
+    tradeoffs: tuple[str, ...]
+    levers: Mapping[str, Any]
+    load_zone_z: tuple[float, float] | None
+    confidence_scale: float = 1.0
+
+
+SCENARIO_TEMPLATES: Mapping[ScenarioName, ScenarioTemplate] = MappingProxyType(
+    {
+        ScenarioName.RECOVERY: ScenarioTemplate(
+            title="Escenario: recuperación / reducción de estrés",
+            explanation=(
+                "Fatiga relativa alta (p≈{f:.2f}) y/o preparación baja (p≈{r:.2f}).",
+                "Tendencia actual: {trend} (conf≈{trend_conf:.2f}).",
+                "Objetivo: bajar incertidumbre fisiológica reduciendo carga relativa reciente.",
+            ),
+            tradeoffs=(
+                "Puede frenar la progresión a corto plazo.",
+                "Si se extiende demasiado, puede reducir estímulo.",
+            ),
+            levers=MappingProxyType(
+                {
                     "volume": "down",
                     "intensity": "down_or_neutral",
                     "proximity_to_failure": "further_from_failure",
                     "variation": "low",
                     "consistency": "high",
-                },
-                load_zone_z=(-1.2, -0.2),
-            )
-
-        if name == ScenarioName.PROGRESSION:
-            return Scenario(
-                name=name,
-                probability=prob,
-                confidence=conf,
-                title="Escenario: progresión conservadora",
-                explanation=[
-                    f"Preparación relativamente alta (p≈{r:.2f}) con fatiga no alta (p≈{f:.2f}).",
-                    "Objetivo: aumentar estímulo de forma gradual sin asumir respuesta perfecta.",
-                ],
-                tradeoffs=[
-                    "Riesgo de aumentar fatiga si el contexto externo (sueño/estrés) empeora.",
-                    "Puede ser insuficiente si hay estancamiento real (plateau alto).",
-                ],
-                levers={
+                }
+            ),
+            load_zone_z=(-1.2, -0.2),
+        ),
+        ScenarioName.PROGRESSION: ScenarioTemplate(
+            title="Escenario: progresión conservadora",
+            explanation=(
+                "Preparación relativamente alta (p≈{r:.2f}) con fatiga no alta (p≈{f:.2f}).",
+                "Objetivo: aumentar estímulo de forma gradual sin asumir respuesta perfecta.",
+            ),
+            tradeoffs=(
+                "Riesgo de aumentar fatiga si el contexto externo (sueño/estrés) empeora.",
+                "Puede ser insuficiente si hay estancamiento real (plateau alto).",
+            ),
+            levers=MappingProxyType(
+                {
                     "volume": "up_slightly",
                     "intensity": "neutral_or_up_slightly",
                     "proximity_to_failure": "neutral",
                     "variation": "low_or_medium",
                     "consistency": "high",
-                },
-                load_zone_z=(0.2, 0.9),
-            )
-
-        if name == ScenarioName.VARIATION:
-            return Scenario(
-                name=name,
-                probability=prob,
-                confidence=conf,
-                title="Escenario: romper patrón / introducir variación",
-                explanation=[
-                    f"Probabilidad de plateau elevada (p≈{p:.2f}) con preparación suficiente (p≈{r:.2f}).",
-                    f"Tendencia: {ctx.trend_dir.value} (conf≈{ctx.trend_conf:.2f}).",
-                    "Objetivo: cambiar variables del estímulo (no necesariamente aumentar carga).",
-                ],
-                tradeoffs=[
-                    "Cambios pueden introducir ruido y dificultar comparar series.",
-                    "Demasiada variación puede reducir especificidad técnica.",
-                ],
-                levers={
+                }
+            ),
+            load_zone_z=(0.2, 0.9),
+        ),
+        ScenarioName.VARIATION: ScenarioTemplate(
+            title="Escenario: romper patrón / introducir variación",
+            explanation=(
+                "Probabilidad de plateau elevada (p≈{p:.2f}) con preparación suficiente (p≈{r:.2f}).",
+                "Tendencia: {trend} (conf≈{trend_conf:.2f}).",
+                "Objetivo: cambiar variables del estímulo (no necesariamente aumentar carga).",
+            ),
+            tradeoffs=(
+                "Cambios pueden introducir ruido y dificultar comparar series.",
+                "Demasiada variación puede reducir especificidad técnica.",
+            ),
+            levers=MappingProxyType(
+                {
                     "variation": "medium_or_high",
                     "rep_range": "change",
                     "exercise_selection": "change_within_goal",
                     "volume": "neutral_or_slight_up",
                     "consistency": "medium",
-                },
-                load_zone_z=(0.0, 0.8),
-            )
-
-        if name == ScenarioName.STABILIZE:
-            return Scenario(
-                name=name,
-                probability=prob,
-                confidence=conf,
-                title="Escenario: estabilizar (reducir volatilidad)",
-                explanation=[
-                    "Señales de volatilidad en la tendencia (cambios frecuentes de dirección).",
-                    "Objetivo: reducir variabilidad para interpretar mejor respuesta individual.",
-                ],
-                tradeoffs=[
-                    "Puede sentirse 'lento' si el usuario busca cambios rápidos.",
-                    "Menos variación puede aburrir; prioriza control del sistema.",
-                ],
-                levers={
+                }
+            ),
+            load_zone_z=(0.0, 0.8),
+        ),
+        ScenarioName.STABILIZE: ScenarioTemplate(
+            title="Escenario: estabilizar (reducir volatilidad)",
+            explanation=(
+                "Señales de volatilidad en la tendencia (cambios frecuentes de dirección).",
+                "Objetivo: reducir variabilidad para interpretar mejor respuesta individual.",
+            ),
+            tradeoffs=(
+                "Puede sentirse 'lento' si el usuario busca cambios rápidos.",
+                "Menos variación puede aburrir; prioriza control del sistema.",
+            ),
+            levers=MappingProxyType(
+                {
                     "consistency": "very_high",
                     "variation": "low",
                     "volume": "neutral",
                     "intensity": "neutral",
                     "measurement_hygiene": "improve_logging",
-                },
-                load_zone_z=(-0.2, 0.6),
-            )
-
-        if name == ScenarioName.DATA_REVIEW:
-            return Scenario(
-                name=name,
-                probability=prob,
-                confidence=clamp01(conf * 0.9),
-                title="Escenario: revisión de datos (calidad / consistencia)",
-                explanation=[
-                    "Se detectó incertidumbre alta por issues (validación/normalización/trends).",
-                    "Objetivo: mejorar calidad de datos antes de interpretar señales finas.",
-                ],
-                tradeoffs=[
-                    "No optimiza entrenamiento: optimiza la confiabilidad del sistema.",
-                    "Requiere disciplina de registro.",
-                ],
-                levers={
+                }
+            ),
+            load_zone_z=(-0.2, 0.6),
+        ),
+        ScenarioName.DATA_REVIEW: ScenarioTemplate(
+            title="Escenario: revisión de datos (calidad / consistencia)",
+            explanation=(
+                "Se detectó incertidumbre alta por issues (validación/normalización/trends).",
+                "Objetivo: mejorar calidad de datos antes de interpretar señales finas.",
+            ),
+            tradeoffs=(
+                "No optimiza entrenamiento: optimiza la confiabilidad del sistema.",
+                "Requiere disciplina de registro.",
+            ),
+            levers=MappingProxyType(
+                {
                     "logging": "improve",
                     "missing_values": "reduce",
                     "time_ordering": "check_timezones",
                     "exercise_naming": "standardize",
-                },
-                load_zone_z=None,
-            )
-
-        # MAINTENANCE
-        return Scenario(
-            name=ScenarioName.MAINTENANCE,
-            probability=prob,
-            confidence=conf,
+                }
+            ),
+            load_zone_z=None,
+            confidence_scale=0.9,
+        ),
+        ScenarioName.MAINTENANCE: ScenarioTemplate(
             title="Escenario: mantenimiento / continuidad",
-            explanation=[
-                f"Señales mixtas o moderadas (fatiga≈{f:.2f}, readiness≈{r:.2f}, plateau≈{p:.2f}).",
+            explanation=(
+                "Señales mixtas o moderadas (fatiga≈{f:.2f}, readiness≈{r:.2f}, plateau≈{p:.2f}).",
                 "Objetivo: sostener estímulo con mínima incertidumbre adicional.",
-            ],
-            tradeoffs=[
+            ),
+            tradeoffs=(
                 "Puede no ser suficiente si el objetivo es acelerar progreso.",
                 "Puede no resolver plateau si éste aumenta en próximas semanas.",
-            ],
-            levers={
-                "volume": "neutral",
-                "intensity": "neutral",
-                "variation": "low",
-                "consistency": "high",
-            },
+            ),
+            levers=MappingProxyType(
+                {
+                    "volume": "neutral",
+                    "intensity": "neutral",
+                    "variation": "low",
+                    "consistency": "high",
+                }
+            ),
             load_zone_z=(-0.2, 0.4),
-        )
+        ),
+    }
+)
 
-    scenarios = [mk(name, prob) for name, prob in zip(ordered, probs, strict=True)]
-    # Sort by probability descending (presentation)
-    scenarios.sort(key=lambda s: s.probability, reverse=True)
-    return scenarios
+
+def materialize_scenario(
+    name: ScenarioName,
+    ctx: SuggestionContext,
+    *,
+    probability: float,
+    confidence: float,
+    explain: bool = True,
+) -> Scenario:
+    """Build one full Scenario from its cached template (texts filled only here).
+
+    explain=False skips formatting the explanation lines (left empty).
+    """
+    tpl = SCENARIO_TEMPLATES[name]
+    values = {
+        "f": _safe(ctx.fatigue_p),
+        "r": _safe(ctx.readiness_p),
+        "p": _safe(ctx.plateau_p),
+        "trend": ctx.trend_dir.value,
+        "trend_conf": ctx.trend_conf,
+    }
+    return Scenario(
+        name=name,
+        probability=float(probability),
+        confidence=float(confidence),
+        title=tpl.title,
+        explanation=[line.format(**values) for line in tpl.explanation] if explain else [],
+        tradeoffs=list(tpl.tradeoffs),
+        levers=dict(tpl.levers),
+        load_zone_z=tpl.load_zone_z,
+    )
+
+
+def top_k_indices(probabilities: np.ndarray, k: int) -> np.ndarray:
+    """Column indices of the k most probable scenarios per row (stable on ties)."""
+    order = np.argsort(-np.atleast_2d(probabilities), axis=1, kind="stable")
+    return order[:, : max(0, int(k))]
+
+
+def generate_scenarios(
+    ctx: SuggestionContext,
+    *,
+    top_k: int | None = None,
+    explain: bool = True,
+) -> list[Scenario]:
+    """Generate scenario list with probabilities and confidences.
+
+    This is intentionally:
+    - directional (levers), not prescriptive (no exact kg/sets)
+    - probabilistic and explainable
+
+    Probabilities are always computed over all scenarios; only the `top_k` most
+    probable (default: all) are materialized, sorted by probability descending.
+    """
+    # Heuristic scores (higher = more recommended), later softmax -> probabilities.
+    # The rules live in SCORE_COEFFS (shared with the batch path), see score_contexts.
+    _, probs, _ = score_contexts([ctx])
+    probs_row = probs[0]
+
+    # Scenario confidence = evidence quality (not probability), penalized by issues
+    base_evidence = clamp01(0.15 + 0.55 * ctx.latent_conf + 0.30 * ctx.trend_conf)
+    conf = clamp01(base_evidence * (1.0 - ctx.issues_penalty))
+
+    k = len(SCENARIO_ORDER) if top_k is None else top_k
+    return [
+        materialize_scenario(
+            SCENARIO_ORDER[j],
+            ctx,
+            probability=float(probs_row[j]),
+            confidence=clamp01(conf * SCENARIO_TEMPLATES[SCENARIO_ORDER[j]].confidence_scale),
+            explain=explain,
+        )
+        for j in top_k_indices(probs_row, k)[0]
+    ]
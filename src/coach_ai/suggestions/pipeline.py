@@ -1,26 +1,17 @@
 from __future__ import annotations
 
-from coach_ai.latents import compute_latent_states
+from coach_ai.latents import FatigueEngine, KalmanFatigueParams, compute_latent_states
+from coach_ai.latents.types import LatentResult
 from coach_ai.suggestions.engine import build_context, generate_scenarios
 from coach_ai.suggestions.types import SuggestionResult
 from coach_ai.training_core.pipeline import AthleteSeries
 from coach_ai.training_core.types import Issue
 from coach_ai.trends import compute_trends
+from coach_ai.trends.types import TrendResult
 
 
-def suggest_scenarios(
-    series: AthleteSeries,
-    *,
-    metric_key: str = "volume_load_kg",
-    use_normalized: bool = True,
-) -> SuggestionResult:
-    """Phase 4 pipeline: AthleteSeries -> trends -> latents -> scenario suggestions.
-
-    Returns:
-    - ranked scenarios with probabilities and confidences
-    - issues aggregated (no silent failure)
-    """
-    trend = compute_trends(
+def _scenario_trend(series: AthleteSeries, *, metric_key: str, use_normalized: bool) -> TrendResult:
+    return compute_trends(
         series,
         metric_key=metric_key,
         use_normalized=use_normalized,
@@ -29,6 +20,24 @@ def suggest_scenarios(
         slope_threshold=0.05 if use_normalized else 1.0,
         lookback=5,
     )
+
+
+def scenario_inputs(
+    series: AthleteSeries,
+    *,
+    metric_key: str,
+    use_normalized: bool,
+    fatigue_engine: FatigueEngine = "ewma",
+    kalman: KalmanFatigueParams | None = None,
+    trend: TrendResult | None = None,
+    explain: bool = True,
+) -> tuple[TrendResult, LatentResult]:
+    """Trends + latents with the settings the scenario engine is tuned for.
+
+    A precomputed `trend` is reused as-is (only latents are computed then).
+    """
+    if trend is None:
+        trend = _scenario_trend(series, metric_key=metric_key, use_normalized=use_normalized)
     latents = compute_latent_states(
         series,
         metric_key=metric_key,
@@ -36,10 +45,51 @@ def suggest_scenarios(
         trend=trend,
         fatigue_alpha=0.35,
         plateau_lookback=6,
+        fatigue_engine=fatigue_engine,
+        kalman=kalman,
+        explain=explain,
     )
+    return trend, latents
+
+
+def suggest_scenarios(
+    series: AthleteSeries,
+    *,
+    metric_key: str = "volume_load_kg",
+    use_normalized: bool = True,
+    fatigue_engine: FatigueEngine = "ewma",
+    kalman: KalmanFatigueParams | None = None,
+    top_k: int | None = None,
+    trend: TrendResult | None = None,
+    latents: LatentResult | None = None,
+    explain: bool = True,
+) -> SuggestionResult:
+    """Phase 4 pipeline: AthleteSeries -> trends -> latents -> scenario suggestions.
+
+    Precomputed `trend` / `latents` (e.g. from the e2e runner) are reused, so each
+    stage runs once per run; whatever is missing is computed here. explain=False
+    leaves scenario (and internally computed latent) explanations empty.
+
+    Returns:
+    - ranked scenarios with probabilities and confidences (only the `top_k` most
+      probable are built when given; probabilities are still over all scenarios)
+    - issues aggregated (no silent failure)
+    """
+    if latents is None:
+        trend, latents = scenario_inputs(
+            series,
+            metric_key=metric_key,
+            use_normalized=use_normalized,
+            fatigue_engine=fatigue_engine,
+            kalman=kalman,
+            trend=trend,
+            explain=explain,
+        )
+    elif trend is None:
+        trend = _scenario_trend(series, metric_key=metric_key, use_normalized=use_normalized)
 
     ctx = build_context(trend=trend, latents=latents)
-    scenarios = generate_scenarios(ctx)
+    scenarios = generate_scenarios(ctx, top_k=top_k, explain=explain)
 
     issues: list[Issue] = []
     issues.extend(trend.issues)
@@ -19,6 +19,15 @@ def softmax(scores: list[float]) -> list[float]:
     return [float(e / z) for e in exps]
 
 
+def softmax_rows(scores: np.ndarray) -> np.ndarray:
+    """Row-wise softmax of an (n x k) score matrix (numerically stabilized)."""
+    s = np.atleast_2d(np.asarray(scores, dtype=float))
+    if s.shape[1] == 0:
+        return s.copy()
+    e = np.exp(s - s.max(axis=1, keepdims=True))
+    return e / e.sum(axis=1, keepdims=True)
+
+
 def issue_penalty(issues: Iterable[Issue]) -> float:
     """Penalty in [0,1] for data quality / uncertainty."""
     p = 0.0
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import numpy as np
+
+from coach_ai.latents import FatigueEngine, KalmanFatigueParams
+from coach_ai.latents.types import LatentName, LatentResult
+from coach_ai.suggestions.engine import (
+    CONTEXT_COLUMNS,
+    SCENARIO_ORDER,
+    TREND_DIRECTIONS,
+    score_contexts,
+)
+from coach_ai.suggestions.pipeline import scenario_inputs
+from coach_ai.suggestions.scoring import issue_penalty
+from coach_ai.suggestions.types import ScenarioTimeline
+from coach_ai.training_core.pipeline import AthleteSeries
+from coach_ai.trends.types import TrendResult
+
+
+def timeline_indices(n: int, every: int = 1) -> np.ndarray:
+    """Every `every`-th position, anchored on the last point (always included)."""
+    if every <= 0:
+        raise ValueError("every must be > 0")
+    if n <= 0:
+        return np.zeros(0, dtype=np.int64)
+    return np.arange(n - 1, -1, -int(every), dtype=np.int64)[::-1]
+
+
+def build_context_matrix(
+    *,
+    trend: TrendResult,
+    latents: LatentResult,
+    every: int = 1,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Context rows (CONTEXT_COLUMNS) for every (or every Nth) point, in one pass.
+
+    Row i is what `build_context` would see if the series ended at point i, with
+    two explicit approximations:
+    - coverage is causal (finite values up to i / (i + 1))
+    - the issues penalty uses all issues of the full run (most are history-wide,
+      e.g. normalizer fit), and trend/latent values come from the full-history
+      normalization (both are causal otherwise: EWMA, slopes, lookback windows)
+
+    Returns (indices, matrix).
+    """
+    n = min(len(trend.points), len(latents.points))
+    idx = timeline_indices(n, every)
+
+    def state(name: LatentName) -> np.ndarray:
+        return np.fromiter(
+            (
+                np.nan if (v := p.states.get(name.value)) is None else float(v)
+                for p in latents.points[:n]
+            ),
+            dtype=float,
+            count=n,
+        )
+
+    finite = np.fromiter(
+        (p.value is not None and np.isfinite(p.value) for p in trend.points[:n]),
+        dtype=bool,
+        count=n,
+    )
+    coverage = np.cumsum(finite) / np.arange(1, n + 1)
+
+    cols = {
+        "fatigue_p": state(LatentName.FATIGUE),
+        "readiness_p": state(LatentName.READINESS),
+        "plateau_p": state(LatentName.PLATEAU),
+        "trend_dir": np.fromiter(
+            (TREND_DIRECTIONS.index(p.direction) for p in trend.points[:n]), dtype=float, count=n
+        ),
+        "trend_conf": np.fromiter((p.confidence for p in trend.points[:n]), dtype=float, count=n),
+        "latent_conf": np.fromiter(
+            (p.confidence for p in latents.points[:n]), dtype=float, count=n
+        ),
+        "coverage": coverage,
+        "issues_penalty": np.full(n, issue_penalty(list(trend.issues) + list(latents.issues))),
+    }
+    mat = np.column_stack([cols[c] for c in CONTEXT_COLUMNS]) if n else np.zeros((0, 8))
+    return idx, mat[idx]
+
+
+def scenario_timeline(
+    series: AthleteSeries,
+    *,
+    metric_key: str = "volume_load_kg",
+    use_normalized: bool = True,
+    fatigue_engine: FatigueEngine = "ewma",
+    kalman: KalmanFatigueParams | None = None,
+    every: int = 1,
+    trend: TrendResult | None = None,
+    latents: LatentResult | None = None,
+) -> ScenarioTimeline:
+    """What the engine would have suggested at each point, without re-running it.
+
+    Trends and latents are computed once (or passed in); every past context is a
+    row of one matrix, scored with the same coefficient matrix + softmax as
+    `suggest_scenarios`. O(n) instead of one pipeline run per truncated series.
+    """
+    if trend is None or latents is None:
+        trend, latents = scenario_inputs(
+            series,
+            metric_key=metric_key,
+            use_normalized=use_normalized,
+            fatigue_engine=fatigue_engine,
+            kalman=kalman,
+        )
+
+    idx, ctx = build_context_matrix(trend=trend, latents=latents, every=every)
+    _, probs, conf = score_contexts(ctx)
+
+    return ScenarioTimeline(
+        athlete_id=series.athlete_id,
+        metric_key=metric_key,
+        t=[series.start_times[i] for i in idx],
+        indices=[int(i) for i in idx],
+        scenario_names=SCENARIO_ORDER,
+        probabilities=probs,
+        confidence=conf,
+        top=[SCENARIO_ORDER[j] for j in np.argmax(probs, axis=1)] if len(idx) else [],
+        issues=list(trend.issues) + list(latents.issues),
+    )
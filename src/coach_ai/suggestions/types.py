@@ -5,6 +5,8 @@ from datetime import UTC, datetime
 from enum import StrEnum
 from typing import Any
 
+import numpy as np
+
 from coach_ai.training_core.types import Issue
 
 
@@ -51,3 +53,40 @@ class SuggestionResult:
     @staticmethod
     def now_utc() -> datetime:
         return datetime.now(UTC)
+
+
+@dataclass(frozen=True, slots=True)
+class ScenarioBatchResult:
+    """Scenario scores for many athletes (no Scenario objects, no texts).
+
+    Matrices are (athletes x scenarios): rows follow `athlete_ids`, columns follow
+    `scenario_names`. `top` keeps the top-k (name, probability) per athlete,
+    ordered by probability descending.
+    """
+
+    athlete_ids: list[str]
+    scenario_names: tuple[ScenarioName, ...]
+    scores: np.ndarray
+    probabilities: np.ndarray
+    confidence: np.ndarray
+    top: dict[str, list[tuple[ScenarioName, float]]]
+    issues: dict[str, list[Issue]]
+
+
+@dataclass(frozen=True, slots=True)
+class ScenarioTimeline:
+    """Scenario probabilities the engine would have produced at past points.
+
+    Rows follow `t` / `indices` (positions in the athlete series), columns follow
+    `scenario_names`. `top` is the most probable scenario per row.
+    """
+
+    athlete_id: str
+    metric_key: str
+    t: list[datetime]
+    indices: list[int]
+    scenario_names: tuple[ScenarioName, ...]
+    probabilities: np.ndarray
+    confidence: np.ndarray
+    top: list[ScenarioName]
+    issues: list[Issue]
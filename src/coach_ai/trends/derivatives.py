@@ -15,13 +15,13 @@ def discrete_derivative_per_day(
     """Compute discrete derivative dv/dt per day.
 
     Returns (derivatives, issues).
-    - derivative[i] corresponds to slope between i-1 and i (derivative[0]=None).
+    - derivative[i] corresponds to slope between i-1 and i (derivative[0]=None; empty in, empty out).
     - If time difference <= 0 or missing values, derivative is None and an issue may be emitted.
     """
     if len(times) != len(values):
         raise ValueError("times and values must have same length")
 
-    out: list[float | None] = [None]
+    out: list[float | None] = [None] if times else []
     issues: list[Issue] = []
 
     for i in range(1, len(times)):
@@ -61,3 +61,35 @@ def ewma(
         s = xv if s is None else (alpha * xv + (1 - alpha) * s)
         out.append(float(s))
     return out
+
+
+def ewma_array(
+    values: np.ndarray,
+    *,
+    alpha: float,
+    initial: np.ndarray | None = None,
+) -> np.ndarray:
+    """Vectorized `ewma` along the last axis (NaN = missing).
+
+    Same semantics as `ewma`: missing values carry the previous smoothed value forward,
+    and a row stays NaN until its first finite value. Leading axes are independent
+    series, so a (B x n) input smooths B series with only n Python-level steps.
+
+    `initial` is the smoothed state before the first column (NaN = none yet), so a long
+    series can be smoothed block by block: pass the previous block's last column.
+    """
+    if not (0 < alpha <= 1):
+        raise ValueError("alpha must be in (0, 1]")
+
+    x = np.asarray(values, dtype=float)
+    out = np.empty_like(x)
+    s = np.full(x.shape[:-1], np.nan)
+    if initial is not None:
+        s[...] = initial
+
+    for i in range(x.shape[-1]):
+        xi = x[..., i]
+        upd = np.where(np.isnan(s), xi, alpha * xi + (1 - alpha) * s)
+        s = np.where(np.isfinite(xi), upd, s)
+        out[..., i] = s
+    return out
@@ -1,3 +1,4 @@
+from .matrix import EngineSpec, PopulationSpec, run_experiment_matrix
 from .runner import run_simulated_validation
 
-__all__ = ["run_simulated_validation"]
+__all__ = ["EngineSpec", "PopulationSpec", "run_experiment_matrix", "run_simulated_validation"]
@@ -2,9 +2,66 @@ from __future__ import annotations
 
 import argparse
 
+from .matrix import EngineSpec, PopulationSpec, run_experiment_matrix
 from .runner import run_simulated_validation
 
 
+def _parse_seeds(text: str) -> list[int]:
+    """'1,2,5' and/or inclusive ranges '1-10'."""
+    seeds: list[int] = []
+    for part in filter(None, (p.strip() for p in text.split(","))):
+        lo, sep, hi = part.partition("-")
+        seeds.extend(range(int(lo), int(hi) + 1) if sep else [int(lo)])
+    return seeds
+
+
+def _fmt(s: dict) -> str:
+    if s["mean"] is None:
+        return "-"
+    ci = "" if s["ci95"] is None else f" [{s['ci95'][0]:.3f}, {s['ci95'][1]:.3f}]"
+    return f"{s['mean']:.3f}{ci}"
+
+
+def _run_matrix(args: argparse.Namespace) -> None:
+    default_pop = PopulationSpec(
+        n_athletes=args.n_athletes,
+        days=args.days,
+        sessions_per_week=args.sessions_per_week,
+        missing_exercises_prob=args.missing_exercises_prob,
+        simulator=args.simulator,
+    )
+    pops = [PopulationSpec.parse(s) for s in args.population] or [default_pop]
+    engines = [EngineSpec.parse(s) for s in args.engine] or [EngineSpec()]
+    rep = run_experiment_matrix(
+        seeds=_parse_seeds(args.seeds) if args.seeds else [args.seed],
+        populations=pops,
+        engines=engines,
+        out_dir=args.out,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        workers=args.workers,
+        n_boot=0 if args.n_boot is None else args.n_boot,
+    )
+
+    print("Validation matrix done.")
+    cache = rep["dataset_cache"]
+    print(
+        f"Cells: {len(rep['cells'])}  datasets cached: {cache['hits']}/{cache['hits'] + cache['misses']}"
+    )
+    for row in rep["summary"]:
+        m = row["metrics"]
+        print(
+            f"  {row['population']:<12} {row['engine']:<12} seeds={row['n_seeds']:<3}"
+            f" spearman={_fmt(m['fatigue_spearman'])}  mae={_fmt(m['fatigue_mae'])}"
+        )
+    for row in rep["deltas"]:
+        m = row["metrics"]
+        print(
+            f"  {row['population']:<12} {row['engine']} - {row['baseline']}:"
+            f" d_spearman={_fmt(m['fatigue_spearman'])}  d_mae={_fmt(m['fatigue_mae'])}"
+        )
+    print("Report:", rep["files"]["matrix_json"])
+
+
 def main() -> None:
     p = argparse.ArgumentParser(description="Run Phase 6 simulated validation (gym).")
     p.add_argument("--out", default="data/validation", help="Output directory")
@@ -13,8 +70,45 @@ def main() -> None:
     p.add_argument("--days", type=int, default=84)
     p.add_argument("--sessions-per-week", type=int, default=4)
     p.add_argument("--missing-exercises-prob", type=float, default=0.02)
+    p.add_argument("--simulator", choices=["loop", "vectorized"], default="loop")
+    p.add_argument(
+        "--workers", type=int, default=1, help="Processes (simulation in loop mode, or matrix)"
+    )
+    p.add_argument(
+        "--n-boot",
+        type=int,
+        default=None,
+        help="Bootstrap resamples (0 = no CIs; default 200, or 0 per cell with --matrix)",
+    )
+    p.add_argument("--points-format", choices=["csv", "npz"], default="csv")
+    p.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Fixed-size binned metric accumulators (approximate Spearman / calibration)",
+    )
+
+    m = p.add_argument_group("experiment matrix (seeds x populations x engines)")
+    m.add_argument("--matrix", action="store_true", help="Run the matrix instead of one seed")
+    m.add_argument("--seeds", default=None, help="e.g. 1-10 or 1,2,3 (default: --seed)")
+    m.add_argument(
+        "--population",
+        action="append",
+        default=[],
+        help="[name:]key=value,... of PopulationSpec, repeatable (default: the flags above)",
+    )
+    m.add_argument(
+        "--engine",
+        action="append",
+        default=[],
+        help="[name:]key=value,... of EngineSpec, repeatable; deltas are vs the first",
+    )
+    m.add_argument("--cache-dir", default="data/validation/cache", help="Dataset cache dir")
+    m.add_argument("--no-cache", action="store_true", help="Always re-simulate datasets")
 
     args = p.parse_args()
+    if args.matrix:
+        _run_matrix(args)
+        return
 
     rep = run_simulated_validation(
         out_dir=args.out,
@@ -23,11 +117,16 @@ def main() -> None:
         days=args.days,
         sessions_per_week=args.sessions_per_week,
         missing_exercises_prob=args.missing_exercises_prob,
+        simulator=args.simulator,
+        workers=args.workers,
+        n_boot=200 if args.n_boot is None else args.n_boot,
+        points_format=args.points_format,
+        streaming=args.streaming,
     )
 
     print("Validation done.")
     print("Report:", rep.files["report_json"])
-    print("Points:", rep.files["points_csv"])
+    print("Points:", rep.files[f"points_{args.points_format}"])
     print("Metrics:", rep.metrics)
 
 
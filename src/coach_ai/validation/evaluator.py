@@ -1,126 +1,357 @@
 from __future__ import annotations
 
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import Protocol
+
 import numpy as np
 
 from coach_ai.latents import compute_latent_states
 from coach_ai.suggestions import suggest_scenarios
-from coach_ai.training_core.pipeline import process_sessions
+from coach_ai.training_core.pipeline import AthleteSeries, process_sessions
 from coach_ai.trends import compute_trends
 
-from .stats import bucket_by_confidence, mean_abs_error, spearman_corr
-from .types import SimulatedTruthPoint
+from .stats import (
+    StreamingMetrics,
+    bootstrap_intervals,
+    bucket_by_confidence,
+    mean_abs_error,
+    spearman_corr,
+)
+from .types import SessionBatch, SimulatedTruthPoint, epoch_ns
+
+TruthInput = list[SimulatedTruthPoint] | SessionBatch
+TruthColumns = dict[str, tuple[np.ndarray, np.ndarray]]  # athlete -> (t_ns, true_fatigue_p)
+
+STREAMING_BINS = 1024  # Spearman histogram resolution of stream_evaluation
+
+POINT_COLUMNS: tuple[str, ...] = (
+    "athlete_id",
+    "t",
+    "metric_key",
+    "coverage_athlete",
+    "pred_fatigue",
+    "true_fatigue",
+    "abs_error",
+    "confidence",
+    "trend_dir",
+    "trend_conf",
+    "top_scenario",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class AthleteEvaluation:
+    """Per-point evaluation arrays of one athlete (NaN = missing)."""
+
+    athlete_id: str
+    t: list[str]  # ISO timestamps
+    t_ns: np.ndarray  # the same timestamps as int64 ns since the epoch
+    coverage: float
+    pred_fatigue: np.ndarray
+    true_fatigue: np.ndarray
+    abs_error: np.ndarray
+    confidence: np.ndarray
+    trend_dir: list[str]
+    trend_conf: np.ndarray
+    top_scenario: str
+
+    def rows(self, metric_key: str) -> Iterator[dict]:
+        """CSV rows (None for missing values)."""
+
+        def opt(a: np.ndarray) -> list[float | None]:
+            return [None if np.isnan(v) else v for v in a.tolist()]
+
+        for t, pf, tf, e, c, d, tc in zip(
+            self.t,
+            opt(self.pred_fatigue),
+            opt(self.true_fatigue),
+            opt(self.abs_error),
+            self.confidence.tolist(),
+            self.trend_dir,
+            opt(self.trend_conf),
+            strict=True,
+        ):
+            yield {
+                "athlete_id": self.athlete_id,
+                "t": t,
+                "metric_key": metric_key,
+                "coverage_athlete": self.coverage,
+                "pred_fatigue": pf,
+                "true_fatigue": tf,
+                "abs_error": e,
+                "confidence": c,
+                "trend_dir": d,
+                "trend_conf": tc,
+                "top_scenario": self.top_scenario,
+            }
+
+
+class PointWriter(Protocol):
+    """Sink for per-athlete evaluations (see validation.writers)."""
 
+    def write(self, ev: AthleteEvaluation) -> None: ...
 
-def _truth_by_athlete(truth: list[SimulatedTruthPoint]) -> dict[str, list[SimulatedTruthPoint]]:
-    out: dict[str, list[SimulatedTruthPoint]] = {}
+    def close(self) -> None: ...
+
+
+def truth_columns(truth: TruthInput) -> TruthColumns:
+    """Truth as per-athlete (int64 ns timestamps, true fatigue p) arrays sorted by time."""
+    if isinstance(truth, SessionBatch):
+        t_ns = truth.timestamps_ns()
+        bounds = np.searchsorted(truth.athlete, np.arange(len(truth.athlete_ids) + 1))
+        return {
+            aid: (t_ns[lo:hi], truth.true_fatigue_p[lo:hi])
+            for aid, lo, hi in zip(truth.athlete_ids, bounds[:-1], bounds[1:], strict=True)
+        }
+
+    grouped: dict[str, tuple[list[int], list[float]]] = {}
     for p in truth:
-        out.setdefault(p.athlete_id, []).append(p)
+        ts, fs = grouped.setdefault(p.athlete_id, ([], []))
+        ts.append(epoch_ns(p.t))
+        fs.append(np.nan if p.true_fatigue_p is None else p.true_fatigue_p)
+    out: TruthColumns = {}
+    for aid, (ts, fs) in grouped.items():
+        t_arr = np.array(ts, dtype=np.int64)
+        order = np.argsort(t_arr, kind="stable")
+        out[aid] = (t_arr[order], np.array(fs, dtype=float)[order])
+    return out
+
+
+def join_truth(t_ns: np.ndarray, truth_t_ns: np.ndarray, truth_values: np.ndarray) -> np.ndarray:
+    """Truth value at each exact timestamp in t_ns (NaN where there is none)."""
+    out = np.full(t_ns.shape, np.nan)
+    if truth_t_ns.size == 0 or t_ns.size == 0:
+        return out
+    idx = np.searchsorted(truth_t_ns, t_ns)
+    idx_c = np.minimum(idx, truth_t_ns.size - 1)
+    hit = truth_t_ns[idx_c] == t_ns
+    out[hit] = truth_values[idx_c[hit]]
     return out
 
 
+def _optional(values: list[float | None]) -> np.ndarray:
+    return np.array([np.nan if v is None else v for v in values], dtype=float)
+
+
+def evaluate_athlete(
+    series: AthleteSeries,
+    truth: tuple[np.ndarray, np.ndarray] | None,
+    *,
+    metric_key: str,
+    use_normalized: bool,
+) -> AthleteEvaluation:
+    """Trends -> latents -> suggestions once, then the truth join on int64 timestamps."""
+    trend = compute_trends(series, metric_key=metric_key, use_normalized=use_normalized)
+    lat = compute_latent_states(
+        series, metric_key=metric_key, use_normalized=use_normalized, trend=trend
+    )
+    sug = suggest_scenarios(
+        series,
+        metric_key=metric_key,
+        use_normalized=use_normalized,
+        top_k=1,
+        trend=trend,
+        latents=lat,
+    )
+
+    values = _optional(
+        series.normalized[metric_key] if use_normalized else series.metrics[metric_key]
+    )
+    coverage = float(np.isfinite(values).sum() / max(1, values.size))
+
+    n = len(lat.points)
+    t_ns = np.array([epoch_ns(p.t) for p in lat.points], dtype=np.int64)
+    pred = _optional([p.states.get("fatigue") for p in lat.points])
+    true = np.full(n, np.nan) if truth is None else join_truth(t_ns, truth[0], truth[1])
+
+    trend_dir = [p.direction.value for p in trend.points[:n]] + ["none"] * (n - len(trend.points))
+    trend_conf = np.full(n, np.nan)
+    m = min(n, len(trend.points))
+    trend_conf[:m] = [float(p.confidence) for p in trend.points[:m]]
+
+    return AthleteEvaluation(
+        athlete_id=series.athlete_id,
+        t=[p.t.isoformat() for p in lat.points],
+        t_ns=t_ns,
+        coverage=coverage,
+        pred_fatigue=pred,
+        true_fatigue=true,
+        abs_error=np.abs(pred - true),
+        confidence=np.array([float(p.confidence) for p in lat.points], dtype=float),
+        trend_dir=trend_dir,
+        trend_conf=trend_conf,
+        top_scenario=sug.scenarios[0].name.value if sug.scenarios else "none",
+    )
+
+
+def iter_evaluations(
+    sessions,
+    truth: TruthInput,
+    *,
+    metric_key: str = "volume_load_kg",
+    use_normalized: bool = True,
+    normalizer_min_n: int = 10,
+    clip_z: float | None = 5.0,
+) -> Iterator[AthleteEvaluation]:
+    """process_sessions once, then one AthleteEvaluation per athlete."""
+    tc = process_sessions(
+        sessions,
+        metric_keys=(metric_key, "srpe_load"),
+        normalizer_min_n=normalizer_min_n,
+        clip_z=clip_z,
+    )
+    truth_cols = truth_columns(truth)
+    for athlete_id, series in tc.by_athlete.items():
+        yield evaluate_athlete(
+            series,
+            truth_cols.get(athlete_id),
+            metric_key=metric_key,
+            use_normalized=use_normalized,
+        )
+
+
+def _exact_summary(
+    evals: list[AthleteEvaluation], *, n_boot: int, boot_seed: int
+) -> tuple[dict, list[dict]]:
+    def cat(name: str) -> np.ndarray:
+        parts = [getattr(e, name) for e in evals]
+        return np.concatenate(parts) if parts else np.empty(0)
+
+    pred, true = cat("pred_fatigue"), cat("true_fatigue")
+    coverage = np.array([e.coverage for e in evals], dtype=float)
+    ci = bootstrap_intervals(pred, true, n_boot=n_boot, seed=boot_seed)
+
+    metrics = {
+        "coverage_mean": float(coverage.mean()) if coverage.size else 0.0,
+        "fatigue_spearman": spearman_corr(pred, true),
+        "fatigue_mae": mean_abs_error(pred, true),
+        "n_points_eval": int((np.isfinite(pred) & np.isfinite(true)).sum()),
+        "fatigue_spearman_ci95": ci["spearman"],
+        "fatigue_mae_ci95": ci["mae"],
+        "n_boot": n_boot,
+    }
+
+    calibration = bucket_by_confidence(
+        cat("confidence"), cat("abs_error"), bins=6, n_boot=n_boot, seed=boot_seed
+    )
+    return metrics, calibration
+
+
 def evaluate_simulation(
     sessions,
-    truth: list[SimulatedTruthPoint],
+    truth: TruthInput,
     *,
     metric_key: str = "volume_load_kg",
     use_normalized: bool = True,
     normalizer_min_n: int = 10,
     clip_z: float | None = 5.0,
+    n_boot: int = 200,
+    boot_seed: int = 0,
 ) -> tuple[dict, list[dict], list[dict]]:
     """Run pipeline on simulated data and compute internal validation metrics.
 
+    Truth can be a list of SimulatedTruthPoint or a SessionBatch; it is joined to the
+    latent points on exact int64 timestamps. Spearman, MAE and the calibration buckets
+    get 95% percentile bootstrap intervals from `n_boot` resamples (0 disables them).
+
     Returns:
       - metrics_summary (dict)
       - calibration_buckets (list)
       - point_rows (list of dict rows for CSV)
     """
-    tc = process_sessions(
-        sessions,
-        metric_keys=(metric_key, "srpe_load"),
-        normalizer_min_n=normalizer_min_n,
-        clip_z=clip_z,
+    evals = list(
+        iter_evaluations(
+            sessions,
+            truth,
+            metric_key=metric_key,
+            use_normalized=use_normalized,
+            normalizer_min_n=normalizer_min_n,
+            clip_z=clip_z,
+        )
     )
+    metrics, calibration = _exact_summary(evals, n_boot=n_boot, boot_seed=boot_seed)
+    point_rows = [row for e in evals for row in e.rows(metric_key)]
+    return metrics, calibration, point_rows
 
-    truth_map = _truth_by_athlete(truth)
 
-    all_pred_fatigue: list[float | None] = []
-    all_true_fatigue: list[float | None] = []
-    all_conf: list[float | None] = []
-    all_abs_err: list[float | None] = []
-    coverage_list: list[float] = []
+def exact_evaluation(
+    sessions,
+    truth: TruthInput,
+    *,
+    writers: Iterable[PointWriter] = (),
+    metric_key: str = "volume_load_kg",
+    use_normalized: bool = True,
+    normalizer_min_n: int = 10,
+    clip_z: float | None = 5.0,
+    n_boot: int = 200,
+    boot_seed: int = 0,
+) -> tuple[dict, list[dict]]:
+    """evaluate_simulation's metrics, with points sent to `writers` instead of returned.
 
-    point_rows: list[dict] = []
+    No point rows are built; the per-athlete float columns are kept for the exact
+    Spearman, MAE and calibration buckets.
 
-    for athlete_id, series in tc.by_athlete.items():
-        # Align truth by time (both are sorted by time)
-        t_points = truth_map.get(athlete_id, [])
+    Returns (metrics_summary, calibration_buckets).
+    """
+    writers = tuple(writers)
+    evals: list[AthleteEvaluation] = []
+    for ev in iter_evaluations(
+        sessions,
+        truth,
+        metric_key=metric_key,
+        use_normalized=use_normalized,
+        normalizer_min_n=normalizer_min_n,
+        clip_z=clip_z,
+    ):
+        for w in writers:
+            w.write(ev)
+        evals.append(ev)
+    return _exact_summary(evals, n_boot=n_boot, boot_seed=boot_seed)
 
-        trend = compute_trends(series, metric_key=metric_key, use_normalized=use_normalized)
-        lat = compute_latent_states(
-            series, metric_key=metric_key, use_normalized=use_normalized, trend=trend
-        )
-        sug = suggest_scenarios(series, metric_key=metric_key, use_normalized=use_normalized)
-
-        # map time -> truth
-        truth_by_time = {p.t: p for p in t_points}
-
-        # coverage
-        values = series.normalized[metric_key] if use_normalized else series.metrics[metric_key]
-        finite = sum(1 for v in values if v is not None and np.isfinite(v))
-        coverage = finite / max(1, len(values))
-        coverage_list.append(float(coverage))
-
-        for i, lp in enumerate(lat.points):
-            tt = truth_by_time.get(lp.t)
-            tf = None if tt is None else tt.true_fatigue_p
-            pf = lp.states.get("fatigue")
-
-            c = float(lp.confidence)
-            e = None
-            if tf is not None and pf is not None:
-                e = float(abs(float(pf) - float(tf)))
-
-            all_true_fatigue.append(tf)
-            all_pred_fatigue.append(pf)
-            all_conf.append(c)
-            all_abs_err.append(e)
-
-            top = sug.scenarios[0].name.value if sug.scenarios else "none"
-
-            point_rows.append(
-                {
-                    "athlete_id": athlete_id,
-                    "t": lp.t.isoformat(),
-                    "metric_key": metric_key,
-                    "coverage_athlete": coverage,
-                    "pred_fatigue": pf,
-                    "true_fatigue": tf,
-                    "abs_error": e,
-                    "confidence": c,
-                    "trend_dir": trend.points[i].direction.value
-                    if i < len(trend.points)
-                    else "none",
-                    "trend_conf": float(trend.points[i].confidence)
-                    if i < len(trend.points)
-                    else None,
-                    "top_scenario": top,
-                }
-            )
-
-    # summary metrics
-    fatigue_spearman = spearman_corr(all_pred_fatigue, all_true_fatigue)
-    mae = mean_abs_error(all_pred_fatigue, all_true_fatigue)
 
-    metrics = {
-        "coverage_mean": float(np.mean(coverage_list)) if coverage_list else 0.0,
-        "fatigue_spearman": fatigue_spearman,
-        "fatigue_mae": mae,
-        "n_points_eval": sum(
-            1
-            for x, y in zip(all_pred_fatigue, all_true_fatigue, strict=False)
-            if x is not None and y is not None
-        ),
-    }
+def stream_evaluation(
+    sessions,
+    truth: TruthInput,
+    *,
+    writers: Iterable[PointWriter] = (),
+    metric_key: str = "volume_load_kg",
+    use_normalized: bool = True,
+    normalizer_min_n: int = 10,
+    clip_z: float | None = 5.0,
+    n_boot: int = 200,
+    boot_seed: int = 0,
+    bins: int = STREAMING_BINS,
+) -> tuple[dict, list[dict]]:
+    """Approximate exact_evaluation with fixed-size metric accumulators.
 
-    calibration = bucket_by_confidence(all_conf, all_abs_err, bins=6)
-    return metrics, calibration, point_rows
+    Each athlete's evaluation is written, folded into StreamingMetrics and dropped, so
+    the metric state does not grow with the number of points. The inputs do: sessions,
+    truth and the population training_core result are all held in full. MAE is exact;
+    Spearman is binned (`bins` per axis) and the calibration buckets come from fine
+    confidence bins, so both differ from exact_evaluation (see StreamingMetrics), and
+    the intervals come from the Poisson bootstrap.
+
+    Returns (metrics_summary, calibration_buckets).
+    """
+    writers = tuple(writers)
+    acc = StreamingMetrics(bins=bins, buckets=6, n_boot=n_boot, seed=boot_seed)
+    coverage_sum = 0.0
+    n_athletes = 0
+    for ev in iter_evaluations(
+        sessions,
+        truth,
+        metric_key=metric_key,
+        use_normalized=use_normalized,
+        normalizer_min_n=normalizer_min_n,
+        clip_z=clip_z,
+    ):
+        for w in writers:
+            w.write(ev)
+        acc.add(ev.pred_fatigue, ev.true_fatigue, ev.confidence)
+        coverage_sum += ev.coverage
+        n_athletes += 1
+
+    metrics = {"coverage_mean": coverage_sum / n_athletes if n_athletes else 0.0}
+    metrics.update(acc.metrics())
+    return metrics, acc.calibration()
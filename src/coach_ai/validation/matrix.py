@@ -0,0 +1,357 @@
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import os
+import time
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from coach_ai.training_core import Session
+
+from .evaluator import TruthInput, exact_evaluation
+from .runner import SimulatorMode, population_athletes
+from .simulator import simulate_population, simulate_population_batch
+from .types import SessionBatch
+
+# summarized across seeds (scalar metrics of exact_evaluation)
+MATRIX_METRICS: tuple[str, ...] = (
+    "fatigue_spearman",
+    "fatigue_mae",
+    "coverage_mean",
+    "n_points_eval",
+)
+
+# two-sided 95% Student t quantiles, df = 1..30 (normal quantile beyond)
+_T975 = (
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+)  # fmt: skip
+
+
+def _coerce(raw: str, type_name: str) -> Any:
+    if raw.lower() in ("none", "null") and "None" in type_name:
+        return None
+    if type_name.startswith("bool"):
+        if raw.lower() not in ("1", "0", "true", "false", "yes", "no"):
+            raise ValueError(f"Not a boolean: {raw!r}")
+        return raw.lower() in ("1", "true", "yes")
+    if type_name.startswith("int"):
+        return int(raw)
+    if type_name.startswith("float"):
+        return float(raw)
+    return raw
+
+
+def _parse_spec(cls: type, spec: str) -> Any:
+    """'[name:]key=value,...' (or a bare name) -> cls(...), values typed by the fields."""
+    name, body = ("", spec) if ":" not in spec else spec.split(":", 1)
+    if ":" not in spec and "=" not in spec:
+        name, body = spec, ""
+    types = {f.name: str(f.type) for f in dataclasses.fields(cls)}
+    kw: dict[str, Any] = {}
+    for item in filter(None, (p.strip() for p in body.split(","))):
+        key, sep, raw = item.partition("=")
+        key = key.strip().replace("-", "_")
+        if not sep or key not in types or key == "name":
+            raise ValueError(f"Bad {cls.__name__} spec {spec!r}: unknown or valueless {key!r}")
+        kw[key] = _coerce(raw.strip(), types[key])
+    return cls(name=name.strip() or body.strip() or "default", **kw)
+
+
+@dataclass(frozen=True, slots=True)
+class PopulationSpec:
+    """One simulated population (see population_athletes); `name` labels it in reports."""
+
+    name: str = "default"
+    n_athletes: int = 8
+    days: int = 84
+    sessions_per_week: int = 4
+    missing_exercises_prob: float = 0.02
+    simulator: SimulatorMode = "vectorized"
+
+    @classmethod
+    def parse(cls, spec: str) -> PopulationSpec:
+        """e.g. 'long:days=365,n_athletes=20' or 'sparse:missing_exercises_prob=0.2'."""
+        return _parse_spec(cls, spec)
+
+
+@dataclass(frozen=True, slots=True)
+class EngineSpec:
+    """Pipeline settings evaluated on every population; `name` labels it in reports."""
+
+    name: str = "default"
+    metric_key: str = "volume_load_kg"
+    use_normalized: bool = True
+    normalizer_min_n: int = 10
+    clip_z: float | None = 5.0
+
+    @classmethod
+    def parse(cls, spec: str) -> EngineSpec:
+        """e.g. 'raw:use_normalized=false' or 'noclip:clip_z=none'."""
+        return _parse_spec(cls, spec)
+
+
+def dataset_key(pop: PopulationSpec, seed: int) -> str:
+    """Content key of a simulated dataset: the population fields (not its name) + seed."""
+    fields = {k: v for k, v in asdict(pop).items() if k != "name"}
+    payload = json.dumps({"seed": seed, **fields}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def _simulate(pop: PopulationSpec, seed: int) -> Any:
+    athletes = population_athletes(
+        pop.n_athletes,
+        days=pop.days,
+        sessions_per_week=pop.sessions_per_week,
+        missing_exercises_prob=pop.missing_exercises_prob,
+    )
+    if pop.simulator == "vectorized":
+        return simulate_population_batch(athletes, seed=seed)
+    if pop.simulator == "loop":
+        return simulate_population(athletes, seed=seed)
+    raise ValueError(f"Unsupported simulator: {pop.simulator}")
+
+
+def _write_batch(path: Path, batch: SessionBatch) -> None:
+    cols = {
+        f.name: getattr(batch, f.name)
+        for f in dataclasses.fields(SessionBatch)
+        if f.name not in ("athlete_ids", "start_utc")
+    }
+    tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npz")
+    np.savez(
+        tmp,
+        athlete_ids=np.array(batch.athlete_ids, dtype=str),
+        start_utc=np.array(batch.start_utc.isoformat()),
+        **cols,
+    )
+    os.replace(tmp, path)
+
+
+def _read_batch(path: Path) -> SessionBatch:
+    with np.load(path, allow_pickle=False) as z:
+        cols = {k: z[k] for k in z.files if k not in ("athlete_ids", "start_utc")}
+        return SessionBatch(
+            athlete_ids=z["athlete_ids"].tolist(),
+            start_utc=datetime.fromisoformat(str(z["start_utc"])),
+            **cols,
+        )
+
+
+def load_dataset(
+    pop: PopulationSpec, seed: int, *, cache_dir: str | None = None
+) -> tuple[list[Session], TruthInput, bool]:
+    """(sessions, truth, cache hit) of one population/seed, simulated at most once per cache.
+
+    Vectorized datasets (a SessionBatch) are stored as plain arrays in
+    `cache_dir/<dataset_key>.npz`, read back without unpickling; writes are atomic
+    renames, so concurrent workers never read a partial entry. Unreadable entries are
+    re-simulated. Loop-mode datasets are Session objects and are never cached.
+    """
+    path = None if cache_dir is None else Path(cache_dir) / f"{dataset_key(pop, seed)}.npz"
+    if pop.simulator != "vectorized":
+        path = None
+    if path is not None and path.exists():
+        try:
+            batch = _read_batch(path)
+            return batch.to_sessions(), batch, True
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+    raw = _simulate(pop, seed)
+    if isinstance(raw, tuple):
+        sessions, truth = raw
+        return sessions, truth, False
+    if path is not None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _write_batch(path, raw)
+    return raw.to_sessions(), raw, False
+
+
+def _run_group(
+    seed: int,
+    pop: PopulationSpec,
+    engines: tuple[EngineSpec, ...],
+    n_boot: int,
+    cache_dir: str | None,
+) -> list[dict[str, Any]]:
+    # one task per (seed, population): the dataset is loaded once for all engines
+    t0 = time.perf_counter()
+    sessions, truth, hit = load_dataset(pop, seed, cache_dir=cache_dir)
+    load_s = time.perf_counter() - t0
+    cells = []
+    for eng in engines:
+        t0 = time.perf_counter()
+        metrics, _ = exact_evaluation(
+            sessions,
+            truth,
+            metric_key=eng.metric_key,
+            use_normalized=eng.use_normalized,
+            normalizer_min_n=eng.normalizer_min_n,
+            clip_z=eng.clip_z,
+            n_boot=n_boot,
+            boot_seed=seed,
+        )
+        cells.append(
+            {
+                "seed": seed,
+                "population": pop.name,
+                "engine": eng.name,
+                "n_sessions": len(sessions),
+                "dataset_cached": hit,
+                "dataset_s": load_s,
+                "eval_s": time.perf_counter() - t0,
+                "metrics": metrics,
+            }
+        )
+    return cells
+
+
+def summarize_values(values: Iterable[float | None]) -> dict[str, Any]:
+    """Mean, sample std, min/max and Student-t 95% interval of the mean (None skipped)."""
+    x = np.array([v for v in values if v is not None], dtype=float)
+    x = x[np.isfinite(x)]
+    if x.size == 0:
+        return {"n": 0, "mean": None, "std": None, "min": None, "max": None, "ci95": None}
+    mean = float(x.mean())
+    std = float(x.std(ddof=1)) if x.size > 1 else None
+    ci = None
+    if std is not None:
+        half = (_T975[x.size - 2] if x.size - 1 <= len(_T975) else 1.96) * std / np.sqrt(x.size)
+        ci = [mean - float(half), mean + float(half)]
+    return {
+        "n": int(x.size),
+        "mean": mean,
+        "std": std,
+        "min": float(x.min()),
+        "max": float(x.max()),
+        "ci95": ci,
+    }
+
+
+def _paired_diff(paired: list[tuple[dict, dict]], key: str) -> list[float | None]:
+    return [
+        None if a.get(key) is None or b.get(key) is None else a[key] - b[key] for a, b in paired
+    ]
+
+
+def aggregate_cells(
+    cells: list[dict[str, Any]], *, metrics: Sequence[str] = MATRIX_METRICS
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """(summary, deltas) over seeds.
+
+    summary: one row per (population, engine) with summarize_values of every metric.
+    deltas: for every engine but the first, the per-seed paired difference to the first
+    engine on the same dataset, so seed-to-seed noise cancels out of the comparison.
+    """
+    grid: dict[tuple[str, str], dict[int, dict[str, Any]]] = {}
+    for c in cells:
+        grid.setdefault((c["population"], c["engine"]), {})[c["seed"]] = c["metrics"]
+
+    pops = list(dict.fromkeys(c["population"] for c in cells))
+    engines = list(dict.fromkeys(c["engine"] for c in cells))
+    summary = [
+        {
+            "population": p,
+            "engine": e,
+            "n_seeds": len(grid[(p, e)]),
+            "metrics": {
+                k: summarize_values(m.get(k) for m in grid[(p, e)].values()) for k in metrics
+            },
+        }
+        for p in pops
+        for e in engines
+        if (p, e) in grid
+    ]
+
+    deltas = []
+    for p in pops:
+        base = grid.get((p, engines[0]), {})
+        for e in engines[1:]:
+            cur = grid.get((p, e), {})
+            paired = [(cur[s], base[s]) for s in sorted(set(base) & set(cur))]
+            deltas.append(
+                {
+                    "population": p,
+                    "engine": e,
+                    "baseline": engines[0],
+                    "n_seeds": len(paired),
+                    "metrics": {k: summarize_values(_paired_diff(paired, k)) for k in metrics},
+                }
+            )
+    return summary, deltas
+
+
+def run_experiment_matrix(
+    *,
+    seeds: Sequence[int],
+    populations: Sequence[PopulationSpec] = (PopulationSpec(),),
+    engines: Sequence[EngineSpec] = (EngineSpec(),),
+    out_dir: str = "data/validation",
+    cache_dir: str | None = "data/validation/cache",
+    workers: int = 1,
+    n_boot: int = 0,
+) -> dict[str, Any]:
+    """Evaluate seeds x populations x engines and aggregate the metrics over seeds.
+
+    Tasks are (seed, population) pairs fanned out over `workers` processes; each loads
+    its dataset through the cache once and evaluates every engine on it. The report
+    (also written to out_dir/matrix.json) keeps every cell, the per-(population, engine)
+    summary with 95% intervals over seeds, and the paired deltas to the first engine.
+    n_boot: per-cell bootstrap resamples (0 = no per-cell intervals; seeds give the spread).
+    """
+    for label, specs in (("population", populations), ("engine", engines)):
+        names = [s.name for s in specs]
+        if not names or len(set(names)) != len(names):
+            raise ValueError(f"Need at least one {label} spec, with unique names: {names}")
+    seeds = list(dict.fromkeys(int(s) for s in seeds))
+    if not seeds:
+        raise ValueError("Need at least one seed")
+    engines = tuple(engines)
+    tasks = [(seed, pop) for pop in populations for seed in seeds]
+
+    t0 = time.perf_counter()
+    args = (
+        [t[0] for t in tasks],
+        [t[1] for t in tasks],
+        [engines] * len(tasks),
+        [n_boot] * len(tasks),
+        [cache_dir] * len(tasks),
+    )
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            groups = list(pool.map(_run_group, *args))
+    else:
+        groups = [_run_group(*a) for a in zip(*args, strict=True)]
+    cells = [c for g in groups for c in g]
+    summary, deltas = aggregate_cells(cells)
+
+    n_cached = sum(1 for g in groups if g and g[0]["dataset_cached"])
+    report = {
+        "generated_at_utc": datetime.now(UTC).isoformat(),
+        "seeds": seeds,
+        "populations": [asdict(p) for p in populations],
+        "engines": [asdict(e) for e in engines],
+        "n_boot": n_boot,
+        "evaluation": {"mode": "exact"},
+        "workers": workers,
+        "wall_s": time.perf_counter() - t0,
+        "dataset_cache": {"dir": cache_dir, "hits": n_cached, "misses": len(groups) - n_cached},
+        "summary": summary,
+        "deltas": deltas,
+        "cells": cells,
+    }
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    path = out / "matrix.json"
+    path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    report["files"] = {"matrix_json": str(path)}
+    return report
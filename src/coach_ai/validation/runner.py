@@ -1,33 +1,31 @@
 from __future__ import annotations
 
-import csv
 import json
 from datetime import UTC, datetime
 from pathlib import Path
+from typing import Literal
 
-from .evaluator import evaluate_simulation
-from .simulator import simulate_population
+from .evaluator import STREAMING_BINS, TruthInput, exact_evaluation, stream_evaluation
+from .simulator import simulate_population, simulate_population_batch
 from .types import AthleteSimConfig, ValidationReport
+from .writers import PointsFormat, open_point_writer
+
+SimulatorMode = Literal["loop", "vectorized"]
 
 
 def _now_utc_iso() -> str:
     return datetime.now(UTC).isoformat()
 
 
-def run_simulated_validation(
+def population_athletes(
+    n_athletes: int,
     *,
-    out_dir: str = "data/validation",
-    seed: int = 42,
-    n_athletes: int = 8,
     days: int = 84,
     sessions_per_week: int = 4,
     missing_exercises_prob: float = 0.02,
-) -> ValidationReport:
-    """Generate simulated gym data, run pipeline, and write validation artifacts."""
-    out = Path(out_dir)
-    out.mkdir(parents=True, exist_ok=True)
-
-    athletes = [
+) -> list[AthleteSimConfig]:
+    """The validation population: a1..aN with small, deterministic heterogeneity."""
+    return [
         AthleteSimConfig(
             athlete_id=f"a{i + 1}",
             days=days,
@@ -41,25 +39,66 @@ def run_simulated_validation(
         for i in range(n_athletes)
     ]
 
-    sessions, truth = simulate_population(athletes, seed=seed)
 
-    metrics, calibration, point_rows = evaluate_simulation(
-        sessions,
-        truth,
-        metric_key="volume_load_kg",
-        use_normalized=True,
-        normalizer_min_n=10,
-        clip_z=5.0,
+def run_simulated_validation(
+    *,
+    out_dir: str = "data/validation",
+    seed: int = 42,
+    n_athletes: int = 8,
+    days: int = 84,
+    sessions_per_week: int = 4,
+    missing_exercises_prob: float = 0.02,
+    simulator: SimulatorMode = "loop",
+    workers: int = 1,
+    n_boot: int = 200,
+    points_format: PointsFormat = "csv",
+    streaming: bool = False,
+) -> ValidationReport:
+    """Generate simulated gym data, run pipeline, and write validation artifacts.
+
+    simulator: "loop" (per-session objects) or "vectorized" (simulate_population_batch;
+    same model, different random draws). workers > 1 simulates athletes over a process
+    pool (loop mode; results do not depend on it). n_boot: bootstrap resamples for the
+    metric and calibration intervals (0 disables them).
+
+    Points are written to points.csv or points.npz (points_format) while athletes are
+    evaluated. Metrics are exact (exact_evaluation) unless `streaming`, which folds them
+    into fixed-size binned accumulators instead (stream_evaluation; approximate).
+    """
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+
+    athletes = population_athletes(
+        n_athletes,
+        days=days,
+        sessions_per_week=sessions_per_week,
+        missing_exercises_prob=missing_exercises_prob,
     )
 
-    # write points.csv
-    points_csv = out / "points.csv"
-    fieldnames = list(point_rows[0].keys()) if point_rows else ["athlete_id", "t"]
-    with points_csv.open("w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=fieldnames)
-        w.writeheader()
-        for row in point_rows:
-            w.writerow(row)
+    truth: TruthInput
+    if simulator == "vectorized":
+        batch = simulate_population_batch(athletes, seed=seed)
+        # the evaluator joins truth straight from the batch columns
+        sessions, truth = batch.to_sessions(), batch
+    elif simulator == "loop":
+        sessions, truth = simulate_population(athletes, seed=seed, workers=workers)
+    else:
+        raise ValueError(f"Unsupported simulator: {simulator}")
+
+    metric_key = "volume_load_kg"
+    evaluate = stream_evaluation if streaming else exact_evaluation
+    with open_point_writer(str(out), points_format, metric_key=metric_key) as writer:
+        metrics, calibration = evaluate(
+            sessions,
+            truth,
+            writers=(writer,),
+            metric_key=metric_key,
+            use_normalized=True,
+            normalizer_min_n=10,
+            clip_z=5.0,
+            n_boot=n_boot,
+            boot_seed=seed,
+        )
 
     # write report.json
     report_json = out / "report.json"
@@ -68,9 +107,12 @@ def run_simulated_validation(
         "seed": seed,
         "n_athletes": n_athletes,
         "n_sessions": len(sessions),
+        "evaluation": (
+            {"mode": "streaming", "bins": STREAMING_BINS} if streaming else {"mode": "exact"}
+        ),
         "metrics": metrics,
         "calibration": calibration,
-        "files": {"points_csv": str(points_csv), "report_json": str(report_json)},
+        "files": {f"points_{points_format}": writer.path, "report_json": str(report_json)},
     }
     report_json.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
 
@@ -1,14 +1,20 @@
 from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor
 from datetime import UTC, datetime, timedelta
 
 import numpy as np
 
-from coach_ai.latents.probability import sigmoid
+from coach_ai.latents.probability import sigmoid, sigmoid_array
 from coach_ai.training_core import Session
-from coach_ai.training_core.schema import StrengthExercise, StrengthSet
 
-from .types import AthleteSimConfig, SimulatedTruthPoint
+from .types import (
+    EXERCISE_NAMES,
+    AthleteSimConfig,
+    SessionBatch,
+    SimulatedTruthPoint,
+    session_exercises,
+)
 
 
 def _default_start_utc() -> datetime:
@@ -77,7 +83,8 @@ def simulate_athlete(
         # Construct sets so that sum(load*reps) ≈ vol
         reps = cfg.reps_per_set
         sets = cfg.sets_per_session
-        load_kg = vol / max(1.0, float(reps * sets))
+        n_ex = max(1, cfg.exercises_per_session)
+        load_kg = vol / max(1.0, float(reps * sets * n_ex))
 
         ex_name = "Bench Press"
         if naming_noise:
@@ -85,15 +92,13 @@ def simulate_athlete(
 
         exercises = []
         if not missing_ex:
-            exercises = [
-                StrengthExercise(
-                    name=str(ex_name),
-                    sets=[
-                        StrengthSet(reps=int(reps), load_kg=float(load_kg))
-                        for _ in range(int(sets))
-                    ],
-                )
-            ]
+            exercises = session_exercises(
+                str(ex_name),
+                n_exercises=n_ex,
+                sets=int(sets),
+                reps=int(reps),
+                load_kg=float(load_kg),
+            )
 
         # Update truth fatigue with relative load (centered at baseline)
         rel = (vol / max(1e-6, cfg.baseline_volume_kg)) - 1.0
@@ -140,22 +145,162 @@ def simulate_athlete(
     return sessions, truth
 
 
+def _simulate_one(
+    cfg: AthleteSimConfig, seed_seq: np.random.SeedSequence, start_utc: datetime | None
+) -> tuple[list[Session], list[SimulatedTruthPoint]]:
+    # module-level so it can be shipped to a process pool
+    return simulate_athlete(cfg, rng=np.random.default_rng(seed_seq), start_utc=start_utc)
+
+
 def simulate_population(
     athletes: list[AthleteSimConfig],
     *,
     seed: int = 42,
     start_utc: datetime | None = None,
+    workers: int = 1,
 ) -> tuple[list[Session], list[SimulatedTruthPoint]]:
-    rng = np.random.default_rng(seed)
+    """Simulate every athlete with its own generator spawned from SeedSequence(seed).
+
+    Athlete i always draws from child i (the final shuffle from one extra child), so
+    the output is bit-identical for any `workers`; workers > 1 fans athletes out over
+    a process pool.
+    """
+    children = np.random.SeedSequence(seed).spawn(len(athletes) + 1)
+    starts = [start_utc] * len(athletes)
+
+    if workers > 1 and len(athletes) > 1:
+        chunk = max(1, len(athletes) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(
+                pool.map(_simulate_one, athletes, children[:-1], starts, chunksize=chunk)
+            )
+    else:
+        results = [
+            _simulate_one(c, ss, st)
+            for c, ss, st in zip(athletes, children[:-1], starts, strict=True)
+        ]
+
     all_sessions: list[Session] = []
     all_truth: list[SimulatedTruthPoint] = []
-
-    for cfg in athletes:
-        s, t = simulate_athlete(cfg, rng=rng, start_utc=start_utc)
+    for s, t in results:
         all_sessions.extend(s)
         all_truth.extend(t)
 
     # mix ordering to ensure pipeline ordering works
-    rng.shuffle(all_sessions)
+    np.random.default_rng(children[-1]).shuffle(all_sessions)
     all_truth.sort(key=lambda x: (x.athlete_id, x.t))
     return all_sessions, all_truth
+
+
+def _param(athletes: list[AthleteSimConfig], name: str, dtype: type = float) -> np.ndarray:
+    return np.array([getattr(c, name) for c in athletes], dtype=dtype)
+
+
+def _batch_training_days(
+    athletes: list[AthleteSimConfig], rng: np.random.Generator
+) -> tuple[np.ndarray, np.ndarray]:
+    """(athlete index, day) of every session: sessions_per_week random days per 7-day block."""
+    days = _param(athletes, "days", np.int64)
+    spw = _param(athletes, "sessions_per_week", np.int64)
+    n_weeks = int(-(-days.max() // 7)) if days.size else 0
+    day_grid = np.arange(n_weeks * 7).reshape(n_weeks, 7)
+    valid = day_grid[None, :, :] < days[:, None, None]
+    keys = rng.random((len(athletes), n_weeks, 7))
+    keys[~valid] = 2.0  # past the horizon: ranked last, never chosen
+    ranks = np.argsort(np.argsort(keys, axis=2), axis=2)
+    chosen = valid & (ranks < spw[:, None, None])
+    athlete, flat_day = np.nonzero(chosen.reshape(len(athletes), -1))
+    return athlete.astype(np.int32), flat_day.astype(np.int32)
+
+
+def simulate_population_batch(
+    athletes: list[AthleteSimConfig],
+    *,
+    seed: int = 42,
+    start_utc: datetime | None = None,
+) -> SessionBatch:
+    """Array-native simulate_population: same model, emitted as a columnar SessionBatch.
+
+    All noise, missingness and naming-noise flags come from a handful of vectorized RNG
+    calls and the truth fatigue EWMA runs once per session index across all athletes,
+    so cost is dominated by array ops, not Python objects. The draws are not the ones
+    the per-session loop makes, so outputs match it in distribution, not value.
+    """
+    rng = np.random.default_rng(seed)
+    start = _default_start_utc() if start_utc is None else start_utc
+
+    athlete, day = _batch_training_days(athletes, rng)
+    n = athlete.size
+
+    def per_session(name: str, dtype: type = float) -> np.ndarray:
+        return _param(athletes, name, dtype)[athlete]
+
+    # Load model
+    week = day // 7
+    every = per_session("deload_every_weeks", np.int64)
+    is_deload = (every > 0) & ((week + 1) % np.maximum(every, 1) == 0)
+    mult_deload = np.where(is_deload, per_session("deload_multiplier"), 1.0)
+    baseline = per_session("baseline_volume_kg")
+    base = baseline * (1.0 + per_session("progression_per_week") * week) * mult_deload
+
+    noise = rng.normal(0.0, 1.0, n) * per_session("volume_noise_cv")
+    vol = base * np.maximum(0.3, 1.0 + noise)
+
+    # Data quality perturbations
+    missing = rng.random(n) < per_session("missing_exercises_prob")
+    naming = rng.random(n) < per_session("naming_noise_prob")
+    variant = rng.integers(1, len(EXERCISE_NAMES), n)
+    naming_code = np.where(naming, variant, 0).astype(np.int8)
+
+    sets = per_session("sets_per_session", np.int32)
+    reps = per_session("reps_per_set", np.int32)
+    n_ex = np.maximum(1, per_session("exercises_per_session", np.int32))
+    load_kg = vol / np.maximum(1.0, (reps * sets * n_ex).astype(float))
+
+    # Truth fatigue: EWMA of relative load, stepped over the session index of all athletes
+    counts = np.bincount(athlete, minlength=len(athletes))
+    offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    pos = np.arange(n) - offsets[athlete]
+    width = int(counts.max()) if counts.size else 0
+    rel = np.full((len(athletes), width), np.nan)
+    rel[athlete, pos] = vol / np.maximum(1e-6, baseline) - 1.0
+
+    alpha_truth = 0.30
+    fat = np.empty_like(rel)
+    f = np.zeros(len(athletes))
+    for j in range(width):
+        f = (1 - alpha_truth) * f + alpha_truth * rel[:, j]  # NaN only past each athlete's end
+        fat[:, j] = f
+    fatigue_raw = fat[athlete, pos]
+    fatigue_p = sigmoid_array(fatigue_raw, k=2.5, x0=0.0)
+
+    # Plateau truth: last 4 volumes nearly flat (within one athlete)
+    plateau = np.zeros(n, dtype=np.int8)
+    if n > 3:
+        same = athlete[3:] == athlete[:-3]
+        slope = (vol[3:] - vol[:-3]) / np.maximum(1e-6, np.abs(vol[:-3]))
+        plateau[3:] = (same & (np.abs(slope) < 0.01)).astype(np.int8)
+
+    # Session RPE (optional): increases with fatigue
+    rpe = np.clip(
+        per_session("rpe_base") + per_session("rpe_fatigue_gain") * fatigue_raw, 4.0, 10.0
+    )
+    rpe = np.where(per_session("include_session_rpe", bool), rpe, np.nan)
+
+    return SessionBatch(
+        athlete_ids=[c.athlete_id for c in athletes],
+        start_utc=start,
+        athlete=athlete,
+        day=day,
+        volume_load_kg=vol,
+        load_kg=load_kg,
+        sets=sets,
+        reps=reps,
+        exercises=n_ex,
+        rpe=rpe,
+        missing_exercises=missing,
+        naming_noise=naming_code,
+        true_fatigue_raw=fatigue_raw,
+        true_fatigue_p=fatigue_p,
+        true_plateau_flag=plateau,
+    )
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import UTC, datetime, timedelta
 from typing import Any
 
+import numpy as np
+
+from coach_ai.training_core import Session
+from coach_ai.training_core.schema import StrengthExercise, StrengthSet
+
 
 @dataclass(frozen=True, slots=True)
 class AthleteSimConfig:
@@ -22,9 +27,10 @@ class AthleteSimConfig:
     missing_exercises_prob: float = 0.02
     naming_noise_prob: float = 0.02
 
-    # Exercise structure
-    sets_per_session: int = 3
+    # Exercise structure (the session volume is split evenly over the exercises)
+    sets_per_session: int = 3  # per exercise
     reps_per_set: int = 8
+    exercises_per_session: int = 1
 
     # Session RPE (optional signal)
     include_session_rpe: bool = True
@@ -53,6 +59,131 @@ class SimulatedTruthPoint:
     meta: dict[str, Any]
 
 
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=UTC)
+_EPOCH_NAIVE = datetime(1970, 1, 1)
+
+
+def epoch_ns(t: datetime) -> int:
+    """Exact int64-compatible nanoseconds since the epoch (naive times taken as-is)."""
+    epoch = _EPOCH_NAIVE if t.tzinfo is None else _EPOCH_UTC
+    return ((t - epoch) // timedelta(microseconds=1)) * 1000
+
+
+# naming_noise codes of SessionBatch (0 = canonical name)
+EXERCISE_NAMES: tuple[str, ...] = ("Bench Press", "Bench press", "BENCH", "BenchPress")
+
+# Exercises after the first one when exercises_per_session > 1 (cycled)
+EXERCISE_CATALOG: tuple[str, ...] = (
+    "Back Squat",
+    "Deadlift",
+    "Overhead Press",
+    "Barbell Row",
+    "Pull-up",
+    "Romanian Deadlift",
+    "Incline Press",
+)
+
+
+def session_exercises(
+    first_name: str, *, n_exercises: int, sets: int, reps: int, load_kg: float
+) -> list[StrengthExercise]:
+    """n_exercises exercises of `sets` x `reps` at load_kg (first_name, then the catalog)."""
+    names = [first_name] + [
+        EXERCISE_CATALOG[j % len(EXERCISE_CATALOG)] for j in range(max(1, n_exercises) - 1)
+    ]
+    return [
+        StrengthExercise(
+            name=name, sets=[StrengthSet(reps=reps, load_kg=load_kg) for _ in range(sets)]
+        )
+        for name in names
+    ]
+
+
+@dataclass(frozen=True, slots=True)
+class SessionBatch:
+    """Columnar simulated sessions + truth, one row per session, sorted by (athlete, day).
+
+    athlete: index into athlete_ids; day: offset in days from start_utc
+    volume_load_kg: simulated volume (also for rows whose exercises are missing)
+    load_kg / sets / reps / exercises: the set structure (exercises x sets x reps at load_kg)
+    rpe: session RPE (NaN when the athlete does not report it)
+    naming_noise: index into EXERCISE_NAMES (0 = canonical)
+
+    Session / SimulatedTruthPoint objects are only built by to_sessions() / to_truth().
+    """
+
+    athlete_ids: list[str]
+    start_utc: datetime
+    athlete: np.ndarray  # int32
+    day: np.ndarray  # int32
+    volume_load_kg: np.ndarray  # float64
+    load_kg: np.ndarray  # float64
+    sets: np.ndarray  # int32
+    reps: np.ndarray  # int32
+    exercises: np.ndarray  # int32
+    rpe: np.ndarray  # float64
+    missing_exercises: np.ndarray  # bool
+    naming_noise: np.ndarray  # int8
+    true_fatigue_raw: np.ndarray  # float64
+    true_fatigue_p: np.ndarray  # float64
+    true_plateau_flag: np.ndarray  # int8
+
+    def __len__(self) -> int:
+        return int(self.athlete.size)
+
+    def timestamps_ns(self) -> np.ndarray:
+        """Session start times as int64 ns since the epoch."""
+        t0 = epoch_ns(self.start_utc)
+        return t0 + self.day.astype(np.int64) * 86_400 * 1_000_000_000
+
+    def start_times(self) -> list[datetime]:
+        return [self.start_utc + timedelta(days=int(d)) for d in self.day]
+
+    def to_sessions(self) -> list[Session]:
+        out: list[Session] = []
+        for i, t in enumerate(self.start_times()):
+            exercises = []
+            if not self.missing_exercises[i]:
+                exercises = session_exercises(
+                    EXERCISE_NAMES[int(self.naming_noise[i])],
+                    n_exercises=int(self.exercises[i]),
+                    sets=int(self.sets[i]),
+                    reps=int(self.reps[i]),
+                    load_kg=float(self.load_kg[i]),
+                )
+            rpe = float(self.rpe[i])
+            out.append(
+                Session(
+                    athlete_id=self.athlete_ids[int(self.athlete[i])],
+                    start_time=t,
+                    duration_min=60.0,
+                    rpe=None if np.isnan(rpe) else rpe,
+                    modality="strength",
+                    exercises=exercises,
+                    source="simulator",
+                    meta={"sim_week": int(self.day[i]) // 7, "sim_day": int(self.day[i])},
+                )
+            )
+        return out
+
+    def to_truth(self) -> list[SimulatedTruthPoint]:
+        return [
+            SimulatedTruthPoint(
+                athlete_id=self.athlete_ids[int(self.athlete[i])],
+                t=t,
+                volume_load_kg=None if self.missing_exercises[i] else float(self.volume_load_kg[i]),
+                true_fatigue_raw=float(self.true_fatigue_raw[i]),
+                true_fatigue_p=float(self.true_fatigue_p[i]),
+                true_plateau_flag=int(self.true_plateau_flag[i]),
+                meta={
+                    "missing_exercises": bool(self.missing_exercises[i]),
+                    "naming_noise": bool(self.naming_noise[i]),
+                },
+            )
+            for i, t in enumerate(self.start_times())
+        ]
+
+
 @dataclass(frozen=True, slots=True)
 class ValidationReport:
     generated_at_utc: str
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import csv
+import shutil
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import Any, Literal
+
+import numpy as np
+
+from coach_ai.trends.types import TrendDirection
+
+from .evaluator import POINT_COLUMNS, AthleteEvaluation
+
+PointsFormat = Literal["csv", "npz"]
+
+TREND_DIR_LABELS: tuple[str, ...] = tuple(d.value for d in TrendDirection) + ("none",)
+
+# Per-point columns of the .npz output (athlete-level values are stored once per athlete).
+NPZ_POINT_COLUMNS: dict[str, np.dtype] = {
+    "athlete": np.dtype(np.int32),  # index into athlete_ids
+    "t_ns": np.dtype(np.int64),
+    "pred_fatigue": np.dtype(np.float64),
+    "true_fatigue": np.dtype(np.float64),
+    "abs_error": np.dtype(np.float64),
+    "confidence": np.dtype(np.float64),
+    "trend_dir": np.dtype(np.int8),  # index into trend_dir_labels
+    "trend_conf": np.dtype(np.float64),
+}
+
+
+class CsvPointWriter:
+    """points.csv written one athlete at a time (POINT_COLUMNS, empty cell = missing)."""
+
+    def __init__(self, path: str, *, metric_key: str) -> None:
+        self.path = str(path)
+        self.metric_key = metric_key
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._f = Path(self.path).open("w", newline="", encoding="utf-8")
+        self._w = csv.DictWriter(self._f, fieldnames=list(POINT_COLUMNS))
+        self._w.writeheader()
+        self.n_points = 0
+
+    def write(self, ev: AthleteEvaluation) -> None:
+        self._w.writerows(ev.rows(self.metric_key))
+        self.n_points += len(ev.t)
+
+    def close(self) -> None:
+        if not self._f.closed:
+            self._f.close()
+
+    def __enter__(self) -> CsvPointWriter:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+class NpzPointWriter:
+    """Columnar points.npz (load with np.load) built without holding the points in memory.
+
+    Per-point columns (NPZ_POINT_COLUMNS, NaN = missing) are spooled to raw files next
+    to the output and streamed into the zip on close, together with the athlete-level
+    arrays athlete_ids, coverage_athlete and top_scenario plus trend_dir_labels and
+    metric_key.
+    """
+
+    def __init__(self, path: str, *, metric_key: str, compress: bool = True) -> None:
+        self.path = str(path)
+        self.metric_key = metric_key
+        self.compress = compress
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._spool = tempfile.TemporaryDirectory(prefix=".points-", dir=Path(self.path).parent)
+        self._files = {
+            name: (Path(self._spool.name) / name).open("wb") for name in NPZ_POINT_COLUMNS
+        }
+        self._dir_code = {label: i for i, label in enumerate(TREND_DIR_LABELS)}
+        self.athlete_ids: list[str] = []
+        self.coverage: list[float] = []
+        self.top_scenario: list[str] = []
+        self.n_points = 0
+        self.closed = False
+
+    def write(self, ev: AthleteEvaluation) -> None:
+        n = len(ev.t)
+        cols = {
+            "athlete": np.full(n, len(self.athlete_ids)),
+            "t_ns": ev.t_ns,
+            "pred_fatigue": ev.pred_fatigue,
+            "true_fatigue": ev.true_fatigue,
+            "abs_error": ev.abs_error,
+            "confidence": ev.confidence,
+            "trend_dir": [self._dir_code[d] for d in ev.trend_dir],
+            "trend_conf": ev.trend_conf,
+        }
+        for name, dtype in NPZ_POINT_COLUMNS.items():
+            self._files[name].write(np.asarray(cols[name], dtype=dtype).tobytes())
+        self.athlete_ids.append(ev.athlete_id)
+        self.coverage.append(ev.coverage)
+        self.top_scenario.append(ev.top_scenario)
+        self.n_points += n
+
+    def abort(self) -> None:
+        """Drop the spooled columns without writing the archive."""
+        if self.closed:
+            return
+        self.closed = True
+        for f in self._files.values():
+            f.close()
+        self._spool.cleanup()
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        for f in self._files.values():
+            f.close()
+        small = {
+            "athlete_ids": np.array(self.athlete_ids, dtype=str),
+            "coverage_athlete": np.array(self.coverage, dtype=np.float64),
+            "top_scenario": np.array(self.top_scenario, dtype=str),
+            "trend_dir_labels": np.array(TREND_DIR_LABELS),
+            "metric_key": np.array(self.metric_key),
+        }
+        mode = zipfile.ZIP_DEFLATED if self.compress else zipfile.ZIP_STORED
+        try:
+            with zipfile.ZipFile(self.path, "w", compression=mode, allowZip64=True) as zf:
+                for name, dtype in NPZ_POINT_COLUMNS.items():
+                    header = {
+                        "descr": np.lib.format.dtype_to_descr(dtype),
+                        "fortran_order": False,
+                        "shape": (self.n_points,),
+                    }
+                    with (
+                        zf.open(f"{name}.npy", "w", force_zip64=True) as out,
+                        (Path(self._spool.name) / name).open("rb") as src,
+                    ):
+                        np.lib.format.write_array_header_1_0(out, header)
+                        shutil.copyfileobj(src, out, 1024 * 1024)
+                for name, arr in small.items():
+                    with zf.open(f"{name}.npy", "w", force_zip64=True) as out:
+                        np.lib.format.write_array(out, arr, allow_pickle=False)
+        finally:
+            self._spool.cleanup()
+
+    def __enter__(self) -> NpzPointWriter:
+        return self
+
+    def __exit__(self, exc_type: Any, *exc: Any) -> None:
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+
+def open_point_writer(
+    out_dir: str, fmt: PointsFormat, *, metric_key: str
+) -> CsvPointWriter | NpzPointWriter:
+    """points.csv / points.npz writer in out_dir."""
+    if fmt == "csv":
+        return CsvPointWriter(str(Path(out_dir) / "points.csv"), metric_key=metric_key)
+    if fmt == "npz":
+        return NpzPointWriter(str(Path(out_dir) / "points.npz"), metric_key=metric_key)
+    raise ValueError(f"Unsupported points format: {fmt}")
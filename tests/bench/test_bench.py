@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import copy
+
+import pytest
+
+from coach_ai.bench import BenchCase, Thresholds, compare_reports, run_suite
+from coach_ai.bench.suite import STAGES
+
+
+def test_run_suite_times_every_stage_and_compares_to_itself():
+    rep = run_suite([BenchCase(2, 28, 2), BenchCase(4, 28, 2)], repeats=1)
+
+    assert [c["case"] for c in rep["cases"]] == ["a2-d28-s2", "a4-d28-s2"]
+    for c in rep["cases"]:
+        assert c["n_sessions"] > 0 and c["n_sets"] > c["n_sessions"]
+        assert tuple(c["stages"]) == STAGES
+        for r in c["stages"].values():
+            assert r["median_s"] > 0 and r["throughput_per_s"] > 0
+            assert r["peak_bytes"] >= 0
+    assert set(rep["scaling"]) == set(STAGES)
+
+    rows = compare_reports(rep, rep)
+    assert {r["status"] for r in rows} == {"ok"}
+
+
+def test_compare_flags_slowdowns_memory_growth_and_missing_cases():
+    stage = {"median_s": 0.1, "peak_bytes": 1000}
+    base = {"cases": [{"case": "a1-d1-s1", "stages": {"x": stage, "y": stage}}]}
+    cur = copy.deepcopy(base)
+    cur["cases"][0]["stages"]["x"]["median_s"] = 0.2
+    cur["cases"][0]["stages"]["y"]["peak_bytes"] = 5000
+    cur["cases"].append({"case": "new", "stages": {"x": stage}})
+
+    rows = {(r["case"], r["stage"]): r["status"] for r in compare_reports(cur, base)}
+    assert rows == {
+        ("a1-d1-s1", "x"): "regression",
+        ("a1-d1-s1", "y"): "regression",
+        ("new", "x"): "missing",
+    }
+    loose = compare_reports(cur, base, thresholds=Thresholds(max_slowdown=3.0, max_memory_growth=6))
+    assert [r["status"] for r in loose[:2]] == ["ok", "ok"]
+
+
+def test_bench_case_parse():
+    assert BenchCase.parse("10x84x5") == BenchCase(10, 84, 5)
+    assert BenchCase.parse("3x28").sets_per_session == 3
+    with pytest.raises(ValueError):
+        BenchCase.parse("10")
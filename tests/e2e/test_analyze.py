@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import gzip
+import json
+import sys
+
+import numpy as np
+
+from coach_ai.e2e import SegmentedLogStore
+from coach_ai.e2e.analyze import StreamingHistogram, analyze_logs, main
+from coach_ai.e2e.decision_log import DecisionLogEntry, entry_to_line, summarize_issues_for_log
+from coach_ai.suggestions.types import ScenarioName
+from coach_ai.training_core.types import Issue, Severity
+
+RECOVERY, PROGRESSION = ScenarioName.RECOVERY.value, ScenarioName.PROGRESSION.value
+
+
+def _issues(n_warn: int, n_error: int = 0) -> list[Issue]:
+    return [
+        Issue(severity=sev, code="x", message="x", field=None, value=None, meta={})
+        for sev in [Severity.WARN] * n_warn + [Severity.ERROR] * n_error
+    ]
+
+
+def _entry(i: int, *, day: int, top: str, conf: float) -> DecisionLogEntry:
+    return DecisionLogEntry(
+        run_id=f"r{i}",
+        generated_at_utc=f"2024-01-{day:02d}T10:00:00+00:00",
+        engine_version="v1",
+        config_fingerprint="fp",
+        athlete_id="a1",
+        metric_key="volume_load_kg",
+        used_normalized=True,
+        summary={"top_scenario": top, "top_probability": 0.5, "confidence_top": conf},
+        scenarios=[{"name": top, "probability": 0.5}],
+        issues_summary=summarize_issues_for_log(_issues(i % 2, n_error=2 * (i % 2))),
+    )
+
+
+def test_streaming_histogram_quantiles_within_one_bin():
+    rng = np.random.default_rng(0)
+    x = rng.random(5000)
+    h = StreamingHistogram(bins=200)
+    for v in x:
+        h.add(float(v))
+    h.add(float("nan"))
+    assert h.n == 5000
+    for q in (0.1, 0.5, 0.9):
+        assert abs(h.quantile(q) - np.quantile(x, q)) <= 1.0 / 200
+    assert StreamingHistogram().quantile(0.5) is None
+
+
+def test_analyze_groups_by_week_and_reports_drift(tmp_path):
+    root = tmp_path / "decisions"
+    with SegmentedLogStore(str(root), max_segment_bytes=1_000, block_bytes=400) as store:
+        for i in range(10):  # week 1 (Jan 1-7): all deload
+            store.append(_entry(i, day=2, top=RECOVERY, conf=0.8))
+        for i in range(10, 20):  # week 2: half deload, half push
+            store.append(_entry(i, day=9, top=RECOVERY if i % 2 else PROGRESSION, conf=0.4))
+
+    plain = tmp_path / "extra.jsonl.gz"
+    with gzip.open(plain, "wt", encoding="utf-8") as f:
+        f.write("not json\n")
+
+    rep = analyze_logs([str(root), str(plain)])
+
+    assert rep["n_entries"] == 20
+    assert rep["n_skipped"] == 1
+    assert [g["week"] for g in rep["groups"]] == ["2024-W01", "2024-W02"]
+    assert rep["groups"][0]["top_scenario_share"] == {RECOVERY: 1.0}
+    assert rep["overall"]["run_rate_with"] == {"error": 0.5, "warn": 0.5, "info": 0.0}
+    assert rep["overall"]["issues_per_run"] == {"error": 1.0, "warn": 0.5, "info": 0.0}
+    assert abs(rep["groups"][1]["confidence_top"]["quantiles"]["p50"] - 0.4) < 1e-3
+    assert [d["tv_vs_prev_week"] for d in rep["drift"]] == [0.0, 0.5]
+
+
+def test_analyze_cli_writes_report(tmp_path, monkeypatch):
+    log = tmp_path / "decisions.jsonl"
+    log.write_text(entry_to_line(_entry(0, day=2, top=RECOVERY, conf=0.8)), encoding="utf-8")
+    out = tmp_path / "report.json"
+    monkeypatch.setattr(sys, "argv", ["analyze", str(log), "--out", str(out)])
+    main()
+    assert json.loads(out.read_text(encoding="utf-8"))["n_entries"] == 1
+
+
+def test_malformed_entries_are_skipped_not_fatal(tmp_path):
+    log = tmp_path / "decisions.jsonl"
+    good = entry_to_line(_entry(1, day=2, top=RECOVERY, conf=0.8))
+    bad = json.loads(good)
+    bad["summary"]["confidence_top"] = "high"
+    worse = {**json.loads(good), "issues_summary": {"warn": None}}
+    lines = [good, json.dumps(bad) + "\n", json.dumps(worse) + "\n", good]
+    log.write_text("".join(lines), encoding="utf-8")
+
+    rep = analyze_logs([str(log)])
+    assert (rep["n_entries"], rep["n_skipped"]) == (2, 2)
+    assert rep["overall"]["issues_per_run"]["error"] == 2.0
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from datetime import datetime
+
+import coach_ai.e2e.batch as batch
+from coach_ai.e2e import EndToEndConfig, run_end_to_end, run_end_to_end_batch
+from coach_ai.training_core import Session
+from coach_ai.training_core.schema import StrengthExercise, StrengthSet
+
+
+def _sessions() -> list[Session]:
+    return [
+        Session(
+            athlete_id=aid,
+            start_time=datetime(2024, 1, d, 10, 0, 0),
+            duration_min=60,
+            rpe=7,
+            exercises=[StrengthExercise(name="Bench", sets=[StrengthSet(reps=8, load_kg=x)])],
+        )
+        for aid in ("a1", "a2")
+        for d, x in ((1, 60), (3, 90), (5, 110))
+    ]
+
+
+def _cfg(aid: str, tmp_path) -> EndToEndConfig:
+    return EndToEndConfig(
+        athlete_id=aid,
+        normalizer_min_n=2,
+        clip_z=None,
+        log_enabled=False,
+        log_path=str(tmp_path / "decisions.jsonl"),
+    )
+
+
+def test_batch_runs_training_core_once_and_matches_single_runs(tmp_path, monkeypatch):
+    calls = []
+    real = batch.process_sessions
+
+    def counting(*args, **kwargs):
+        calls.append(1)
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(batch, "process_sessions", counting)
+
+    sessions = _sessions()
+    configs = [_cfg("a1", tmp_path), _cfg("a2", tmp_path), _cfg("missing", tmp_path)]
+    res = run_end_to_end_batch(sessions, configs, max_workers=2)
+
+    assert len(calls) == 1
+    assert list(res.results) == ["a1", "a2", "missing"]
+    assert res.failed == ["missing"]
+    assert res.issues_by_code["athlete_not_found"] == 1
+    assert res.results["a1"].training_core is res.results["a2"].training_core
+
+    single = run_end_to_end(sessions, config=configs[0])
+    got = [(s.name, s.probability) for s in res.results["a1"].suggestions.scenarios]
+    assert got == [(s.name, s.probability) for s in single.suggestions.scenarios]
+
+
+def test_batch_isolates_athlete_failures(tmp_path, monkeypatch):
+    real = batch.run_end_to_end
+
+    def flaky(sessions, *, config, **kwargs):
+        if config.athlete_id == "a2":
+            raise RuntimeError("worker crashed")
+        return real(sessions, config=config, **kwargs)
+
+    monkeypatch.setattr(batch, "run_end_to_end", flaky)
+
+    res = run_end_to_end_batch(_sessions(), [_cfg("a1", tmp_path), _cfg("a2", tmp_path)])
+
+    assert res.results["a1"].suggestions is not None
+    assert res.failed == ["a2"]
+    assert res.results["a2"].issues[0].code == "athlete_run_failed"
+
+
+def test_batch_process_pool(tmp_path):
+    res = run_end_to_end_batch(
+        _sessions(),
+        [_cfg("a1", tmp_path), _cfg("a2", tmp_path)],
+        max_workers=2,
+        executor="process",
+    )
+    assert res.failed == []
+    assert all(r.suggestions.scenarios for r in res.results.values())
+
+
+def test_batch_downsamples_under_deadline_like_single_runs(tmp_path):
+    sessions = _sessions()
+    cfgs = [
+        replace(_cfg(aid, tmp_path), deadline_ms=1e-6, deadline_window=2) for aid in ("a1", "a2")
+    ]
+    out = run_end_to_end_batch(sessions, cfgs)
+
+    for cfg in cfgs:
+        single = run_end_to_end(sessions, config=cfg)
+        res = out.results[cfg.athlete_id]
+        assert len(res.athlete_series.order) == len(single.athlete_series.order) == 2
+        assert "deadline_downsample" in {i.code for i in res.issues}
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime, timedelta
+
+from coach_ai.e2e import ArtifactCache, EndToEndConfig, run_end_to_end
+from coach_ai.e2e.budget import Budget
+from coach_ai.training_core import Session
+from coach_ai.training_core.schema import StrengthExercise, StrengthSet
+
+
+def _sessions(n: int = 12) -> list[Session]:
+    t0 = datetime(2024, 1, 1, 10, 0, 0)
+    return [
+        Session(
+            athlete_id="a1",
+            start_time=t0 + timedelta(days=2 * i),
+            duration_min=60,
+            rpe=7,
+            exercises=[
+                StrengthExercise(name="Bench", sets=[StrengthSet(reps=8, load_kg=60 + 3 * i)])
+            ],
+        )
+        for i in range(n)
+    ]
+
+
+def _cfg(**kw) -> EndToEndConfig:
+    return EndToEndConfig(athlete_id="a1", normalizer_min_n=2, clip_z=None, log_enabled=False, **kw)
+
+
+def test_budget_steps_follow_remaining_fraction():
+    issues = []
+    b = Budget(deadline_ms=1000.0, started=time.perf_counter() - 0.6)  # ~40% left
+    assert b.wants("skip_explanations")
+    assert not b.wants("downsample") and not b.wants("cached_fallback")
+    b.take("skip_explanations", issues)
+    b.take("skip_explanations", issues)
+    assert [i.code for i in issues] == ["deadline_skip_explanations"]
+    assert b.degraded
+
+
+def test_taking_a_step_takes_the_earlier_ladder_steps():
+    issues = []
+    b = Budget(deadline_ms=1000.0, started=time.perf_counter() - 0.9)
+    b.take("skip_latents", issues)
+    assert b.taken == ["skip_explanations", "downsample", "skip_latents"]
+    assert b.wants("skip_explanations")
+    b.take("cached_fallback", issues)
+    assert b.taken[-1] == "cached_fallback" and len(issues) == 4
+
+
+def test_settled_steps_are_not_back_filled():
+    issues = []
+    b = Budget(deadline_ms=1000.0, started=time.perf_counter() - 0.9)
+    b.settle("downsample")
+    assert not b.wants("downsample")
+    b.take("skip_latents", issues)
+    assert b.taken == ["skip_explanations", "skip_latents"]
+    assert [i.code for i in issues] == ["deadline_skip_explanations", "deadline_skip_latents"]
+
+
+def test_generous_deadline_changes_nothing():
+    res = run_end_to_end(_sessions(), config=_cfg(deadline_ms=60_000.0))
+    assert not [i for i in res.issues if i.code.startswith("deadline_")]
+    assert res.summary["degradations"] == "none"
+    assert all(s.explanation for s in res.suggestions.scenarios)
+
+
+def test_exhausted_budget_degrades_in_order_without_cache():
+    res = run_end_to_end(_sessions(), config=_cfg(deadline_ms=1e-6, deadline_window=5))
+
+    codes = [i.code for i in res.issues if i.code.startswith("deadline_")]
+    assert codes == [
+        "deadline_skip_explanations",
+        "deadline_downsample",
+        "deadline_skip_latents",
+        "deadline_exceeded",
+    ]
+    assert res.summary["degradations"] == "skip_explanations,downsample,skip_latents"
+    assert len(res.athlete_series.order) == 5
+    assert res.latents is not None and res.latents.points == []
+    assert res.suggestions is not None
+    assert all(s.explanation == [] for s in res.suggestions.scenarios)
+
+
+def test_exhausted_budget_falls_back_to_last_cached_suggestions():
+    cache = ArtifactCache()
+    full = run_end_to_end(_sessions(), config=_cfg(), cache=cache)
+
+    res = run_end_to_end(_sessions(13), config=_cfg(deadline_ms=1e-6), cache=cache)
+
+    assert res.suggestions is full.suggestions
+    assert res.trend is None and res.latents is None
+    assert "deadline_cached_fallback" in [i.code for i in res.issues]
+    assert "cached_fallback" in res.summary["degradations"]
+
+
+def test_exhausted_budget_does_not_report_downsample_when_history_fits_window():
+    res = run_end_to_end(_sessions(), config=_cfg(deadline_ms=1e-6, deadline_window=500))
+
+    codes = [i.code for i in res.issues if i.code.startswith("deadline_")]
+    assert codes == ["deadline_skip_explanations", "deadline_skip_latents", "deadline_exceeded"]
+    assert res.summary["degradations"] == "skip_explanations,skip_latents"
+    assert len(res.athlete_series.order) == 12
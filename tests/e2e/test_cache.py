@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from datetime import datetime
+
+import coach_ai.e2e.versioning as versioning
+from coach_ai.e2e import ArtifactCache, DiskArtifactCache, EndToEndConfig, run_end_to_end
+from coach_ai.e2e.cache import series_hash, stage_fingerprint
+from coach_ai.training_core import Session
+from coach_ai.training_core.schema import StrengthExercise, StrengthSet
+
+
+def _sessions(last_load: float = 110) -> list[Session]:
+    return [
+        Session(
+            athlete_id="a1",
+            start_time=datetime(2024, 1, d, 10, 0, 0),
+            duration_min=60,
+            rpe=7,
+            exercises=[StrengthExercise(name="Bench", sets=[StrengthSet(reps=8, load_kg=x)])],
+        )
+        for d, x in ((1, 60), (3, 90), (5, last_load))
+    ]
+
+
+def _cfg(**kw) -> EndToEndConfig:
+    return EndToEndConfig(athlete_id="a1", normalizer_min_n=2, clip_z=None, log_enabled=False, **kw)
+
+
+def test_lru_bounds_and_counters():
+    cache = ArtifactCache(max_entries=2)
+    assert cache.get("trends", "fp", "h1") is None
+    cache.put("trends", "fp", "h1", [1])
+    cache.put("trends", "fp", "h2", [2])
+    assert cache.get("trends", "fp", "h1") == [1]  # h1 becomes most recent
+    cache.put("trends", "fp", "h3", [3])  # evicts h2
+    assert cache.get("trends", "fp", "h2") is None
+    assert cache.stats == {
+        "hits": 1,
+        "misses": 2,
+        "evictions": 1,
+        "invalidations": 0,
+        "entries": 2,
+        "bytes": cache.stats["bytes"],
+    }
+
+    small = ArtifactCache(max_bytes=200)
+    small.put("trends", "fp", "big", list(range(1000)))  # larger than the whole budget
+    assert small.stats["entries"] == 0
+
+
+def test_engine_version_change_invalidates(monkeypatch):
+    cache = ArtifactCache()
+    cache.put("trends", "fp", "h", {"x": 1})
+    monkeypatch.setattr(versioning, "ENGINE_VERSION", "next")
+    assert cache.get("trends", "fp", "h") is None
+    assert cache.stats["invalidations"] == 1
+    assert cache.stats["entries"] == 0
+
+
+def test_runner_reuses_artifacts_for_unchanged_series():
+    cache = ArtifactCache()
+    first = run_end_to_end(_sessions(), config=_cfg(), cache=cache)
+    second = run_end_to_end(_sessions(), config=_cfg(), cache=cache)
+
+    assert second.trend is first.trend
+    assert second.suggestions.scenarios is first.suggestions.scenarios
+    assert second.suggestions.generated_at > first.suggestions.generated_at
+    assert [i.code for i in second.issues] == [i.code for i in first.issues]
+    status = {t.name: t.status for t in second.timings}
+    assert status["trends"] == status["latents"] == status["suggestions"] == "cached"
+    assert cache.stats["hits"] == 3
+
+    # new data or a relevant config change misses; an unrelated field does not
+    assert run_end_to_end(_sessions(120), config=_cfg(), cache=cache).trend is not first.trend
+    relaxed = run_end_to_end(_sessions(), config=_cfg(fatigue_alpha=0.5), cache=cache)
+    assert relaxed.trend is first.trend and relaxed.latents is not first.latents
+    assert stage_fingerprint(replace(_cfg(), log_path="x"), "suggestions") == stage_fingerprint(
+        _cfg(), "suggestions"
+    )
+    assert series_hash(first.athlete_series) == series_hash(second.athlete_series)
+
+
+def _disk_put(path: str, i: int) -> None:
+    DiskArtifactCache(path).put("trends", "fp", f"h{i}", {"i": i})
+
+
+def test_disk_cache_is_shared_across_processes(tmp_path):
+    path = str(tmp_path / "cache" / "artifacts.sqlite3")
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        list(pool.map(_disk_put, [path] * 4, range(4)))
+
+    cache = DiskArtifactCache(path)
+    assert [cache.get("trends", "fp", f"h{i}") for i in range(4)] == [{"i": i} for i in range(4)]
+    assert cache.get("trends", "fp", "other") is None
+    assert cache.stats["entries"] == 4
+    assert pickle.loads(pickle.dumps(cache)).get("trends", "fp", "h0") == {"i": 0}
+
+
+def test_disk_cache_evicts_lru_by_size_and_purges_old_versions(tmp_path, monkeypatch):
+    path = str(tmp_path / "artifacts.sqlite3")
+    blob = list(range(300))  # ~1KB pickled
+    size = len(pickle.dumps(blob, protocol=pickle.HIGHEST_PROTOCOL))
+    cache = DiskArtifactCache(path, max_bytes=3 * size, touch_interval_s=0.0)
+    for i in range(3):
+        cache.put("latents", "fp", f"h{i}", blob)
+    assert cache.get("latents", "fp", "h0") == blob  # h0 becomes most recent
+    cache.put("latents", "fp", "h3", blob)
+    assert cache.get("latents", "fp", "h1") is None
+    assert cache.stats["evictions"] == 1
+    assert cache.stats["entries"] == 3
+
+    monkeypatch.setattr(versioning, "ENGINE_VERSION", "next")
+    assert cache.get("latents", "fp", "h0") is None
+    assert cache.stats["entries"] == 0
+
+
+def test_disk_cache_hits_only_touch_stale_rows(tmp_path, monkeypatch):
+    path = str(tmp_path / "artifacts.sqlite3")
+    cache = DiskArtifactCache(path, touch_interval_s=60.0)
+    clock = [1_000.0]
+    monkeypatch.setattr("coach_ai.e2e.cache.time.time", lambda: clock[0])
+    cache.put("trends", "fp", "h", {"x": 1})
+
+    def last_access() -> float:
+        return cache._conn().execute("SELECT last_access FROM artifacts").fetchone()[0]
+
+    clock[0] += 30.0
+    assert cache.get("trends", "fp", "h") == {"x": 1}
+    assert last_access() == 1_000.0  # fresh enough: no write
+    clock[0] += 31.0
+    assert cache.get("trends", "fp", "h") == {"x": 1}
+    assert last_access() == 1_061.0
+
+
+def test_disk_cache_drops_rows_that_no_longer_unpickle(tmp_path):
+    cache = DiskArtifactCache(str(tmp_path / "artifacts.sqlite3"))
+    cache.put("trends", "fp", "h", {"x": 1})
+    # a class that has since moved: unpickling raises ModuleNotFoundError, not UnpicklingError
+    blob = pickle.dumps(StrengthSet(reps=8, load_kg=60.0), protocol=pickle.HIGHEST_PROTOCOL)
+    blob = blob.replace(b"coach_ai.training_core.schema", b"coach_ai.training_core.gone__")
+    cache._conn().execute("UPDATE artifacts SET value = ?", (blob,))
+
+    assert cache.get("trends", "fp", "h") is None
+    assert (cache.stats["errors"], cache.stats["misses"], cache.stats["entries"]) == (1, 1, 0)
+    cache.put("trends", "fp", "h", {"x": 2})
+    assert cache.get("trends", "fp", "h") == {"x": 2}
+
+
+def test_runner_with_disk_cache(tmp_path):
+    path = str(tmp_path / "artifacts.sqlite3")
+    first = run_end_to_end(_sessions(), config=_cfg(), cache=DiskArtifactCache(path))
+    second = run_end_to_end(_sessions(), config=_cfg(), cache=DiskArtifactCache(path))
+
+    assert {t.name: t.status for t in second.timings}["suggestions"] == "cached"
+    assert [s.name for s in second.suggestions.scenarios] == [
+        s.name for s in first.suggestions.scenarios
+    ]
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import json
+import threading
+from dataclasses import asdict
+from datetime import datetime
+
+import pytest
+
+from coach_ai.e2e import (
+    DecisionLogReader,
+    DecisionLogWriter,
+    EndToEndConfig,
+    SegmentedLogStore,
+    run_end_to_end,
+)
+from coach_ai.e2e.decision_log import DecisionLogEntry
+from coach_ai.training_core import Session
+from coach_ai.training_core.schema import StrengthExercise, StrengthSet
+
+
+def _entry(i: int) -> DecisionLogEntry:
+    return DecisionLogEntry(
+        run_id=f"r{i}",
+        generated_at_utc="2024-01-01T00:00:00+00:00",
+        engine_version="test",
+        config_fingerprint="fp",
+        athlete_id="a1",
+        metric_key="volume_load_kg",
+        used_normalized=True,
+        summary={"top_scenario": "none"},
+        scenarios=[],
+        issues_summary={},
+    )
+
+
+class _MemorySink:
+    def __init__(self) -> None:
+        self.batches: list[list[DecisionLogEntry]] = []
+        self.syncs = 0
+        self.closed = False
+
+    def write_entries(self, entries: list[DecisionLogEntry]) -> None:
+        self.batches.append(list(entries))
+
+    def sync(self) -> None:
+        self.syncs += 1
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_writer_batches_in_order_and_drains_on_close(tmp_path):
+    path = tmp_path / "logs" / "decisions.jsonl"
+    with DecisionLogWriter(str(path), max_batch=16, fsync_every_n=10) as w:
+        for i in range(100):
+            w.submit(_entry(i))
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(x)["run_id"] for x in lines] == [f"r{i}" for i in range(100)]
+    assert w.stats["written"] == 100
+    assert w.stats["errors"] == 0
+    assert w.stats["fsyncs"] >= 1
+
+    with pytest.raises(RuntimeError):
+        w.submit(_entry(0))
+    w.close()  # idempotent
+
+
+def test_writer_flush_and_fsync_policy_with_custom_sink():
+    sink = _MemorySink()
+    w = DecisionLogWriter(sink=sink, max_batch=4, fsync_every_n=None, fsync_interval_ms=None)
+    for i in range(10):
+        w.submit(_entry(i))
+    w.flush()
+
+    assert sum(len(b) for b in sink.batches) == 10
+    assert all(len(b) <= 4 for b in sink.batches)
+    assert sink.syncs == 0  # no periodic fsync configured
+
+    w.close()
+    assert sink.closed
+    assert sink.syncs == 1  # final fsync on shutdown
+
+
+def test_writer_close_racing_submit_loses_no_accepted_entry():
+    sink = _MemorySink()
+    w = DecisionLogWriter(sink=sink, max_batch=8, fsync_interval_ms=None)
+    accepted = []
+
+    def produce(k: int) -> None:
+        for i in range(500):
+            try:
+                w.submit(_entry(k * 1000 + i))
+            except RuntimeError:
+                return
+            accepted.append(1)
+
+    threads = [threading.Thread(target=produce, args=(k,)) for k in range(4)]
+    for t in threads:
+        t.start()
+    w.close()
+    for t in threads:
+        t.join()
+
+    w.flush()  # must not hang: nothing was enqueued after _STOP
+    assert w.stats["submitted"] == len(accepted)
+    assert w.stats["written"] == len(accepted) == sum(len(b) for b in sink.batches)
+
+
+def test_runner_hands_entry_to_background_writer(tmp_path):
+    sessions = [
+        Session(
+            athlete_id="a1",
+            start_time=datetime(2024, 1, d, 10, 0, 0),
+            duration_min=60,
+            rpe=7,
+            exercises=[StrengthExercise(name="Bench", sets=[StrengthSet(reps=8, load_kg=load)])],
+        )
+        for d, load in ((1, 60), (3, 90), (5, 110))
+    ]
+    unused = tmp_path / "unused.jsonl"
+    cfg = EndToEndConfig(
+        athlete_id="a1",
+        metric_key="volume_load_kg",
+        normalizer_min_n=2,
+        clip_z=None,
+        log_enabled=True,
+        log_path=str(unused),
+    )
+    path = tmp_path / "bg.jsonl"
+    with DecisionLogWriter(str(path)) as w:
+        res = run_end_to_end(sessions, config=cfg, log_writer=w)
+
+    assert not unused.exists()
+    obj = json.loads(path.read_text(encoding="utf-8").strip())
+    assert obj["run_id"] == res.run_id
+    assert obj["summary"]["top_scenario"] == res.summary["top_scenario"]
+
+
+def _athlete_entry(i: int) -> DecisionLogEntry:
+    e = _entry(i)
+    return DecisionLogEntry(**{**asdict(e), "athlete_id": f"a{i % 3}"})
+
+
+def test_segmented_store_rotates_compresses_and_seeks(tmp_path):
+    root = tmp_path / "decisions"
+    with SegmentedLogStore(str(root), max_segment_bytes=2_000, block_bytes=600) as store:
+        for i in range(60):
+            store.append(_athlete_entry(i))
+
+    names = sorted(p.name for p in root.iterdir())
+    assert any(n.endswith(".jsonl.gz") for n in names)
+    assert any(n.endswith(".blocks.json") for n in names)
+    assert sum(n.endswith(".jsonl") and not n.endswith(".idx.jsonl") for n in names) == 1
+
+    reader = DecisionLogReader(str(root))
+    assert len(reader.segments()) > 2
+    assert [e["run_id"] for e in reader.iter_entries()] == [f"r{i}" for i in range(60)]
+    assert reader.get("r7")["athlete_id"] == "a1"
+    assert reader.get("missing") is None
+    assert [e["run_id"] for e in reader.find(athlete_id="a2")] == [
+        f"r{i}" for i in range(60) if i % 3 == 2
+    ]
+    assert [e["run_id"] for e in reader.find(run_id="r4", athlete_id="a0")] == []
+
+    # reopening seals the plain segment left behind and keeps counting
+    with SegmentedLogStore(str(root), max_segment_bytes=2_000, block_bytes=600) as store:
+        store.append(_athlete_entry(60))
+    assert [e["run_id"] for e in reader.iter_entries()][-2:] == ["r59", "r60"]
+    assert reader.get("r59")["run_id"] == "r59"
+
+
+def test_segmented_store_as_writer_sink(tmp_path):
+    root = tmp_path / "decisions"
+    with DecisionLogWriter(sink=SegmentedLogStore(str(root), max_segment_bytes=1_500)) as w:
+        for i in range(30):
+            w.submit(_athlete_entry(i))
+
+    reader = DecisionLogReader(str(root))
+    assert len(list(reader.iter_entries())) == 30
+    assert reader.get("r29")["run_id"] == "r29"
+
+
+def test_uncompressed_sealed_segments_are_not_resealed(tmp_path, monkeypatch):
+    root = tmp_path / "decisions"
+    with SegmentedLogStore(str(root), max_segment_bytes=1_000, compress=False) as store:
+        for i in range(20):
+            store.append(_athlete_entry(i))
+
+    names = sorted(p.name for p in root.iterdir())
+    assert sum(n.endswith(".sealed.jsonl") for n in names) >= 2
+    assert not any(n.endswith(".gz") for n in names)
+
+    sealed: list[int] = []
+    real = SegmentedLogStore._seal
+    monkeypatch.setattr(
+        SegmentedLogStore, "_seal", lambda self, seq: (sealed.append(seq), real(self, seq))
+    )
+    SegmentedLogStore(str(root), max_segment_bytes=1_000, compress=False).close()
+    assert len(sealed) == 1  # only the segment that was still active
+
+    reader = DecisionLogReader(str(root))
+    assert [e["run_id"] for e in reader.iter_entries()] == [f"r{i}" for i in range(20)]
+    assert [e["run_id"] for e in reader.find(athlete_id="a1")] == [
+        f"r{i}" for i in range(20) if i % 3 == 1
+    ]
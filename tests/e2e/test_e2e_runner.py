@@ -83,3 +83,29 @@ def test_e2e_runner_handles_missing_athlete_gracefully(tmp_path):
     res = run_end_to_end(sessions, config=cfg)
     assert res.athlete_series is None
     assert any(i.code == "athlete_not_found" for i in res.issues)
+
+
+def test_e2e_runner_kalman_fatigue_engine(tmp_path):
+    sessions = [
+        Session(
+            athlete_id="a1",
+            start_time=datetime(2024, 1, d, 10, 0, 0),
+            duration_min=60,
+            rpe=7,
+            exercises=[StrengthExercise(name="Bench", sets=[StrengthSet(reps=8, load_kg=x)])],
+        )
+        for d, x in ((1, 60), (3, 90), (12, 110))
+    ]
+    cfg = EndToEndConfig(
+        athlete_id="a1",
+        normalizer_min_n=2,
+        clip_z=None,
+        fatigue_engine="kalman",
+        log_enabled=False,
+        log_path=str(tmp_path / "decisions.jsonl"),
+    )
+
+    res = run_end_to_end(sessions, config=cfg)
+    assert res.latents is not None
+    assert res.latents.summary["fatigue_engine"] == "kalman"
+    assert res.latents.points[-1].variance["fatigue"] is not None
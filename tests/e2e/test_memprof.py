@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import json
+import tracemalloc
+from dataclasses import dataclass
+
+from coach_ai.e2e import EndToEndConfig, run_end_to_end
+from coach_ai.e2e.memprof import MemoryProfiler, deep_size, field_sizes
+from coach_ai.validation.simulator import simulate_population_batch
+from coach_ai.validation.types import AthleteSimConfig
+
+
+@dataclass
+class _Box:
+    a: list[float]
+    b: list[float]
+
+
+def test_deep_size_counts_shared_objects_once():
+    shared = [float(i) for i in range(100)]
+    total, by_type, counts = deep_size(_Box(a=shared, b=shared))
+    assert counts["list"] == 1 and counts["float"] == 100 and counts["_Box"] == 1
+    assert total == sum(by_type.values())
+
+    sizes = field_sizes([_Box(a=shared, b=[]), _Box(a=shared, b=[])])
+    assert sizes["a"] == deep_size(shared)[0]
+
+
+def test_run_end_to_end_memory_profile_covers_every_stage(tmp_path):
+    sessions = simulate_population_batch(
+        [AthleteSimConfig(athlete_id="a1", days=56)], seed=1
+    ).to_sessions()
+    cfg = EndToEndConfig(athlete_id="a1", normalizer_min_n=3, log_enabled=False)
+
+    plain = run_end_to_end(sessions, config=cfg)
+    assert plain.memory_profile is None
+
+    res = run_end_to_end(sessions, config=cfg, profile_memory=True)
+    assert not tracemalloc.is_tracing()
+    prof = res.memory_profile
+    json.dumps(prof)  # exportable as is
+
+    by_name = {s["name"]: s for s in prof["stages"]}
+    assert list(by_name) == [t.name for t in res.timings]
+    assert by_name["training_core"]["artifact_fields"]["processed"] > 0
+    assert by_name["latents"]["retained_bytes"] > 0
+    assert "LatentPoint" in {t["type"] for t in by_name["latents"]["artifact_types"]}
+    assert by_name["trends"]["top_sites"]
+    assert prof["peak_bytes"] == max(s["peak_bytes"] for s in prof["stages"])
+
+
+def test_profiler_leaves_outer_tracing_running(tmp_path):
+    tracemalloc.start()
+    try:
+        with MemoryProfiler() as prof:
+            prof.measure("alloc", lambda: [0.5] * 10_000)
+        assert tracemalloc.is_tracing()
+        (rec,) = prof.stages
+        assert rec.artifact_bytes >= 80_000 and rec.peak_bytes >= 80_000
+        prof.write_json(str(tmp_path / "mem.json"))
+        assert json.loads((tmp_path / "mem.json").read_text())["stages"][0]["name"] == "alloc"
+    finally:
+        tracemalloc.stop()
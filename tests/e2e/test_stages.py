@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime
+
+import pytest
+
+import coach_ai.e2e.stages as stages
+import coach_ai.suggestions.pipeline as sugg_pipeline
+from coach_ai.e2e import EndToEndConfig, run_end_to_end
+from coach_ai.e2e.stages import Stage, StageContext, StageGraph
+from coach_ai.training_core import Session
+from coach_ai.training_core.schema import StrengthExercise, StrengthSet
+
+
+def _sessions() -> list[Session]:
+    return [
+        Session(
+            athlete_id="a1",
+            start_time=datetime(2024, 1, d, 10, 0, 0),
+            duration_min=60,
+            rpe=7,
+            exercises=[StrengthExercise(name="Bench", sets=[StrengthSet(reps=8, load_kg=x)])],
+        )
+        for d, x in ((1, 60), (3, 90), (5, 110))
+    ]
+
+
+def _cfg(tmp_path) -> EndToEndConfig:
+    return EndToEndConfig(
+        athlete_id="a1",
+        normalizer_min_n=2,
+        clip_z=None,
+        log_enabled=False,
+        log_path=str(tmp_path / "decisions.jsonl"),
+    )
+
+
+def test_each_stage_runs_exactly_once(tmp_path, monkeypatch):
+    calls = {"trends": 0, "latents": 0}
+
+    def counting(name, fn):
+        def wrapped(*args, **kwargs):
+            calls[name] += 1
+            return fn(*args, **kwargs)
+
+        return wrapped
+
+    monkeypatch.setattr(stages, "compute_trends", counting("trends", stages.compute_trends))
+    monkeypatch.setattr(
+        stages, "compute_latent_states", counting("latents", stages.compute_latent_states)
+    )
+    monkeypatch.setattr(
+        sugg_pipeline, "compute_trends", counting("trends", sugg_pipeline.compute_trends)
+    )
+    monkeypatch.setattr(
+        sugg_pipeline,
+        "compute_latent_states",
+        counting("latents", sugg_pipeline.compute_latent_states),
+    )
+
+    res = run_end_to_end(_sessions(), config=_cfg(tmp_path))
+
+    assert res.suggestions is not None
+    assert calls == {"trends": 1, "latents": 1}
+
+
+def test_failed_stage_is_isolated_and_dependents_skipped(tmp_path):
+    def boom(ctx: StageContext):
+        raise RuntimeError("boom")
+
+    graph = StageGraph(
+        [
+            Stage(stages.TRAINING_CORE, (), stages.stage_training_core),
+            Stage(stages.ATHLETE_SERIES, (stages.TRAINING_CORE,), stages.stage_athlete_series),
+            Stage(stages.TRENDS, (stages.ATHLETE_SERIES,), boom),
+            Stage(stages.LATENTS, (stages.ATHLETE_SERIES, stages.TRENDS), stages.stage_latents),
+            Stage(
+                stages.SUGGESTIONS,
+                (stages.ATHLETE_SERIES, stages.TRENDS, stages.LATENTS),
+                stages.stage_suggestions,
+            ),
+        ]
+    )
+
+    res = run_end_to_end(_sessions(), config=_cfg(tmp_path), graph=graph)
+
+    assert res.athlete_series is not None
+    assert res.trend is None and res.latents is None and res.suggestions is None
+    assert [i.code for i in res.issues if i.code.endswith("_failed")] == ["trends_failed"]
+    assert {t.name: t.status for t in res.timings} == {
+        "training_core": "ok",
+        "athlete_series": "ok",
+        "trends": "failed",
+        "latents": "skipped",
+        "suggestions": "skipped",
+    }
+
+
+def test_timings_cover_every_stage_and_reach_the_log(tmp_path):
+    cfg = EndToEndConfig(
+        athlete_id="a1",
+        normalizer_min_n=2,
+        clip_z=None,
+        log_path=str(tmp_path / "decisions.jsonl"),
+    )
+    res = run_end_to_end(_sessions(), config=cfg)
+
+    by_name = {t.name: t for t in res.timings}
+    assert list(by_name) == [
+        "training_core",
+        "athlete_series",
+        "trends",
+        "latents",
+        "suggestions",
+        "logging",
+    ]
+    assert all(t.wall_ms >= 0.0 and t.cpu_ms >= 0.0 for t in res.timings)
+    assert by_name["training_core"].n_in == 3
+    assert by_name["trends"].n_in == 3 and by_name["trends"].n_out == 3
+    assert by_name["suggestions"].n_out == len(res.suggestions.scenarios)
+    assert by_name["logging"].n_out == 1
+    assert sum(t.n_issues for t in res.timings) == len(res.issues)
+
+    logged = json.loads((tmp_path / "decisions.jsonl").read_text(encoding="utf-8"))
+    assert [t["name"] for t in logged["timings"]] == list(by_name)[:-1]
+
+    seeded = run_end_to_end(
+        [], config=_cfg(tmp_path), artifacts={stages.TRAINING_CORE: res.training_core}
+    )
+    assert seeded.timings[0].status == "reused"
+
+
+def test_graph_rejects_cycles_and_unknown_deps():
+    with pytest.raises(ValueError):
+        StageGraph([Stage("a", ("b",), lambda c: 1), Stage("b", ("a",), lambda c: 2)])
+    with pytest.raises(ValueError):
+        StageGraph([Stage("a", ("missing",), lambda c: 1)])
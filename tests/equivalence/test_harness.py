@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import numpy as np
+
+from coach_ai.equivalence import (
+    Kernel,
+    adversarial_cases,
+    assert_equivalent,
+    compare_outputs,
+    run_equivalence,
+    simulator_cases,
+)
+from coach_ai.equivalence import reference as ref
+from coach_ai.equivalence.fast import DIRECTIONS, classify_points_array
+from coach_ai.trends.classification import classify_points
+from coach_ai.trends.derivatives import discrete_derivative_per_day
+from coach_ai.trends.smoothing import ewma_array
+
+
+def test_fast_paths_match_reference():
+    cases = simulator_cases(athletes=2, days=84) + adversarial_cases(n=40)
+    rep = run_equivalence(cases, repeats=1)
+    assert_equivalent(rep)
+    assert {r["kernel"] for r in rep["kernels"]} >= {"classify_points", "plateau", "normalize"}
+    assert all(set(r["by_source"]) == {"sim", "adv"} for r in rep["kernels"])
+    batched = {r["kernel"]: r["batch"] for r in rep["kernels"] if r["batch"] is not None}
+    assert {"ewma", "fatigue", "plateau"} <= set(batched)
+    assert all(b["ok"] and b["shape"][0] == 4 for b in batched.values())
+
+
+def test_divergence_is_reported():
+    def off_by_alpha(case):
+        x = case.array
+        return (
+            lambda: {"smooth": ref.ewma(case.values, alpha=0.35)},
+            lambda: {"smooth": ewma_array(x, alpha=0.36)},
+        )
+
+    rep = run_equivalence(adversarial_cases(n=20), kernels=[Kernel("ewma", off_by_alpha)])
+    (row,) = rep["kernels"]
+    assert not rep["ok"] and not row["ok"]
+    fail = next(f for f in row["failures"] if f["case"] == "adv/sparse")
+    assert fail["output"] == "smooth" and fail["first_index"] >= 1
+    try:
+        assert_equivalent(rep)
+    except AssertionError as e:
+        assert "ewma" in str(e)
+    else:
+        raise AssertionError("expected a failure")
+
+
+def test_compare_outputs_missingness_and_categories():
+    same, diff = compare_outputs(
+        {"x": [None, 1.0], "d": ["up", "down"]},
+        {"x": np.array([np.nan, 1.0 + 1e-15]), "d": ["up", "down"]},
+        categorical=("d",),
+    )
+    assert same == [] and diff < 1e-14
+
+    bad, _ = compare_outputs({"x": [None, 1.0]}, {"x": np.array([0.0, 1.0])})
+    assert bad[0]["first_index"] == 0 and bad[0]["reference"] is None
+    short, _ = compare_outputs({"x": [1.0, 2.0]}, {"x": [1.0]})
+    assert "length" in short[0]["error"]
+
+
+def test_empty_series_derivative_aligns_with_times():
+    assert discrete_derivative_per_day([], []) == ([], [])
+
+
+def test_classify_points_array_rows_are_independent():
+    rng = np.random.default_rng(1)
+    deriv = rng.choice([np.nan, -0.2, -0.05, 0.0, 0.05, 0.2], size=(4, 30))
+    smooth = np.zeros_like(deriv)
+    codes, conf = classify_points_array(smooth, deriv)
+    for row in range(4):
+        d = [None if np.isnan(v) else float(v) for v in deriv[row]]
+        dirs, confs, _ = classify_points([0.0] * 30, d)
+        assert [DIRECTIONS[c] for c in codes[row]] == dirs
+        np.testing.assert_allclose(conf[row], confs, rtol=1e-12)
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from coach_ai.latents import BanisterParams, compute_banister, fit_banister
+from coach_ai.latents.banister import daily_load_grid, impulse_response
+from coach_ai.training_core.pipeline import AthleteSeries
+
+
+def _series(days: list[int], load: list[float | None], perf: list[float | None]) -> AthleteSeries:
+    t0 = datetime(2024, 1, 1, 10, 0, 0)
+    return AthleteSeries(
+        athlete_id="a1",
+        order=list(range(len(days))),
+        start_times=[t0 + timedelta(days=d) for d in days],
+        metrics={"srpe_load": load, "volume_load_kg": perf},
+        normalizers={},
+        normalizer_issues={},
+        normalized={},
+    )
+
+
+def test_impulse_response_fft_matches_recursive_and_naive():
+    rng = np.random.default_rng(0)
+    w = rng.uniform(0, 500, size=60) * (rng.random(60) < 0.6)
+    taus = [3.0, 11.0, 45.0]
+
+    fft = impulse_response(w, taus, method="fft")
+    rec = impulse_response(w, taus, method="recursive")
+    naive = np.array(
+        [
+            [sum(w[s] * np.exp(-(t - s) / tau) for s in range(t)) for t in range(w.size)]
+            for tau in taus
+        ]
+    )
+
+    np.testing.assert_allclose(rec, naive, rtol=1e-10, atol=1e-8)
+    np.testing.assert_allclose(fft, naive, rtol=1e-8, atol=1e-6)
+
+
+def test_daily_grid_sums_same_day_sessions_and_fills_rest_days():
+    s = _series([0, 0, 3], [100.0, 50.0, None], [1.0, 1.0, 1.0])
+    days, load, issues = daily_load_grid(s)
+
+    assert len(days) == 4
+    assert load.tolist() == [150.0, 0.0, 0.0, 0.0]
+    assert any(i.code == "banister_load_missing_values" for i in issues)
+
+
+def test_fit_banister_recovers_decay_constants():
+    rng = np.random.default_rng(1)
+    train_days = sorted(set(int(d) for d in rng.choice(120, size=70, replace=False)))
+    load = [float(rng.uniform(200, 600)) for _ in train_days]
+    truth = BanisterParams(
+        tau_fitness=35.0, tau_fatigue=6.0, k_fitness=0.02, k_fatigue=0.05, p0=5.0
+    )
+
+    s = _series(train_days, load, [0.0] * len(train_days))
+    ref = compute_banister(s, params=truth)
+    perf = [ref.performance[d - train_days[0]] for d in train_days]
+    s = _series(train_days, load, perf)
+
+    res = fit_banister(s, use_normalized_performance=False)
+
+    assert res.params.tau_fitness == 35.0
+    assert res.params.tau_fatigue == 6.0
+    assert res.fit_sse is not None and res.fit_sse < 1e-6
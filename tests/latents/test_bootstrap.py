@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from coach_ai.latents import bootstrap_latent_bands
+from coach_ai.latents.bootstrap import _ARRAYS_PER_COLUMN
+from coach_ai.training_core import Session, process_sessions
+from coach_ai.training_core.schema import StrengthExercise, StrengthSet
+
+
+def _series(loads: list[float]):
+    sessions = [
+        Session(
+            athlete_id="a1",
+            start_time=datetime(2024, 1, 1, 10, 0, 0) + timedelta(days=2 * i),
+            duration_min=60,
+            rpe=7,
+            exercises=[StrengthExercise(name="Bench", sets=[StrengthSet(reps=8, load_kg=x)])],
+        )
+        for i, x in enumerate(loads)
+    ]
+    return process_sessions(sessions, normalizer_min_n=2, clip_z=None).by_athlete["a1"]
+
+
+def test_bootstrap_bands_are_ordered_and_seeded():
+    a1 = _series([60, 70, 65, 80, 90, 75, 85, 100, 95, 70])
+
+    b1 = bootstrap_latent_bands(a1, n_boot=64, quantiles=(0.1, 0.5, 0.9), seed=3)
+    b2 = bootstrap_latent_bands(a1, n_boot=64, quantiles=(0.1, 0.5, 0.9), seed=3)
+    assert b1.bands == b2.bands
+
+    for latent in ("fatigue", "readiness"):
+        lo, mid, hi = b1.bands[latent]
+        assert len(lo) == len(a1.start_times)
+        for a, m, b in zip(lo, mid, hi, strict=True):
+            assert a is not None and m is not None and b is not None
+            assert 0.0 <= a <= m <= b <= 1.0
+
+
+def test_bootstrap_chunking_does_not_change_results():
+    a1 = _series([60, 70, 65, 80, 90, 75, 85, 100])
+
+    big = bootstrap_latent_bands(a1, n_boot=50, seed=11)
+    assert big.bands == bootstrap_latent_bands(a1, n_boot=50, seed=11, max_bytes=1).bands
+    # blocks of 3 columns: boundaries fall inside and between resampling blocks
+    three = 3 * 50 * 8 * _ARRAYS_PER_COLUMN
+    assert big.bands == bootstrap_latent_bands(a1, n_boot=50, seed=11, max_bytes=three).bands
+
+
+def test_bootstrap_without_data_reports_issue():
+    sessions = [
+        Session(
+            athlete_id="a1",
+            start_time=datetime(2024, 1, 1, 10, 0, 0),
+            duration_min=60,
+            rpe=7,
+            exercises=[],
+        )
+    ]
+    a1 = process_sessions(sessions, normalizer_min_n=2).by_athlete["a1"]
+
+    res = bootstrap_latent_bands(a1, n_boot=10)
+    assert any(i.code == "bootstrap_no_data" for i in res.issues)
+    assert res.bands["fatigue"] == [[None], [None]]
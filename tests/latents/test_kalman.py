@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from coach_ai.latents import compute_latent_states, kalman_fatigue_population
+from coach_ai.latents.kalman import compute_fatigue_kalman
+from coach_ai.training_core import Session, process_sessions
+from coach_ai.training_core.schema import StrengthExercise, StrengthSet
+
+
+def test_kalman_variance_grows_over_gaps_and_shrinks_with_data():
+    t0 = datetime(2024, 1, 1, 10, 0, 0)
+    times = [t0, t0 + timedelta(days=1), t0 + timedelta(days=2), t0 + timedelta(days=30)]
+    values = [1.0, None, 1.0, None]
+
+    mean, p, var, issues = compute_fatigue_kalman(values, times)
+
+    assert issues == []
+    assert all(v is not None for v in var)
+    assert var[2] < var[1]  # update after an observation
+    assert var[3] > var[2]  # long gap without data
+    assert abs(mean[3]) < abs(mean[2])  # decays toward baseline
+    assert all(0.0 <= x <= 1.0 for x in p if x is not None)
+
+
+def test_kalman_population_matches_single_athlete_filter():
+    t0 = datetime(2024, 1, 1, 10, 0, 0)
+    a = ([t0 + timedelta(days=2 * i) for i in range(5)], [0.5, None, 1.5, -0.2, 2.0])
+    b = ([t0 + timedelta(days=3 * i) for i in range(3)], [None, 1.0, 0.3])
+
+    pop = kalman_fatigue_population([("a", *a), ("b", *b)])
+
+    for key, (times, values) in (("a", a), ("b", b)):
+        mean, _, var, _ = compute_fatigue_kalman(values, times)
+        np.testing.assert_allclose(
+            np.array(pop[key][0], dtype=float), np.array(mean, dtype=float), equal_nan=True
+        )
+        np.testing.assert_allclose(
+            np.array(pop[key][1], dtype=float), np.array(var, dtype=float), equal_nan=True
+        )
+    assert pop["b"][0][0] is None
+
+
+def test_kalman_population_reports_issues_per_athlete():
+    t0 = datetime(2024, 1, 1, 10, 0, 0)
+    back = ([t0, t0 + timedelta(days=2), t0 + timedelta(days=1)], [1.0, 0.5, 0.2])
+    empty = ([t0, t0 + timedelta(days=1)], [None, None])
+    ok = ([t0, t0 + timedelta(days=1)], [0.3, 0.4])
+
+    pop = kalman_fatigue_population([("back", *back), ("empty", *empty), ("ok", *ok)])
+
+    for key, (times, values) in (("back", back), ("empty", empty), ("ok", ok)):
+        *_, issues = compute_fatigue_kalman(values, times)
+        assert [i.code for i in pop[key][2]] == [i.code for i in issues]
+    assert [i.code for i in pop["back"][2]] == ["kalman_non_increasing_time"]
+    assert [i.code for i in pop["empty"][2]] == ["fatigue_no_data"]
+    assert pop["ok"][2] == []
+
+
+def test_compute_latent_states_kalman_engine_reports_variance():
+    sessions = [
+        Session(
+            athlete_id="a1",
+            start_time=datetime(2024, 1, 1, 10, 0, 0) + timedelta(days=d),
+            duration_min=60,
+            rpe=7,
+            exercises=[StrengthExercise(name="Bench", sets=[StrengthSet(reps=8, load_kg=x)])],
+        )
+        for d, x in ((0, 60), (2, 80), (9, 90), (10, 70))
+    ]
+    a1 = process_sessions(sessions, normalizer_min_n=2, clip_z=None).by_athlete["a1"]
+
+    lr = compute_latent_states(a1, fatigue_engine="kalman")
+
+    assert lr.summary["fatigue_engine"] == "kalman"
+    assert all(p.variance["fatigue"] is not None for p in lr.points)
+    assert compute_latent_states(a1).points[0].variance == {}
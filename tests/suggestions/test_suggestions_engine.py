@@ -64,3 +64,85 @@ def test_data_review_appears_with_low_quality_data():
 
     names = [s.name.value for s in res.scenarios]
     assert "data_review" in names
+
+
+def test_batch_scoring_matches_per_athlete_suggestions():
+    from datetime import timedelta
+
+    from coach_ai.suggestions import suggest_scenarios_batch
+
+    sessions = [
+        Session(
+            athlete_id=aid,
+            start_time=datetime(2024, 1, 1, 10, 0, 0) + timedelta(days=2 * i),
+            duration_min=60,
+            rpe=7,
+            exercises=[StrengthExercise(name="Bench", sets=[StrengthSet(reps=8, load_kg=x)])],
+        )
+        for aid, loads in (("a1", [60, 90, 110]), ("a2", [80, 80, 80, 80]), ("a3", [100, 60]))
+        for i, x in enumerate(loads)
+    ]
+    pr = process_sessions(sessions, normalizer_min_n=2, clip_z=None)
+
+    batch = suggest_scenarios_batch(pr.by_athlete, top_k=2)
+
+    assert batch.probabilities.shape == (3, 6)
+    for row, aid in enumerate(batch.athlete_ids):
+        single = suggest_scenarios(pr.by_athlete[aid])
+        by_name = {s.name: s for s in single.scenarios}
+        for j, name in enumerate(batch.scenario_names):
+            assert abs(batch.probabilities[row, j] - by_name[name].probability) < 1e-12
+            assert abs(batch.confidence[row, j] - by_name[name].confidence) < 1e-12
+        assert [n for n, _ in batch.top[aid]] == [s.name for s in single.scenarios[:2]]
+
+
+def test_top_k_materializes_only_most_probable_scenarios():
+    sessions = [
+        Session(
+            athlete_id="a1",
+            start_time=datetime(2024, 1, d, 10, 0, 0),
+            duration_min=60,
+            rpe=7,
+            exercises=[StrengthExercise(name="Bench", sets=[StrengthSet(reps=8, load_kg=x)])],
+        )
+        for d, x in ((1, 60), (3, 90), (5, 110))
+    ]
+    a1 = process_sessions(sessions, normalizer_min_n=2, clip_z=None).by_athlete["a1"]
+
+    full = suggest_scenarios(a1)
+    top = suggest_scenarios(a1, top_k=3)
+
+    assert [s.name for s in top.scenarios] == [s.name for s in full.scenarios[:3]]
+    assert [s.probability for s in top.scenarios] == [s.probability for s in full.scenarios[:3]]
+    assert top.scenarios[0].explanation == full.scenarios[0].explanation
+
+
+def test_scenario_timeline_last_row_matches_suggest_scenarios():
+    from datetime import timedelta
+
+    from coach_ai.suggestions import scenario_timeline
+
+    loads = [60, 70, 65, 80, 90, 75, 85, 100, 95]
+    sessions = [
+        Session(
+            athlete_id="a1",
+            start_time=datetime(2024, 1, 1, 10, 0, 0) + timedelta(days=2 * i),
+            duration_min=60,
+            rpe=7,
+            exercises=[StrengthExercise(name="Bench", sets=[StrengthSet(reps=8, load_kg=x)])],
+        )
+        for i, x in enumerate(loads)
+    ]
+    a1 = process_sessions(sessions, normalizer_min_n=2, clip_z=None).by_athlete["a1"]
+
+    tl = scenario_timeline(a1)
+    assert tl.probabilities.shape == (len(loads), 6)
+    assert abs(tl.probabilities.sum(axis=1) - 1.0).max() < 1e-12
+
+    last = {s.name: s.probability for s in suggest_scenarios(a1).scenarios}
+    for j, name in enumerate(tl.scenario_names):
+        assert abs(tl.probabilities[-1, j] - last[name]) < 1e-12
+
+    weekly = scenario_timeline(a1, every=4)
+    assert weekly.indices == [0, 4, 8]
+    assert (weekly.probabilities == tl.probabilities[[0, 4, 8]]).all()
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models import Athlete, Base, Run, TrainingSession
+from app.tools.loadgen import LoadConfig, bulk_load, load_test, simulate_load_sessions
+
+
+def test_bulk_load_is_idempotent(tmp_path):
+    url = f"sqlite:///{tmp_path / 'fixture.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(
+        engine, tables=[Athlete.__table__, TrainingSession.__table__, Run.__table__]
+    )
+    history, api = simulate_load_sessions(LoadConfig(athletes=3, days=60, api_days=7))
+    assert history and api
+    assert max(s.start_time for s in history) < min(s.start_time for s in api)
+
+    factory = sessionmaker(bind=engine)
+    with factory() as db:
+        first = bulk_load(db, history)
+        again = bulk_load(db, history[:10])
+        n_rows = db.scalar(select(func.count()).select_from(TrainingSession))
+    assert first == {"athletes": 3, "inserted": len(history), "duplicates": 0}
+    assert again == {"athletes": 0, "inserted": 0, "duplicates": 10}
+    assert n_rows == len(history)
+
+
+def test_load_test_in_process(tmp_path):
+    cfg = LoadConfig(athletes=2, days=42, api_days=10, batch_size=2, concurrency=2)
+    rep = load_test(cfg, database_url=f"sqlite:///{tmp_path / 'load.db'}", create_tables=True)
+
+    ingest = rep["endpoints"]["POST /sessions/batch"]
+    runs = rep["endpoints"]["POST /runs/{athlete_id}"]
+    assert ingest["n"] > 0 and ingest["errors"] == 0
+    assert runs["n"] == 2 and runs["errors"] == 0
+    assert ingest["p50_ms"] <= ingest["p95_ms"] <= ingest["p99_ms"] <= ingest["max_ms"]
+    assert rep["fixture"]["inserted"] == rep["fixture"]["sessions"] > 0
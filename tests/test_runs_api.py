@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+
+from app.db.engine import get_db
+from app.db.models import Athlete, Base, Run, TrainingSession
+from app.db.schema import add_missing_columns
+from app.main import create_app
+from app.tools.loadgen import LoadConfig, _db_dependency, bulk_load, simulate_load_sessions
+
+
+def test_post_run_persists_issue_dataclasses_as_json(tmp_path):
+    # regression: the endpoint used to call model_dump() on Issue dataclasses and crash
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'runs.db'}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(
+        engine, tables=[Athlete.__table__, TrainingSession.__table__, Run.__table__]
+    )
+    factory = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    history, _ = simulate_load_sessions(LoadConfig(athletes=1, days=28, api_days=0))
+    with factory() as db:
+        bulk_load(db, history)
+
+    app = create_app()
+    app.dependency_overrides[get_db] = _db_dependency(factory)
+    client = TestClient(app)
+
+    aid = history[0].athlete_id
+    # a vanishing deadline guarantees degradation issues on the run
+    r = client.post(f"/api/v1/runs/{aid}", params={"deadline_ms": 1e-6})
+    assert r.status_code == 200
+    got = client.get(f"/api/v1/runs/{r.json()['run_id']}").json()
+
+    assert got["issues"] and all(isinstance(i, dict) and "code" in i for i in got["issues"])
+    assert got["issues"][0]["severity"] in {"info", "warn", "error"}
+    assert got["timings"][0]["name"] == "training_core"
+    engine.dispose()
+
+
+def test_add_missing_columns_upgrades_existing_runs_table(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    Base.metadata.create_all(engine, tables=[Athlete.__table__, Run.__table__])
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE runs DROP COLUMN timings"))
+
+    assert add_missing_columns(engine, [Athlete.__table__, Run.__table__]) == ["runs.timings"]
+    assert "timings" in {c["name"] for c in inspect(engine).get_columns("runs")}
+    assert add_missing_columns(engine, [Run.__table__]) == []
+    engine.dispose()
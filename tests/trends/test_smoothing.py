@@ -15,3 +15,28 @@ def test_ewma_carries_forward_on_none():
     assert r[0] == 1.0
     assert r[1] == 1.0
     assert r[2] == 2.0
+
+
+def test_ewma_array_matches_scalar_ewma_per_row():
+    import numpy as np
+
+    from coach_ai.trends.smoothing import ewma_array
+
+    rows = [[None, 1.0, None, 3.0, 2.0], [4.0, None, None, 0.0, None]]
+    mat = np.array([[np.nan if v is None else v for v in r] for r in rows])
+    out = ewma_array(mat, alpha=0.4)
+    for r, o in zip(rows, out, strict=True):
+        ref = [np.nan if v is None else v for v in ewma(r, alpha=0.4)]
+        np.testing.assert_array_equal(o, np.array(ref))
+
+
+def test_ewma_array_continues_from_initial_state():
+    import numpy as np
+
+    from coach_ai.trends.smoothing import ewma_array
+
+    mat = np.array([[np.nan, 1.0, np.nan, 3.0, 2.0, 5.0], [4.0, np.nan, np.nan, 0.0, np.nan, 1.0]])
+    whole = ewma_array(mat, alpha=0.4)
+    head = ewma_array(mat[:, :3], alpha=0.4)
+    tail = ewma_array(mat[:, 3:], alpha=0.4, initial=head[:, -1])
+    np.testing.assert_array_equal(np.hstack([head, tail]), whole)
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import numpy as np
+
+from coach_ai.validation.evaluator import evaluate_simulation, join_truth
+from coach_ai.validation.simulator import simulate_population_batch
+from coach_ai.validation.types import AthleteSimConfig
+
+
+def test_join_truth_matches_exact_timestamps_only():
+    truth_t = np.array([10, 20, 30], dtype=np.int64)
+    truth_v = np.array([0.1, 0.2, 0.3])
+    out = join_truth(np.array([5, 20, 30, 31], dtype=np.int64), truth_t, truth_v)
+    assert np.isnan(out[0]) and np.isnan(out[3])
+    assert out[1:3].tolist() == [0.2, 0.3]
+    assert np.isnan(join_truth(np.array([1], dtype=np.int64), truth_t[:0], truth_v[:0])).all()
+
+
+def test_batch_and_object_truth_give_the_same_evaluation():
+    athletes = [AthleteSimConfig(athlete_id=f"a{i}", days=42) for i in range(3)]
+    batch = simulate_population_batch(athletes, seed=2)
+    sessions = batch.to_sessions()
+
+    m1, c1, rows1 = evaluate_simulation(sessions, batch, normalizer_min_n=3)
+    m2, c2, rows2 = evaluate_simulation(sessions, batch.to_truth(), normalizer_min_n=3)
+
+    assert m1 == m2 and c1 == c2 and rows1 == rows2
+    assert m1["n_points_eval"] > 0
+    assert all(r["true_fatigue"] is not None for r in rows1)
+    assert {r["athlete_id"] for r in rows1} == {"a0", "a1", "a2"}
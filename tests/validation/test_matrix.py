@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from coach_ai.validation import EngineSpec, PopulationSpec, run_experiment_matrix
+from coach_ai.validation.evaluator import evaluate_simulation
+from coach_ai.validation.matrix import dataset_key, load_dataset, summarize_values
+
+
+def test_spec_parsing():
+    assert EngineSpec.parse("noclip:clip_z=none,use_normalized=false") == EngineSpec(
+        name="noclip", clip_z=None, use_normalized=False
+    )
+    assert EngineSpec.parse("norm") == EngineSpec(name="norm")
+    pop = PopulationSpec.parse("days=168")
+    assert pop.name == "days=168" and pop.days == 168
+    with pytest.raises(ValueError):
+        PopulationSpec.parse("x:weeks=3")
+
+
+def test_summarize_values_t_interval():
+    s = summarize_values([1.0, 2.0, None, 3.0])
+    assert s["n"] == 3 and s["mean"] == 2.0 and s["std"] == 1.0
+    half = 4.303 / 3**0.5
+    assert s["ci95"] == pytest.approx([2.0 - half, 2.0 + half])
+    assert summarize_values([0.5])["ci95"] is None
+    assert summarize_values([None])["mean"] is None
+
+
+def test_dataset_cache_ignores_names(tmp_path):
+    a = PopulationSpec(name="a", n_athletes=2, days=28)
+    b = PopulationSpec(name="b", n_athletes=2, days=28)
+    assert dataset_key(a, 1) == dataset_key(b, 1) != dataset_key(a, 2)
+
+    s1, _, hit1 = load_dataset(a, 1, cache_dir=str(tmp_path))
+    s2, _, hit2 = load_dataset(b, 1, cache_dir=str(tmp_path))
+    assert (hit1, hit2) == (False, True)
+    assert [s.model_dump() for s in s1] == [s.model_dump() for s in s2]
+    assert [p.suffix for p in tmp_path.iterdir()] == [".npz"]
+
+    loop = PopulationSpec(n_athletes=2, days=28, simulator="loop")
+    assert load_dataset(loop, 1, cache_dir=str(tmp_path))[2] is False
+    assert load_dataset(loop, 1, cache_dir=str(tmp_path))[2] is False  # never cached
+
+
+def test_matrix_cells_use_exact_metrics(tmp_path):
+    pop = PopulationSpec(n_athletes=2, days=42)
+    rep = run_experiment_matrix(seeds=[4], populations=[pop], out_dir=str(tmp_path), cache_dir=None)
+    sessions, truth, _ = load_dataset(pop, 4)
+    exact, _, _ = evaluate_simulation(sessions, truth, n_boot=0)
+    assert rep["cells"][0]["metrics"] == exact
+    assert rep["evaluation"] == {"mode": "exact"}
+
+
+def test_matrix_aggregates_and_is_worker_invariant(tmp_path):
+    kw = dict(
+        seeds=[1, 2, 3],
+        populations=[PopulationSpec(n_athletes=2, days=42)],
+        engines=[EngineSpec(name="base"), EngineSpec(name="same", clip_z=5.0)],
+        cache_dir=str(tmp_path / "cache"),
+    )
+    serial = run_experiment_matrix(out_dir=str(tmp_path / "s"), workers=1, **kw)
+    pooled = run_experiment_matrix(out_dir=str(tmp_path / "p"), workers=2, **kw)
+
+    assert len(serial["cells"]) == 6
+    assert serial["dataset_cache"]["misses"] == 3 and pooled["dataset_cache"]["hits"] == 3
+    assert [c["metrics"] for c in serial["cells"]] == [c["metrics"] for c in pooled["cells"]]
+
+    mae = serial["summary"][0]["metrics"]["fatigue_mae"]
+    assert mae["n"] == 3 and mae["ci95"][0] <= mae["mean"] <= mae["ci95"][1]
+    delta = serial["deltas"][0]
+    assert delta["engine"] == "same" and delta["metrics"]["fatigue_mae"]["mean"] == 0.0
+
+    on_disk = json.loads((tmp_path / "s" / "matrix.json").read_text(encoding="utf-8"))
+    assert on_disk["summary"] == serial["summary"]
@@ -3,7 +3,12 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
-from coach_ai.validation.runner import run_simulated_validation
+import pytest
+
+from coach_ai.validation.evaluator import evaluate_simulation
+from coach_ai.validation.runner import population_athletes, run_simulated_validation
+from coach_ai.validation.simulator import simulate_population
+from coach_ai.validation.types import SessionBatch
 
 
 def test_run_simulated_validation_writes_artifacts(tmp_path):
@@ -21,3 +26,33 @@ def test_run_simulated_validation_writes_artifacts(tmp_path):
     assert obj["seed"] == 7
     assert "metrics" in obj
     assert "calibration" in obj
+
+
+def test_vectorized_validation_joins_truth_from_the_batch(tmp_path, monkeypatch):
+    def no_objects(self):
+        raise AssertionError("vectorized validation must not build SimulatedTruthPoint objects")
+
+    monkeypatch.setattr(SessionBatch, "to_truth", no_objects)
+    rep = run_simulated_validation(
+        out_dir=str(tmp_path), n_athletes=2, days=28, seed=3, simulator="vectorized", n_boot=0
+    )
+    assert rep.metrics["fatigue_spearman"] is not None
+
+
+def test_validation_metrics_are_exact_unless_streaming(tmp_path):
+    athletes = population_athletes(3, days=42)
+    sessions, truth = simulate_population(athletes, seed=5)
+    exact, calibration, _ = evaluate_simulation(sessions, truth, n_boot=0)
+
+    rep = run_simulated_validation(
+        out_dir=str(tmp_path / "exact"), n_athletes=3, days=42, seed=5, n_boot=0
+    )
+    assert rep.metrics == exact
+    assert rep.calibration == calibration
+
+    streamed = run_simulated_validation(
+        out_dir=str(tmp_path / "stream"), n_athletes=3, days=42, seed=5, n_boot=0, streaming=True
+    )
+    assert streamed.metrics["fatigue_mae"] == pytest.approx(exact["fatigue_mae"])
+    obj = json.loads(Path(streamed.files["report_json"]).read_text(encoding="utf-8"))
+    assert obj["evaluation"] == {"mode": "streaming", "bins": 1024}
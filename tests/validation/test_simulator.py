@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import numpy as np
+
+from coach_ai.training_core.pipeline import process_sessions
+from coach_ai.validation.simulator import simulate_population, simulate_population_batch
+from coach_ai.validation.types import AthleteSimConfig
+
+
+def _athletes(n: int = 3, **kw) -> list[AthleteSimConfig]:
+    return [AthleteSimConfig(athlete_id=f"a{i}", days=30 + 7 * i, **kw) for i in range(n)]
+
+
+def test_batch_structure_and_determinism():
+    athletes = _athletes(sessions_per_week=3)
+    a = simulate_population_batch(athletes, seed=3)
+    b = simulate_population_batch(athletes, seed=3)
+
+    assert np.array_equal(a.volume_load_kg, b.volume_load_kg)
+    assert np.all(np.diff(a.athlete) >= 0)
+    for i, cfg in enumerate(athletes):
+        days = a.day[a.athlete == i]
+        assert np.all(np.diff(days) > 0) and days.max() < cfg.days
+        weeks = np.bincount(days // 7)
+        assert weeks.max() <= 3 and weeks[0] == 3
+    assert np.all(np.isfinite(a.true_fatigue_raw))
+    assert np.all((a.true_fatigue_p > 0) & (a.true_fatigue_p < 1))
+    assert np.all((a.rpe >= 4.0) & (a.rpe <= 10.0))
+
+
+def test_batch_materializes_consistent_sessions_and_truth():
+    batch = simulate_population_batch(_athletes(missing_exercises_prob=0.2), seed=5)
+    sessions = batch.to_sessions()
+    truth = batch.to_truth()
+    assert len(sessions) == len(truth) == len(batch)
+
+    res = process_sessions(sessions, metric_keys=("volume_load_kg",), normalizer_min_n=2)
+    vol = np.array(
+        [
+            np.nan if v is None else v
+            for aid in batch.athlete_ids
+            for v in res.by_athlete[aid].metrics["volume_load_kg"]
+        ]
+    )
+    keep = ~batch.missing_exercises
+    assert np.allclose(vol[keep], batch.volume_load_kg[keep])
+    assert [tp.volume_load_kg is None for tp in truth] == list(batch.missing_exercises)
+    assert batch.timestamps_ns()[0] == int(sessions[0].start_time.timestamp()) * 10**9
+
+
+def test_population_is_bit_identical_for_any_worker_count():
+    athletes = _athletes(4)
+    s1, t1 = simulate_population(athletes, seed=11)
+    s2, t2 = simulate_population(athletes, seed=11, workers=2)
+
+    assert [s.model_dump() for s in s1] == [s.model_dump() for s in s2]
+    assert t1 == t2
+
+    # an athlete's data depends only on its position, not on who else is simulated
+    solo, _ = simulate_population(athletes[:1], seed=11)
+    key = sorted(
+        (s.start_time, s.exercises[0].sets[0].load_kg if s.exercises else None) for s in solo
+    )
+    full = sorted(
+        (s.start_time, s.exercises[0].sets[0].load_kg if s.exercises else None)
+        for s in s1
+        if s.athlete_id == "a0"
+    )
+    assert key == full
+
+
+def test_multi_exercise_sessions_keep_volume():
+    one = simulate_population_batch(_athletes(2), seed=4)
+    multi = simulate_population_batch(_athletes(2, exercises_per_session=4), seed=4)
+    assert np.allclose(one.volume_load_kg, multi.volume_load_kg)
+
+    sessions = [s for s in multi.to_sessions() if s.exercises]
+    assert sessions and all(len(s.exercises) == 4 for s in sessions)
+    assert all(len({ex.name for ex in s.exercises}) == 4 for s in sessions)
+    res = process_sessions(sessions, metric_keys=("volume_load_kg",), normalizer_min_n=2)
+    vol = [v for aid in res.by_athlete for v in res.by_athlete[aid].metrics["volume_load_kg"]]
+    keep = ~multi.missing_exercises
+    assert np.allclose(vol, multi.volume_load_kg[keep])
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import numpy as np
+
+from coach_ai.validation.stats import (
+    StreamingMetrics,
+    _average_ranks_rows,
+    average_ranks,
+    bootstrap_intervals,
+    bucket_by_confidence,
+    mean_abs_error,
+    spearman_corr,
+)
+
+
+def _reference_ranks(a: list[float]) -> list[float]:
+    return [sum(1 for w in a if w < v) + (sum(1 for w in a if w == v) + 1) / 2.0 for v in a]
+
+
+def test_average_ranks_ties_match_reference_and_rows():
+    rng = np.random.default_rng(3)
+    a = np.round(rng.normal(size=(5, 40)), 1)  # plenty of ties
+    rows = _average_ranks_rows(a)
+    for i in range(a.shape[0]):
+        ref = _reference_ranks(a[i].tolist())
+        assert np.allclose(average_ranks(a[i]), ref)
+        assert np.allclose(rows[i], ref)
+
+
+def test_missing_values_are_dropped_pairwise():
+    x = [1.0, None, 3.0, float("nan"), 5.0, 6.0]
+    y = [2.0, 4.0, None, 1.0, 10.0, 12.0]
+    assert spearman_corr(x, y) == 1.0
+    assert mean_abs_error(x, y) == (1.0 + 5.0 + 6.0) / 3.0
+    assert spearman_corr([1.0, None], [2.0, 3.0]) is None
+
+
+def test_bootstrap_intervals_cover_estimate_and_ignore_chunking():
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=300)
+    y = x + rng.normal(scale=0.8, size=300)
+
+    ci = bootstrap_intervals(x, y, n_boot=150, seed=1)
+    rho, mae = spearman_corr(x, y), mean_abs_error(x, y)
+    assert ci["spearman"][0] < rho < ci["spearman"][1]
+    assert ci["mae"][0] < mae < ci["mae"][1]
+
+    small = bootstrap_intervals(x, y, n_boot=150, seed=1, max_bytes=1)
+    assert small == ci
+    assert bootstrap_intervals(x, y, n_boot=0) == {"spearman": None, "mae": None}
+
+
+def test_bucket_by_confidence_bootstrap_bounds_bucket_mean():
+    rng = np.random.default_rng(2)
+    conf = rng.random(120)
+    err = rng.random(120)
+    plain = bucket_by_confidence(conf, err, bins=4)
+    boot = bucket_by_confidence(conf, err, bins=4, n_boot=100, seed=0)
+    assert [b["error_mean"] for b in plain] == [b["error_mean"] for b in boot]
+    for b in boot:
+        assert b["error_mean_ci_low"] <= b["error_mean"] <= b["error_mean_ci_high"]
+    assert bucket_by_confidence(conf, err, bins=4, n_boot=100, seed=0, max_bytes=1) == boot
+
+
+def test_streaming_metrics_track_exact_metrics_in_any_chunking():
+    rng = np.random.default_rng(4)
+    true = rng.beta(4, 4, 5000)
+    pred = np.clip(true + rng.normal(scale=0.1, size=5000), 0.0, 1.0)
+    pred[::25] = np.nan
+    conf = rng.random(5000)
+
+    whole = StreamingMetrics(n_boot=50, chunk=512)
+    whole.add(pred, true, conf)
+    parts = StreamingMetrics(n_boot=50, chunk=512)
+    for lo in range(0, 5000, 37):
+        parts.add(pred[lo : lo + 37], true[lo : lo + 37], conf[lo : lo + 37])
+
+    m = whole.metrics()
+    assert m == parts.metrics()
+    assert m["n_points_eval"] == 4800
+    assert abs(m["fatigue_mae"] - mean_abs_error(pred, true)) < 1e-12
+    assert abs(m["fatigue_spearman"] - spearman_corr(pred, true)) < 2e-3
+    assert m["fatigue_spearman_ci95"][0] < m["fatigue_spearman"] < m["fatigue_spearman_ci95"][1]
+
+    buckets = whole.calibration()
+    assert sum(b["count"] for b in buckets) == 4800
+    assert len(buckets) == 6
+    assert all(b["confidence_min"] <= b["confidence_mean"] <= b["confidence_max"] for b in buckets)
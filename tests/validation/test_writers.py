@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import csv
+
+import numpy as np
+
+from coach_ai.validation.evaluator import evaluate_simulation, stream_evaluation
+from coach_ai.validation.simulator import simulate_population_batch
+from coach_ai.validation.types import AthleteSimConfig
+from coach_ai.validation.writers import CsvPointWriter, NpzPointWriter
+
+
+def _population():
+    athletes = [AthleteSimConfig(athlete_id=f"a{i}", days=60) for i in range(3)]
+    batch = simulate_population_batch(athletes, seed=5)
+    return batch.to_sessions(), batch
+
+
+def test_streamed_points_match_in_memory_rows(tmp_path):
+    sessions, truth = _population()
+    metrics, _, rows = evaluate_simulation(sessions, truth, normalizer_min_n=3, n_boot=0)
+
+    csv_path, npz_path = tmp_path / "points.csv", tmp_path / "points.npz"
+    key = "volume_load_kg"
+    with (
+        CsvPointWriter(str(csv_path), metric_key=key) as cw,
+        NpzPointWriter(str(npz_path), metric_key=key) as nw,
+    ):
+        streamed, calibration = stream_evaluation(
+            sessions, truth, writers=(cw, nw), normalizer_min_n=3, n_boot=0
+        )
+
+    with csv_path.open(encoding="utf-8", newline="") as f:
+        csv_rows = list(csv.DictReader(f))
+    assert len(csv_rows) == len(rows)
+    assert [r["t"] for r in csv_rows] == [r["t"] for r in rows]
+
+    z = np.load(npz_path)
+    assert z["t_ns"].size == len(rows)
+    ids = z["athlete_ids"][z["athlete"]].tolist()
+    assert ids == [r["athlete_id"] for r in rows]
+    assert z["trend_dir_labels"][z["trend_dir"]].tolist() == [r["trend_dir"] for r in rows]
+    pred = np.array([np.nan if r["pred_fatigue"] is None else r["pred_fatigue"] for r in rows])
+    assert np.array_equal(z["pred_fatigue"], pred, equal_nan=True)
+    assert str(z["metric_key"]) == key
+
+    assert streamed["n_points_eval"] == metrics["n_points_eval"]
+    assert streamed["fatigue_mae"] == metrics["fatigue_mae"]
+    assert sum(b["count"] for b in calibration) == metrics["n_points_eval"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["points.csv", "points.npz"]
+
+
+def test_npz_writer_discards_spool_on_error(tmp_path):
+    path = tmp_path / "points.npz"
+    try:
+        with NpzPointWriter(str(path), metric_key="volume_load_kg"):
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    assert list(tmp_path.iterdir()) == []